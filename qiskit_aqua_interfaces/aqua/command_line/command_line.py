@@ -14,14 +14,51 @@
 
 """Qiskit Aqua command line main."""
 
+import os
 import sys
 import argparse
 import json
+import time
 from collections import OrderedDict
 import textwrap
 import logging
 from qiskit_aqua_interfaces import APP_DEPRECATION_MSG
 from qiskit_aqua_interfaces._extras_require import _check_extra_requires
+from qiskit_aqua_interfaces.command_line import (MEMORY_CHECK_POLICIES,
+                                                 verify_simulator_memory,
+                                                 RunMonitor,
+                                                 install_stop_handlers,
+                                                 Checkpoint,
+                                                 WarmStart,
+                                                 RUN_OPTIONS,
+                                                 pop_run_options,
+                                                 strip_run_options,
+                                                 merge_run_options,
+                                                 CONVERGENCE_TOL,
+                                                 add_run_checks,
+                                                 run_options_to_args,
+                                                 result_value,
+                                                 write_result,
+                                                 compare_backends,
+                                                 format_comparison,
+                                                 auto_tune,
+                                                 core_budget,
+                                                 limit_requested_threads,
+                                                 set_simulator_threads,
+                                                 ResultsStore,
+                                                 record_run,
+                                                 format_runs,
+                                                 format_diff,
+                                                 run_jsonl,
+                                                 submit_job,
+                                                 run_worker,
+                                                 CLAIM_LEASE,
+                                                 queue_status,
+                                                 format_queue_status,
+                                                 run_repeated,
+                                                 format_statistics,
+                                                 read_input,
+                                                 parse_json_input)
 
 # pylint: disable=import-outside-toplevel
 
@@ -48,14 +85,236 @@ def _run_delay(root):
             root.destroy()
 
 
+def _run_repeated(params, args, run_options, threads):
+    ret = run_repeated(params, args.repeat, args.warmup, args.seed_vary,
+                       run_options, args.memory_check, threads)
+    if args.jo is not None:
+        with open(args.jo, 'w') as run_output:
+            write_result(ret, run_output)
+        return
+
+    print('\n\n--------------------------------- R E S U L T -----'
+          '-------------------------------\n')
+    print('{} measured runs after {} warmup runs\n'.format(ret['repeat'], ret['warmup']))
+    for line in format_statistics(ret['statistics']):
+        print(line)
+
+
+def _read_result(output_file):
+    with open(output_file) as file:
+        return result_value(json.load(file))
+
+
+def _compare_backends(args, run_options, cpus):
+    from qiskit_aqua_interfaces.aqua.user_interface._model import Model
+    # the model parser does not accept the run options section
+    _, input_file = strip_run_options(args.input)
+    model = Model()
+    try:
+        model.load_file(input_file or args.input)
+    finally:
+        if input_file is not None:
+            os.remove(input_file)
+
+    options = ['--memory-check', args.memory_check] + run_options_to_args(run_options)
+    if args.results_db is not None:
+        options += ['--results-db', args.results_db]
+    max_parallel = args.max_parallel
+    if args.auto_tune:
+        max_parallel = auto_tune(model, args.compare_backends[0], ['qiskit_aqua_cmd'], '-jo',
+                                 _read_result, options, max_parallel, cpus, args.pin_cpus)
+        print('Auto tune picked {} concurrent runs.'.format(max_parallel))
+
+    rows = compare_backends(model, args.compare_backends, ['qiskit_aqua_cmd'], '-jo',
+                            _read_result, options, max_parallel, cpus, args.pin_cpus)
+    if args.jo is not None:
+        with open(args.jo, 'w') as run_output:
+            write_result(rows, run_output)
+        return
+
+    print('\n\n--------------------------------- R E S U L T -----'
+          '-------------------------------\n')
+    for line in format_comparison(rows):
+        print(line)
+
+
+def _run_queue(argv):
+    parser = argparse.ArgumentParser(prog='qiskit_aqua_cmd queue',
+                                     formatter_class=argparse.RawTextHelpFormatter,
+                                     description='Qiskit Aqua spool directory job queue')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+    submit_parser = subparsers.add_parser('submit', help='Queue input files')
+    submit_parser.add_argument('spool',
+                               metavar='spool',
+                               help='Spool directory')
+    submit_parser.add_argument('inputs',
+                               metavar='input',
+                               nargs='+',
+                               help='Algorithm JSON input file')
+    submit_parser.add_argument('--priority',
+                               metavar='priority',
+                               type=int,
+                               default=0,
+                               help='Jobs with higher priority run first, 0 to 9999 '
+                                    '(defaults to 0)')
+    submit_parser.add_argument('--retries',
+                               metavar='retries',
+                               type=int,
+                               default=0,
+                               help='Times a failed job is queued again (defaults to 0)')
+    submit_parser.add_argument('--memory-limit',
+                               metavar='MB',
+                               type=float,
+                               help='Megabytes a job may use before it is killed')
+    submit_parser.add_argument('--time-limit',
+                               metavar='seconds',
+                               type=float,
+                               help='Seconds a job may run before it is killed')
+    submit_parser.add_argument('--memory-check',
+                               metavar='policy',
+                               choices=MEMORY_CHECK_POLICIES,
+                               help='Simulator memory check policy of the jobs {}'.format(
+                                   MEMORY_CHECK_POLICIES))
+    worker_parser = subparsers.add_parser('worker', help='Claim and run queued jobs')
+    worker_parser.add_argument('spool',
+                               metavar='spool',
+                               help='Spool directory')
+    worker_parser.add_argument('--once',
+                               action='store_true',
+                               help='Exit as soon as no job is pending')
+    worker_parser.add_argument('--poll',
+                               metavar='seconds',
+                               type=float,
+                               default=5.0,
+                               help='Seconds between checks for pending jobs (defaults to 5)')
+    worker_parser.add_argument('--max-jobs',
+                               metavar='jobs',
+                               type=int,
+                               help='Exit after running this many jobs')
+    worker_parser.add_argument('--lease',
+                               metavar='seconds',
+                               type=float,
+                               default=CLAIM_LEASE,
+                               help='Seconds after which the running job of a worker that '
+                                    'stopped renewing its claim is queued again, longer than '
+                                    'the 30 seconds claim renewal interval '
+                                    '(defaults to {:g})'.format(CLAIM_LEASE))
+    status_parser = subparsers.add_parser('status', help='List queued, running and ended jobs')
+    status_parser.add_argument('spool',
+                               metavar='spool',
+                               help='Spool directory')
+
+    args = parser.parse_args(argv)
+    if args.command == 'submit':
+        memory_limit = None
+        if args.memory_limit is not None:
+            memory_limit = int(args.memory_limit * 1024 ** 2)
+        options = []
+        if args.memory_check is not None:
+            options = ['--memory-check', args.memory_check]
+        for input_file in args.inputs:
+            job = submit_job(args.spool, input_file, args.priority, args.retries,
+                             memory_limit, args.time_limit, options)
+            print("Job '{}' queued: {}".format(job['id'], input_file))
+    elif args.command == 'worker':
+        try:
+            count = run_worker(args.spool, ['qiskit_aqua_cmd'], args.once, args.poll,
+                               args.max_jobs, args.lease)
+        except KeyboardInterrupt:
+            print('Worker stopped.')
+            return
+        print('Worker ran {} jobs.'.format(count))
+    else:
+        for line in format_queue_status(queue_status(args.spool)):
+            print(line)
+
+
+def _run_results(argv):
+    parser = argparse.ArgumentParser(prog='qiskit_aqua_cmd results',
+                                     formatter_class=argparse.RawTextHelpFormatter,
+                                     description='Qiskit Aqua SQLite results database')
+    parser.add_argument('--db',
+                        metavar='database',
+                        default=ResultsStore.PATH,
+                        help='SQLite results database (defaults to {})'.format(ResultsStore.PATH))
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+    list_parser = subparsers.add_parser('list', help='List recorded runs')
+    export_parser = subparsers.add_parser('export', help='Export recorded runs as CSV')
+    export_parser.add_argument('-o',
+                               metavar='output',
+                               help='CSV output file name (defaults to standard output)')
+    for sub_parser in [list_parser, export_parser]:
+        sub_parser.add_argument('--where',
+                                metavar='filter',
+                                action='append',
+                                help=textwrap.dedent('''\
+                                    Run column or input section.property, operator
+                                    (= != < > <= >=) and value, for example
+                                    backend=qasm_simulator or optimizer.maxiter>100
+                                    '''))
+        sub_parser.add_argument('--sort',
+                                metavar='column',
+                                help='Run column or input section.property to sort by')
+        sub_parser.add_argument('--desc',
+                                action='store_true',
+                                help='Sort descending')
+        sub_parser.add_argument('--limit',
+                                metavar='runs',
+                                type=int,
+                                help='Maximum number of runs')
+    diff_parser = subparsers.add_parser('diff', help='Compare the input, result and versions '
+                                                     'of two recorded runs')
+    diff_parser.add_argument('first',
+                             metavar='id',
+                             type=int,
+                             help='Run id')
+    diff_parser.add_argument('second',
+                             metavar='id',
+                             type=int,
+                             help='Run id')
+
+    args = parser.parse_args(argv)
+    if not os.path.isfile(args.db):
+        raise SystemExit("Results database '{}' not found.".format(args.db))
+
+    store = ResultsStore(args.db)
+    try:
+        if args.command == 'diff':
+            lines = format_diff(store.diff(args.first, args.second))
+            for line in lines:
+                print(line)
+            return
+
+        runs = store.list_runs(args.where, args.sort, args.desc, args.limit)
+        if args.command == 'list':
+            for line in format_runs(runs):
+                print(line)
+        elif args.o is not None:
+            with open(args.o, 'w', newline='') as file:
+                store.export_csv(runs, file)
+        else:
+            store.export_csv(runs, sys.stdout)
+    finally:
+        store.close()
+
+
 def _run():
     _check_extra_requires('console_scripts', 'qiskit_aqua_cmd')
+    if sys.argv[1:2] == ['queue']:
+        _run_queue(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ['results']:
+        _run_results(sys.argv[2:])
+        return
+
     from qiskit.aqua._logging import (get_logging_level,
                                       build_logging_config,
                                       set_logging_config,
                                       set_qiskit_aqua_logging)
     from qiskit_aqua_interfaces.aqua.user_interface import UIPreferences
-    from qiskit.aqua import run_algorithm
+    from qiskit.aqua import QiskitAqua
     from qiskit.aqua.utils import convert_json_to_dict
 
     preferences = UIPreferences()
@@ -73,7 +332,8 @@ def _run():
                                      description='Qiskit Aqua Command Line Tool')
     parser.add_argument('input',
                         metavar='input',
-                        help='Algorithm JSON input file')
+                        nargs='?',
+                        help='Algorithm JSON input file, optionally gzip, bzip2 or xz compressed')
     parser.add_argument('-jo',
                         metavar='output',
                         help='Algorithm JSON output file name')
@@ -86,8 +346,157 @@ def _run():
                             (defaults to level from preferences file: {})
                              '''.format(list(log_levels.keys()), preferences.filepath))
                         )
+    parser.add_argument('--memory-check',
+                        metavar='policy',
+                        choices=MEMORY_CHECK_POLICIES,
+                        default='error',
+                        help=textwrap.dedent('''\
+                            Simulator memory estimate check before running:
+                            {}
+                            (defaults to error: refuse the run if estimate exceeds available memory)
+                             '''.format(MEMORY_CHECK_POLICIES))
+                        )
+    parser.add_argument('--checkpoint',
+                        metavar='dir',
+                        help='Directory to periodically save the optimizer state in')
+    parser.add_argument('--checkpoint-interval',
+                        metavar='seconds',
+                        type=float,
+                        default=Checkpoint.INTERVAL,
+                        help='Seconds between checkpoints (defaults to {})'.format(
+                            Checkpoint.INTERVAL))
+    parser.add_argument('--resume',
+                        action='store_true',
+                        help='Resume from the last checkpoint saved in the checkpoint directory')
+    parser.add_argument('--time-budget',
+                        metavar='seconds',
+                        type=float,
+                        help=textwrap.dedent('''\
+                            Wall clock seconds allowed, the best result so far is returned
+                            when exhausted (overrides {} section time_budget)
+                            '''.format(RUN_OPTIONS)))
+    parser.add_argument('--max-evals',
+                        metavar='evaluations',
+                        type=int,
+                        help=textwrap.dedent('''\
+                            Objective evaluations allowed, the best result so far is returned
+                            when exhausted (overrides {} section max_evals)
+                            '''.format(RUN_OPTIONS)))
+    parser.add_argument('--convergence-window',
+                        metavar='evaluations',
+                        type=int,
+                        help=textwrap.dedent('''\
+                            Stop when the best objective value improved less than the
+                            convergence tolerance over this many evaluations
+                            (overrides {} section convergence_window)
+                            '''.format(RUN_OPTIONS)))
+    parser.add_argument('--convergence-tol',
+                        metavar='tolerance',
+                        type=float,
+                        help=textwrap.dedent('''\
+                            Convergence tolerance (defaults to {}, overrides {} section
+                            convergence_tol)
+                            '''.format(CONVERGENCE_TOL, RUN_OPTIONS)))
+    parser.add_argument('--repeat',
+                        metavar='runs',
+                        type=int,
+                        help=textwrap.dedent('''\
+                            Run the input this many times in this process and report
+                            wall time and result value statistics
+                            '''))
+    parser.add_argument('--warmup',
+                        metavar='runs',
+                        type=int,
+                        default=0,
+                        help='Runs discarded before the repeated ones (defaults to 0)')
+    parser.add_argument('--seed-vary',
+                        action='store_true',
+                        help='Offset the problem random_seed by the run index on each repeat')
+    parser.add_argument('--compare-backends',
+                        metavar='backend',
+                        nargs='+',
+                        help=textwrap.dedent('''\
+                            Run the input on each backend (name or provider:name) at once in
+                            separate processes and report runtime, peak memory and result
+                            '''))
+    parser.add_argument('--max-parallel',
+                        metavar='runs',
+                        type=int,
+                        help='Maximum concurrent backend runs (defaults to the core budget)')
+    parser.add_argument('--cores',
+                        metavar='cores',
+                        type=int,
+                        help=textwrap.dedent('''\
+                            Core budget: numerical libraries and simulator threads, split
+                            between the runs with --compare-backends (defaults to all CPUs)
+                            '''))
+    parser.add_argument('--cpus',
+                        metavar='list',
+                        help='CPUs to take the core budget from, for example 0-3,8 '
+                             '(defaults to the available CPUs)')
+    parser.add_argument('--pin-cpus',
+                        action='store_true',
+                        help='Pin each run to its share of the core budget CPUs')
+    parser.add_argument('--stdin-jsonl',
+                        action='store_true',
+                        help=textwrap.dedent('''\
+                            Read one algorithm JSON input per line from standard input and
+                            write one JSON result document per line to standard output
+                            '''))
+    parser.add_argument('--results-db',
+                        metavar='database',
+                        nargs='?',
+                        const=ResultsStore.PATH,
+                        help='Record the run in a SQLite results database (defaults to {})'.format(
+                            ResultsStore.PATH))
+    parser.add_argument('--auto-tune',
+                        action='store_true',
+                        help=textwrap.dedent('''\
+                            With --compare-backends, time short runs of the first backend
+                            to pick the runs and threads split with the best throughput
+                            '''))
+    warm_start_group = parser.add_mutually_exclusive_group(required=False)
+    warm_start_group.add_argument('--warm-start-from',
+                                  metavar='result',
+                                  help='JSON result or checkpoint file to take the '
+                                       'algorithm initial point from')
+    warm_start_group.add_argument('--warm-start',
+                                  action='store_true',
+                                  help=textwrap.dedent('''\
+                                      Take the algorithm initial point from the best previous
+                                      --warm-start result of an input differing only in
+                                      optimizer settings, and record this result
+                                      '''))
 
     args = parser.parse_args()
+    if args.stdin_jsonl:
+        if args.input is not None or args.jo is not None:
+            parser.error('--stdin-jsonl reads standard input and writes standard output, '
+                         'input and -jo cannot be used')
+        if args.checkpoint is not None or args.warm_start or args.warm_start_from is not None \
+                or args.repeat is not None or args.compare_backends is not None:
+            parser.error('--stdin-jsonl cannot be used with checkpoints, warm start, '
+                         '--repeat or --compare-backends')
+    elif args.input is None:
+        parser.error('the following arguments are required: input')
+    if args.resume and args.checkpoint is None:
+        parser.error('--resume requires --checkpoint')
+    if args.compare_backends is not None and \
+            (args.checkpoint is not None or args.warm_start or args.warm_start_from is not None):
+        parser.error('--compare-backends cannot be used with checkpoints or warm start')
+    if args.auto_tune and args.compare_backends is None:
+        parser.error('--auto-tune requires --compare-backends')
+    if args.repeat is not None:
+        if args.repeat < 1 or args.warmup < 0:
+            parser.error('--repeat must be positive and --warmup non-negative')
+        if args.checkpoint is not None or args.warm_start or args.warm_start_from is not None:
+            parser.error('--repeat cannot be used with checkpoints or warm start')
+        if args.compare_backends is not None:
+            parser.error('--repeat cannot be used with --compare-backends')
+        if args.results_db is not None:
+            parser.error('--repeat cannot be used with --results-db')
+    elif args.warmup != 0 or args.seed_vary:
+        parser.error('--warmup and --seed-vary require --repeat')
 
     if args.l is not None:
         set_qiskit_aqua_logging(log_levels.get(args.l, logging.INFO))
@@ -102,16 +511,60 @@ def _run():
         preferences.save()
         set_logging_config(preferences.get_logging_config())
 
-    params = None
-    with open(args.input) as json_file:
-        params = json.load(json_file)
+    if args.stdin_jsonl:
+        print(APP_DEPRECATION_MSG, file=sys.stderr)
+        threads = limit_requested_threads(args.cores, args.cpus, args.pin_cpus)
+        failed = run_jsonl(sys.stdin, sys.stdout, merge_run_options({}, args),
+                           args.memory_check, threads, args.results_db)
+        if failed:
+            raise SystemExit('{} inputs failed.'.format(failed))
+        return
 
+    _, contents = read_input(args.input)
+    params = parse_json_input(args.input, contents)
+    del contents
+
+    run_options = merge_run_options(pop_run_options(params), args)
+    cpus = core_budget(args.cores, args.cpus)
     print(APP_DEPRECATION_MSG)
-    ret = run_algorithm(params, None, True)
+    if args.compare_backends is not None:
+        _compare_backends(args, run_options, cpus)
+        return
+
+    # thread limits only when a core budget was asked for
+    threads = limit_requested_threads(args.cores, args.cpus, args.pin_cpus)
+    if args.repeat is not None:
+        _run_repeated(params, args, run_options, threads)
+        return
+
+    monitor = RunMonitor()
+    install_stop_handlers(monitor)
+    add_run_checks(monitor, run_options)
+    qiskit_aqua = QiskitAqua(params)
+    verify_simulator_memory(qiskit_aqua, args.memory_check)
+    set_simulator_threads(qiskit_aqua, threads)
+    monitor.attach(qiskit_aqua)
+    warm_start = WarmStart(args.input, args.warm_start_from, args.warm_start)
+    # keyed by the sections after defaults merge, as recorded runs
+    warm_start.attach(qiskit_aqua, qiskit_aqua.parser.get_sections())
+    checkpoint = None
+    if args.checkpoint is not None:
+        checkpoint = Checkpoint(args.checkpoint, args.input,
+                                args.checkpoint_interval, args.resume)
+        checkpoint.attach(qiskit_aqua, monitor)
+
+    start = time.perf_counter()
+    ret = monitor.run(qiskit_aqua, True)
+    runtime = time.perf_counter() - start
+    if checkpoint is not None:
+        checkpoint.save(monitor)
 
+    warm_start.save(ret)
+    if args.results_db is not None:
+        record_run(args.results_db, args.input, qiskit_aqua.parser.get_sections(), ret, runtime)
     if args.jo is not None:
         with open(args.jo, 'w') as run_output:
-            print('{}'.format(ret), file=run_output)
+            write_result(ret, run_output)
     else:
         convert_json_to_dict(ret)
         print('\n\n--------------------------------- R E S U L T -----'
@@ -78,6 +78,6 @@ class AquaGUIProvider(GUIProvider):
         """Add items to file menu"""
         pass
 
-    def create_run_thread(self, model, outputview, thread_queue):
+    def create_run_thread(self, model, outputview, thread_queue, options=None):
         """Creates run thread"""
-        return AquaThread(model, outputview, thread_queue)
+        return AquaThread(model, outputview, thread_queue, options)
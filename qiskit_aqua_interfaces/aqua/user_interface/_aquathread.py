@@ -21,10 +21,12 @@ import logging
 import io
 import platform
 import os
+import signal
 import subprocess
 import traceback
 import psutil
 from qiskit_aqua_interfaces.user_interface import GUIProvider
+from ._uipreferences import UIPreferences
 
 logger = logging.getLogger(__name__)
 
@@ -38,22 +40,45 @@ def exception_to_string(excp):
 
 class AquaThread(threading.Thread):
     """ Aqua Thread """
-    def __init__(self, model, output, queue) -> None:
+    def __init__(self, model, output, queue, options=None) -> None:
         super(AquaThread, self).__init__(name='Aqua run thread')
         self.model = model
         self._output = output
         self._thread_queue = queue
+        self._options = options if options is not None else []
+        self._stop_timeout = UIPreferences().get_stop_timeout(GUIProvider.STOP_TIMEOUT)
         self._popen = None
 
     def stop(self):
-        """ stop thread """
-        self._output = None
-        self._thread_queue = None
+        """ stop thread, the process gets a stop signal before being killed """
         if self._popen is not None:
             proc = self._popen
+            try:
+                # the process stops after the current evaluation with partial results
+                if sys.platform == 'win32':
+                    proc.send_signal(signal.CTRL_BREAK_EVENT)
+                else:
+                    proc.terminate()
+                proc.wait(timeout=self._stop_timeout)
+                return
+            except subprocess.TimeoutExpired:
+                if self._output is not None:
+                    self._output.write_line(
+                        'Process did not stop after {} seconds, killing it.'.format(
+                            self._stop_timeout))
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.debug('Process stop signal has failed: %s', str(ex))
+
+            self._output = None
             self._kill(proc.pid)
             proc.stdout.close()
 
+    def kill(self):
+        """ kill the process right away, without waiting for its partial results """
+        proc = self._popen
+        if proc is not None:
+            self._kill(proc.pid)
+
     def _kill(self, proc_pid):
         try:
             process = psutil.Process(proc_pid)
@@ -77,16 +102,22 @@ class AquaThread(threading.Thread):
                 self.model.save_to_file(input_file)
 
             startupinfo = None
+            creationflags = 0
             if sys.platform == 'win32':
                 startupinfo = subprocess.STARTUPINFO()
                 startupinfo.dwFlags = subprocess.STARTF_USESHOWWINDOW
                 startupinfo.wShowWindow = subprocess.SW_HIDE
+                creationflags = subprocess.CREATE_NEW_PROCESS_GROUP
+
+            input_array = ['qiskit_aqua_cmd', input_file]
+            input_array.extend(self._options)
 
-            self._popen = subprocess.Popen(['qiskit_aqua_cmd', input_file],
+            self._popen = subprocess.Popen(input_array,
                                            stdin=subprocess.DEVNULL,
                                            stdout=subprocess.PIPE,
                                            stderr=subprocess.STDOUT,
-                                           startupinfo=startupinfo)
+                                           startupinfo=startupinfo,
+                                           creationflags=creationflags)
             if self._thread_queue is not None:
                 self._thread_queue.put(GUIProvider.START)
 
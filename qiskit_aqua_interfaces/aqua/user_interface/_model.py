@@ -15,15 +15,28 @@
 """Qiskit Aqua user interface model."""
 
 import os
+import json
 import logging
 from qiskit_aqua_interfaces.aqua.user_interface._uipreferences import UIPreferences
 from qiskit_aqua_interfaces.user_interface import BaseModel
+from qiskit_aqua_interfaces.command_line import is_encoded_operator, sidecar_paths_to_abs
 
 logger = logging.getLogger(__name__)
 
 # pylint: disable=import-outside-toplevel
 
 
+def _operator_num_qubits(qubit_op):
+    if is_encoded_operator(qubit_op):
+        return qubit_op.get('num_qubits')
+    if isinstance(qubit_op, dict):
+        paulis = qubit_op.get('paulis')
+        if paulis:
+            return len(paulis[0]['label'])
+
+    return None
+
+
 class Model(BaseModel):
     """ Aqua Model """
     def new(self):
@@ -38,7 +51,46 @@ class Model(BaseModel):
         """ load input file """
         from qiskit.aqua.parser._inputparser import InputParser
         uipreferences = UIPreferences()
-        return super().load_model(filename, InputParser, uipreferences.get_populate_defaults(True))
+        section_names = super().load_model(filename, InputParser,
+                                           uipreferences.get_populate_defaults(True))
+        # compact operators stay encoded, their sidecar files must resolve from any directory
+        if self._parser is not None and \
+                sidecar_paths_to_abs(self._parser.get_sections(), filename):
+            self._parser.commit_changes()
+
+        return section_names
+
+    def recover_file(self, recovery_file):
+        """ load the input data of a recovery file """
+        from qiskit.aqua.parser._inputparser import InputParser
+        uipreferences = UIPreferences()
+        return super().recover_model(recovery_file, InputParser,
+                                     uipreferences.get_populate_defaults(True))
+
+    def lazy_section_names(self):
+        """ the input section operators of large files load on first use """
+        from qiskit.aqua import PluggableType
+        return [PluggableType.INPUT.value]
+
+    def summarize_section(self, section_name, properties):
+        return {'num_qubits': _operator_num_qubits(properties.get('qubit_op'))}
+
+    def decode_section(self, section_name, text):
+        properties = json.loads(text)
+        sidecar_paths_to_abs({section_name: properties}, self.get_filename())
+        return properties
+
+    def write_file(self, filename):
+        """ writes the sections as JSON, section by section """
+        # deferred sections text may have sidecar files relative to the model file
+        model_file = self.get_filename()
+        deferred = model_file is not None and \
+            os.path.dirname(os.path.abspath(model_file)) == \
+            os.path.dirname(os.path.abspath(filename))
+        lines = ['    {}: {}'.format(json.dumps(name), self.get_section_json(name, deferred))
+                 for name in sorted(self.get_section_names())]
+        with open(filename, 'w') as file:
+            print('{\n' + ',\n'.join(lines) + '\n}', file=file)
 
     def default_properties_equals_properties(self, section_name):
         from qiskit.aqua.parser import JSONSchema
@@ -80,3 +132,14 @@ class Model(BaseModel):
                 input_names.append(input_name)
 
         return input_names
+
+    def get_num_qubits(self):
+        """ get number of qubits from the input section operator """
+        from qiskit.aqua import PluggableType
+        # known without loading a deferred input section
+        summary = self.get_section_summary(PluggableType.INPUT.value)
+        if summary is not None:
+            return summary['num_qubits']
+
+        return _operator_num_qubits(
+            self.get_section_property(PluggableType.INPUT.value, 'qubit_op'))
@@ -115,6 +115,50 @@ class UIPreferences:
         """ set populate defaults flag """
         self._preferences['populate_defaults'] = populate_defaults
 
+    def get_stop_timeout(self, default_value: Optional[int] = None) -> int:
+        """ get seconds to wait for a run to stop before killing it """
+        if 'stop_timeout' in self._preferences:
+            return self._preferences['stop_timeout']
+
+        return default_value
+
+    def set_stop_timeout(self, stop_timeout: int) -> None:
+        """ set seconds to wait for a run to stop before killing it """
+        self._preferences['stop_timeout'] = stop_timeout
+
+    def get_convergence_window(self, default_value: Optional[int] = None) -> int:
+        """ get evaluations window of the early stop convergence check """
+        if 'convergence_window' in self._preferences:
+            return self._preferences['convergence_window']
+
+        return default_value
+
+    def set_convergence_window(self, convergence_window: int) -> None:
+        """ set evaluations window of the early stop convergence check """
+        self._preferences['convergence_window'] = convergence_window
+
+    def get_convergence_tol(self, default_value: Optional[float] = None) -> float:
+        """ get tolerance of the early stop convergence check """
+        if 'convergence_tol' in self._preferences:
+            return self._preferences['convergence_tol']
+
+        return default_value
+
+    def set_convergence_tol(self, convergence_tol: float) -> None:
+        """ set tolerance of the early stop convergence check """
+        self._preferences['convergence_tol'] = convergence_tol
+
+    def get_autosave_interval(self, default_value: Optional[int] = None) -> int:
+        """ get seconds between autosaves of edits to a recovery file, 0 disables them """
+        if 'autosave_interval' in self._preferences:
+            return self._preferences['autosave_interval']
+
+        return default_value
+
+    def set_autosave_interval(self, autosave_interval: int) -> None:
+        """ set seconds between autosaves of edits to a recovery file, 0 disables them """
+        self._preferences['autosave_interval'] = autosave_interval
+
     def get_recent_files(self) -> List[str]:
         """ get recent files list """
         files = []
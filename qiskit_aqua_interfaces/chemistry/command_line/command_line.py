@@ -14,15 +14,70 @@
 
 """Qiskit Chemistry command line main."""
 
+import os
 import sys
 import argparse
 import json
+import copy
+import time
+import shutil
+import tempfile
 from collections import OrderedDict
 import textwrap
 import logging
 from qiskit_aqua_interfaces import APP_DEPRECATION_MSG
 from qiskit_aqua_interfaces.chemistry.user_interface import UIPreferences
 from qiskit_aqua_interfaces._extras_require import _check_extra_requires
+from qiskit_aqua_interfaces.command_line import (MEMORY_CHECK_POLICIES,
+                                                 verify_simulator_memory,
+                                                 RunMonitor,
+                                                 install_stop_handlers,
+                                                 Checkpoint,
+                                                 WarmStart,
+                                                 RUN_OPTIONS,
+                                                 pop_run_options,
+                                                 strip_run_options,
+                                                 merge_run_options,
+                                                 CONVERGENCE_TOL,
+                                                 add_run_checks,
+                                                 run_options_to_args,
+                                                 result_value,
+                                                 write_result,
+                                                 compare_backends,
+                                                 format_comparison,
+                                                 auto_tune,
+                                                 core_budget,
+                                                 limit_threads,
+                                                 limit_requested_threads,
+                                                 set_simulator_threads,
+                                                 ResultsStore,
+                                                 record_run,
+                                                 DriverCache,
+                                                 OperatorCache,
+                                                 parallel_runs,
+                                                 split_cores,
+                                                 cache_driver_outputs,
+                                                 run_pipeline,
+                                                 format_pipeline,
+                                                 export_pipeline_csv,
+                                                 read_molecule_library,
+                                                 write_molecule_inputs,
+                                                 CHEMICAL_ACCURACY,
+                                                 check_simulator_memory,
+                                                 sweep_variants,
+                                                 write_operator_variants,
+                                                 size_operator_variants,
+                                                 format_sweep,
+                                                 scan_points,
+                                                 write_scan_inputs,
+                                                 run_scan_drivers,
+                                                 format_scan,
+                                                 INPUT_JSON,
+                                                 read_input,
+                                                 parse_json_input,
+                                                 OPERATOR_ENCODINGS,
+                                                 operator_to_arrays,
+                                                 encode_operators)
 
 # pylint: disable=import-outside-toplevel
 
@@ -49,20 +104,46 @@ def _run_delay(root):
             root.destroy()
 
 
-def _run_algorithm_from_json(params, output_file):
+def _run_algorithm_from_json(params, output_file, memory_check, monitor,
+                             checkpoint=None, warm_start=None, threads=None, results_db=None):
     """Runs the Aqua Chemistry experiment from Qiskit Aqua json dictionary
 
     Args:
         params (dictionary): Qiskit Aqua json dictionary
         output_file (filename): Output file name to save results
+        memory_check (str): simulator memory check policy
+        monitor (RunMonitor): run monitor
+        checkpoint (Checkpoint): optimizer state checkpoint or None
+        warm_start (WarmStart): initial point warm start or None
+        threads (int): simulator threads or None for the backend default
+        results_db (tuple): results database and input file to record the run or None
     """
-    from qiskit.aqua import run_algorithm
+    from qiskit.aqua import QiskitAqua
     from qiskit.aqua.utils import convert_json_to_dict
 
-    ret = run_algorithm(params, None, True)
+    qiskit_aqua = QiskitAqua(params)
+    verify_simulator_memory(qiskit_aqua, memory_check)
+    if threads is not None:
+        set_simulator_threads(qiskit_aqua, threads)
+    monitor.attach(qiskit_aqua)
+    if warm_start is not None:
+        warm_start.attach(qiskit_aqua, qiskit_aqua.parser.get_sections())
+    if checkpoint is not None:
+        checkpoint.attach(qiskit_aqua, monitor)
+
+    start = time.perf_counter()
+    ret = monitor.run(qiskit_aqua, True)
+    runtime = time.perf_counter() - start
+    if checkpoint is not None:
+        checkpoint.save(monitor)
+    if warm_start is not None:
+        warm_start.save(ret)
+    if results_db is not None:
+        record_run(results_db[0], results_db[1], qiskit_aqua.parser.get_sections(), ret, runtime)
+
     if output_file is not None:
         with open(output_file, 'w') as run_output:
-            print('{}'.format(ret), file=run_output)
+            write_result(ret, run_output)
     else:
         convert_json_to_dict(ret)
         print('\n\n--------------------------------- R E S U L T ----'
@@ -74,9 +155,578 @@ def _run_algorithm_from_json(params, output_file):
             print(ret)
 
 
+def _save_algorithm_input(qiskit_aqua, json_file, encoding=None):
+    """Saves the Qiskit Aqua json dictionary of a chemistry run, as run_driver_to_json does
+
+    Args:
+        qiskit_aqua (QiskitAqua): algorithm built by the driver
+        json_file (filename): Algorithm JSON output file name
+        encoding (str): columnar operators encoding, inline or sidecar, or None
+            for Pauli dictionaries
+    """
+    data = copy.deepcopy(qiskit_aqua.params)
+    algorithm_input = qiskit_aqua.algorithm_input
+    if encoding is None:
+        data['input'] = algorithm_input.to_params()
+    else:
+        aux_ops = list(algorithm_input.aux_ops or [])
+        operators = [('qubit_op',) + operator_to_arrays(algorithm_input.qubit_op)]
+        operators += [('aux_ops_{}'.format(i),) + operator_to_arrays(x)
+                      for i, x in enumerate(aux_ops)]
+        encoded = encode_operators(operators, json_file, encoding)
+        data['input'] = {'qubit_op': encoded['qubit_op'],
+                         'aux_ops': [encoded['aux_ops_{}'.format(i)] for i in range(len(aux_ops))]}
+    data['input']['name'] = algorithm_input.configuration['name']
+    with open(json_file, 'w') as file:
+        json.dump(data, file, sort_keys=True, indent=4)
+
+    print("Algorithm input file saved: '{}'".format(json_file))
+
+
+def _run_experiment(input_file, output_file, memory_check, monitor,
+                    checkpoint=None, warm_start=None, threads=None, results_db=None,
+                    driver_cache=None, operator_cache=None, algorithm_input=None,
+                    encoding=None):
+    """Runs the Qiskit Chemistry experiment from input file
+
+    Args:
+        input_file (filename): Qiskit Chemistry input file
+        output_file (filename): Output file name to save results
+        memory_check (str): simulator memory check policy
+        monitor (RunMonitor): run monitor
+        checkpoint (Checkpoint): optimizer state checkpoint or None
+        warm_start (WarmStart): initial point warm start or None
+        threads (int): simulator threads or None for the backend default
+        results_db (tuple): results database and input file to record the run or None
+        driver_cache (DriverCache): driver output cache or None
+        operator_cache (OperatorCache): qubit operator cache or None
+        algorithm_input (filename): Algorithm JSON output file name to save before
+            running or None
+        encoding (str): algorithm input columnar operators encoding or None
+    Returns:
+        dict: chemistry result
+    """
+    from qiskit.chemistry import QiskitChemistry
+
+    qiskit_chemistry = None
+    if operator_cache is not None:
+        qiskit_chemistry = operator_cache.load(input_file)
+    if qiskit_chemistry is None:
+        qiskit_chemistry = QiskitChemistry()
+        params = input_file if driver_cache is None else driver_cache.prepare(input_file)
+        qiskit_chemistry.run_driver(params)
+        if algorithm_input is not None:
+            _save_algorithm_input(qiskit_chemistry.qiskit_aqua, algorithm_input, encoding)
+        if driver_cache is not None and driver_cache.is_pending(qiskit_chemistry.hdf5_file):
+            driver_cache.store()
+        elif qiskit_chemistry.hdf5_file:
+            return {'printable': ["HDF5 file saved '{}'".format(qiskit_chemistry.hdf5_file)]}
+        if operator_cache is not None:
+            operator_cache.store(qiskit_chemistry)
+    elif algorithm_input is not None:
+        # the cached operator builds the same algorithm input
+        _save_algorithm_input(qiskit_chemistry.qiskit_aqua, algorithm_input, encoding)
+
+    # the driver has run, the qubit operator size is now known
+    verify_simulator_memory(qiskit_chemistry.qiskit_aqua, memory_check)
+    if threads is not None:
+        set_simulator_threads(qiskit_chemistry.qiskit_aqua, threads)
+    monitor.attach(qiskit_chemistry.qiskit_aqua)
+    sections = qiskit_chemistry.parser.get_sections()
+    if driver_cache is not None:
+        sections = driver_cache.input_sections(sections)
+    if warm_start is not None:
+        warm_start.attach(qiskit_chemistry.qiskit_aqua, sections)
+    if checkpoint is not None:
+        checkpoint.attach(qiskit_chemistry.qiskit_aqua, monitor)
+
+    start = time.perf_counter()
+    data = monitor.run(qiskit_chemistry.qiskit_aqua)
+    runtime = time.perf_counter() - start
+    if checkpoint is not None:
+        checkpoint.save(monitor)
+    if warm_start is not None:
+        warm_start.save(data)
+
+    lines, result = qiskit_chemistry.operator.process_algorithm_result(data)
+    if results_db is not None:
+        record = dict(data)
+        record.update(result)
+        record_run(results_db[0], results_db[1], sections, record, runtime)
+    if data.get('truncated', False):
+        lines.append(' ')
+        lines.append('=== RUN STOPPED ({}) AFTER {} EVALUATIONS, BEST RESULT SO FAR ==='.format(
+            data['stop_reason'], data['eval_count']))
+        lines.append('* Optimal parameters: {}'.format(data['opt_params']))
+    result['printable'] = lines
+    if output_file is not None:
+        with open(output_file, 'w') as file:
+            for line in lines:
+                print(line, file=file)
+
+    return result
+
+
+def _read_result(output_file):
+    with open(output_file) as file:
+        lines = [line.strip() for line in file if line.strip()]
+
+    for line in lines:
+        if 'total ground state energy' in line.lower():
+            return line.split(':', 1)[-1].strip()
+
+    try:
+        # algorithm JSON input results are written as JSON
+        return result_value(json.loads(' '.join(lines)))
+    except ValueError:
+        return lines[0] if lines else None
+
+
+def _compare_backends(args, params, run_options, cpus):
+    if params is not None:
+        from qiskit_aqua_interfaces.aqua.user_interface._model import Model
+    else:
+        from qiskit_aqua_interfaces.chemistry.user_interface._model import Model
+    # the model parser does not accept the run options section
+    _, input_file = strip_run_options(args.input)
+    model = Model()
+    try:
+        model.load_file(input_file or args.input)
+    finally:
+        if input_file is not None:
+            os.remove(input_file)
+
+    options = ['--memory-check', args.memory_check] + run_options_to_args(run_options)
+    options += ['--driver-cache', args.driver_cache]
+    if args.no_driver_cache:
+        options.append('--no-driver-cache')
+    if args.no_operator_cache:
+        options.append('--no-operator-cache')
+    if args.results_db is not None:
+        options += ['--results-db', args.results_db]
+    max_parallel = args.max_parallel
+    if args.auto_tune:
+        max_parallel = auto_tune(model, args.compare_backends[0], ['qiskit_chemistry_cmd'],
+                                 '-o', _read_result, options, max_parallel, cpus, args.pin_cpus)
+        print('Auto tune picked {} concurrent runs.'.format(max_parallel))
+
+    rows = compare_backends(model, args.compare_backends, ['qiskit_chemistry_cmd'], '-o',
+                            _read_result, options, max_parallel, cpus, args.pin_cpus)
+    if args.o is not None:
+        with open(args.o, 'w') as file:
+            for line in format_comparison(rows):
+                print(line, file=file)
+        return
+
+    print('\n\n--------------------------------- R E S U L T '
+          '------------------------------------\n')
+    for line in format_comparison(rows):
+        print(line)
+
+
+def _run_scan(args, template_file, run_options, cpus, threads, results_db):
+    variable, start, stop, points = args.scan
+    try:
+        values = scan_points(float(start), float(stop), int(points))
+    except ValueError:
+        raise SystemExit('Invalid scan range {} {} {}.'.format(start, stop, points))
+
+    # points are written next to the template so relative paths still resolve
+    try:
+        directory = tempfile.mkdtemp(prefix='scan_',
+                                     dir=os.path.dirname(os.path.abspath(template_file)))
+    except OSError:
+        directory = tempfile.mkdtemp(prefix='scan_')
+
+    try:
+        input_files = write_scan_inputs(template_file, variable, values, directory)
+        # without caches the drivers run one at a time with their algorithm
+        if not args.no_driver_cache or not args.no_operator_cache:
+            parallel, _ = parallel_runs(len(input_files), args.max_parallel, len(cpus))
+            print('Running {} drivers, {} at once.'.format(len(input_files), parallel),
+                  flush=True)
+            run_scan_drivers(input_files, args.driver_cache, parallel,
+                             cpus[:max(1, len(cpus) // parallel)],
+                             not args.no_driver_cache, not args.no_operator_cache)
+
+        rows = []
+        params = None
+        for value, input_file in zip(values, input_files):
+            print('{} = {:.8g}'.format(variable, value), flush=True)
+            monitor = RunMonitor()
+            install_stop_handlers(monitor)
+            add_run_checks(monitor, run_options)
+            # each point starts from the optimal parameters of the previous one
+            warm_start = WarmStart(input_file, params=params,
+                                   source='{} = {:.8g}'.format(variable, value))
+            row = {'value': value, 'energy': None, 'eval_count': None, 'status': 'ok'}
+            try:
+                result = _run_experiment(
+                    input_file, None, args.memory_check, monitor, None, warm_start, threads,
+                    None if results_db is None else (results_db[0], input_file),
+                    None if args.no_driver_cache else DriverCache(args.driver_cache),
+                    None if args.no_operator_cache else OperatorCache(args.driver_cache))
+                row['energy'] = result_value(result)
+                row['eval_count'] = monitor.eval_count
+                if monitor.stop_reason is not None:
+                    row['status'] = monitor.stop_reason
+                params = monitor.best_params
+            except Exception as ex:  # pylint: disable=broad-except
+                row['status'] = 'failed: {}'.format(str(ex))
+            rows.append(row)
+            if monitor.stop_reason == 'cancelled':
+                break
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    lines = format_scan(variable, rows)
+    if args.o is not None:
+        with open(args.o, 'w') as file:
+            for line in lines:
+                print(line, file=file)
+        return
+
+    print('\n\n--------------------------------- R E S U L T '
+          '------------------------------------\n')
+    for line in lines:
+        print(line)
+
+
+def _run_batch_input(input_file, driver_result, cache_directory, memory_check, cpus,
+                     output_directory=None, results_db=None):
+    """Batch algorithm stage, runs in a pipeline worker process
+
+    Args:
+        input_file (filename): Qiskit Chemistry input file
+        driver_result (object): driver stage result, unused, the stages share the caches
+        cache_directory (str): driver and operator cache directory
+        memory_check (str): simulator memory check policy
+        cpus (list): CPUs of the worker
+        output_directory (str): directory to save each input result in or None
+        results_db (str): results database to record the run in or None
+    Returns:
+        dict: value, total dipole moment, evaluations and status
+    """
+    del driver_result
+    threads = limit_threads(cpus)
+    run_options, temp_file = strip_run_options(input_file)
+    monitor = RunMonitor()
+    add_run_checks(monitor, run_options)
+    output_file = None
+    if output_directory is not None:
+        output_file = os.path.join(output_directory,
+                                   os.path.splitext(os.path.basename(input_file))[0] + '.out')
+    driver_cache = DriverCache(cache_directory)
+    try:
+        result = _run_experiment(temp_file or input_file, output_file, memory_check, monitor,
+                                 threads=threads,
+                                 results_db=None if results_db is None
+                                 else (results_db, input_file),
+                                 driver_cache=driver_cache,
+                                 operator_cache=OperatorCache(cache_directory))
+    finally:
+        driver_cache.discard()
+        if temp_file is not None:
+            os.remove(temp_file)
+
+    return {'value': result_value(result),
+            'dipole': result.get('total_dipole_moment'),
+            'eval_count': monitor.eval_count,
+            'status': monitor.stop_reason or 'ok'}
+
+
+def _run_batch(argv):
+    parser = argparse.ArgumentParser(prog='qiskit_chemistry_cmd batch',
+                                     formatter_class=argparse.RawTextHelpFormatter,
+                                     description=textwrap.dedent('''\
+                                         Qiskit Chemistry batch: the driver of the next inputs
+                                         runs while the algorithm of the previous ones runs
+                                         '''))
+    parser.add_argument('inputs',
+                        metavar='input',
+                        nargs='*',
+                        help='Qiskit Chemistry input file')
+    parser.add_argument('-o',
+                        metavar='output',
+                        help='Batch results table output file name, CSV if it ends with .csv')
+    parser.add_argument('--template',
+                        metavar='input',
+                        help=textwrap.dedent('''\
+                            Qiskit Chemistry input template run for each --molecules
+                            geometry: $atom is replaced by 'symbol x y z; ...' (PySCF
+                            atom), $geometry by one 'symbol x y z' line per atom and
+                            $name by the molecule name
+                            '''))
+    parser.add_argument('--molecules',
+                        metavar='xyz',
+                        help='XYZ file of one or more molecules or directory of XYZ files')
+    parser.add_argument('--output-dir',
+                        metavar='dir',
+                        help='Directory to save the result of each input in, as <input>.out')
+    parser.add_argument('--driver-workers',
+                        metavar='processes',
+                        type=int,
+                        default=1,
+                        help='Driver stage processes, one core each (defaults to 1)')
+    parser.add_argument('--algorithm-workers',
+                        metavar='processes',
+                        type=int,
+                        default=1,
+                        help=textwrap.dedent('''\
+                            Algorithm stage processes, sharing the cores left by the
+                            driver stage (defaults to 1)
+                            '''))
+    parser.add_argument('--queue-size',
+                        metavar='inputs',
+                        type=int,
+                        help=textwrap.dedent('''\
+                            Inputs done with the driver stage waiting for the algorithm
+                            stage before drivers pause (defaults to the algorithm workers)
+                            '''))
+    parser.add_argument('--memory-check',
+                        metavar='policy',
+                        choices=MEMORY_CHECK_POLICIES,
+                        default='error',
+                        help='Simulator memory estimate check before running: {} '
+                             '(defaults to error)'.format(MEMORY_CHECK_POLICIES))
+    parser.add_argument('--driver-cache',
+                        metavar='dir',
+                        default=DriverCache.DIRECTORY,
+                        help='Directory caching driver outputs and qubit operators, '
+                             'shared by the stages (defaults to {})'.format(DriverCache.DIRECTORY))
+    parser.add_argument('--cores',
+                        metavar='cores',
+                        type=int,
+                        help='Core budget of the batch (defaults to all CPUs)')
+    parser.add_argument('--cpus',
+                        metavar='list',
+                        help='CPUs to take the core budget from, for example 0-3,8 '
+                             '(defaults to the available CPUs)')
+    parser.add_argument('--results-db',
+                        metavar='database',
+                        nargs='?',
+                        const=ResultsStore.PATH,
+                        help='Record the runs in a SQLite results database (defaults to {})'.format(
+                            ResultsStore.PATH))
+
+    args = parser.parse_args(argv)
+    if (args.template is None) != (args.molecules is None):
+        parser.error('--template and --molecules must be used together')
+    if args.template is None and not args.inputs:
+        parser.error('input files or --template and --molecules are required')
+    if args.driver_workers < 1 or args.algorithm_workers < 1:
+        parser.error('--driver-workers and --algorithm-workers must be at least 1')
+    if args.queue_size is not None and args.queue_size < 1:
+        parser.error('--queue-size must be at least 1')
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    # single threaded drivers get a core each, the algorithms share the rest
+    cpus = core_budget(args.cores, args.cpus)
+    driver_cpus = cpus[:min(args.driver_workers, len(cpus) - 1)] or cpus
+    algorithm_cpus = split_cores(cpus[len(driver_cpus):] or cpus, args.algorithm_workers)[0]
+
+    def progress(row):
+        print("{}: {}".format(row['item'], row['error'] or 'done'), flush=True)
+
+    print(APP_DEPRECATION_MSG)
+    inputs = list(args.inputs)
+    directory = None
+    try:
+        if args.template is not None:
+            molecules = read_molecule_library(args.molecules)
+            # inputs are written next to the template so relative paths still resolve
+            try:
+                directory = tempfile.mkdtemp(
+                    prefix='molecules_', dir=os.path.dirname(os.path.abspath(args.template)))
+            except OSError:
+                directory = tempfile.mkdtemp(prefix='molecules_')
+            inputs += write_molecule_inputs(args.template, molecules, directory)
+
+        print('Running {} inputs, {} driver and {} algorithm workers.'.format(
+            len(inputs), args.driver_workers, args.algorithm_workers), flush=True)
+        rows = run_pipeline(inputs, cache_driver_outputs, _run_batch_input,
+                            args.driver_workers, args.algorithm_workers, args.queue_size,
+                            (args.driver_cache, driver_cpus[:1]),
+                            (args.driver_cache, args.memory_check, algorithm_cpus,
+                             args.output_dir, args.results_db),
+                            progress)
+    finally:
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    if args.o is not None:
+        with open(args.o, 'w', newline='' if args.o.lower().endswith('.csv') else None) as file:
+            if args.o.lower().endswith('.csv'):
+                export_pipeline_csv(rows, file)
+            else:
+                for line in format_pipeline(rows):
+                    print(line, file=file)
+        return
+
+    print('\n\n--------------------------------- R E S U L T '
+          '------------------------------------\n')
+    for line in format_pipeline(rows):
+        print(line)
+
+
+def _run_sweep(argv):
+    parser = argparse.ArgumentParser(prog='qiskit_chemistry_cmd sweep',
+                                     formatter_class=argparse.RawTextHelpFormatter,
+                                     description=textwrap.dedent('''\
+                                         Qiskit Chemistry operator settings sweep: the driver
+                                         runs once, each variant qubit count and cost are
+                                         reported, then the affordable variants run
+                                         '''))
+    parser.add_argument('input',
+                        metavar='input',
+                        help='Qiskit Chemistry input file')
+    parser.add_argument('--vary',
+                        metavar=('property', 'value'),
+                        nargs='+',
+                        action='append',
+                        required=True,
+                        help=textwrap.dedent('''\
+                            Operator section property and its values, for example
+                            --vary freeze_core true false --vary orbital_reduction [] [-2,-1],
+                            every combination of the values is a variant
+                            '''))
+    parser.add_argument('-o',
+                        metavar='output',
+                        help='Sweep table output file name')
+    parser.add_argument('--max-qubits',
+                        metavar='qubits',
+                        type=int,
+                        help='Only run variants with at most this many qubits')
+    parser.add_argument('--dry-run',
+                        action='store_true',
+                        help='Only report the variants qubit count and cost')
+    parser.add_argument('--reference',
+                        metavar='energy',
+                        type=float,
+                        help=textwrap.dedent('''\
+                            Reference energy the variants are compared with (defaults to
+                            the energy of the variant with the most qubits)
+                            '''))
+    parser.add_argument('--tolerance',
+                        metavar='energy',
+                        type=float,
+                        default=CHEMICAL_ACCURACY,
+                        help='Energy difference still reproducing the reference '
+                             '(defaults to {})'.format(CHEMICAL_ACCURACY))
+    parser.add_argument('--parallel',
+                        metavar='processes',
+                        type=int,
+                        default=1,
+                        help='Variants sized and run at once (defaults to 1)')
+    parser.add_argument('--memory-check',
+                        metavar='policy',
+                        choices=MEMORY_CHECK_POLICIES,
+                        default='error',
+                        help=textwrap.dedent('''\
+                            Simulator memory estimate check: {}
+                            (defaults to error: variants exceeding available memory are skipped)
+                            '''.format(MEMORY_CHECK_POLICIES)))
+    parser.add_argument('--driver-cache',
+                        metavar='dir',
+                        default=DriverCache.DIRECTORY,
+                        help='Directory caching driver outputs and qubit operators '
+                             '(defaults to {})'.format(DriverCache.DIRECTORY))
+    parser.add_argument('--cores',
+                        metavar='cores',
+                        type=int,
+                        help='Core budget of the sweep (defaults to all CPUs)')
+    parser.add_argument('--cpus',
+                        metavar='list',
+                        help='CPUs to take the core budget from, for example 0-3,8 '
+                             '(defaults to the available CPUs)')
+    parser.add_argument('--results-db',
+                        metavar='database',
+                        nargs='?',
+                        const=ResultsStore.PATH,
+                        help='Record the runs in a SQLite results database (defaults to {})'.format(
+                            ResultsStore.PATH))
+
+    args = parser.parse_args(argv)
+    if args.parallel < 1:
+        parser.error('--parallel must be at least 1')
+
+    variants = sweep_variants(args.vary)
+    parallel, _ = parallel_runs(len(variants), args.parallel,
+                                len(core_budget(args.cores, args.cpus)))
+    cpus = split_cores(core_budget(args.cores, args.cpus), parallel)[0]
+    print(APP_DEPRECATION_MSG)
+    # variants are written next to the input so relative paths still resolve
+    try:
+        directory = tempfile.mkdtemp(prefix='sweep_',
+                                     dir=os.path.dirname(os.path.abspath(args.input)))
+    except OSError:
+        directory = tempfile.mkdtemp(prefix='sweep_')
+
+    try:
+        input_files = write_operator_variants(args.input, variants, directory)
+        print('Sizing {} variants, the driver runs once.'.format(len(variants)), flush=True)
+        sizes = size_operator_variants(input_files, args.driver_cache, parallel, cpus)
+        for line in format_sweep(variants, sizes):
+            print(line)
+
+        affordable = []
+        for index, size in enumerate(sizes):
+            if 'error' in size or \
+                    (args.max_qubits is not None and size['num_qubits'] > args.max_qubits):
+                continue
+            message = check_simulator_memory(size['num_qubits'], size['backend'])
+            if message is not None and args.memory_check == 'error':
+                print('Variant {} skipped: {}'.format(index, message))
+                continue
+            affordable.append(index)
+
+        rows = None
+        if not args.dry_run and affordable:
+            print('Running {} variants, {} at once.'.format(len(affordable), parallel),
+                  flush=True)
+            pipeline_rows = run_pipeline([input_files[x] for x in affordable],
+                                         cache_driver_outputs, _run_batch_input, 1, parallel,
+                                         None, (args.driver_cache, cpus[:1]),
+                                         (args.driver_cache, 'off', cpus, None, args.results_db))
+            rows = [None] * len(variants)
+            for index, row in zip(affordable, pipeline_rows):
+                rows[index] = row
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    reference = args.reference
+    if reference is None and rows is not None:
+        # the largest active space that ran is the reference
+        done = [x for x in affordable
+                if rows[x]['result'] is not None and rows[x]['result'].get('value') is not None]
+        if done:
+            largest = max(done, key=lambda x: sizes[x]['num_qubits'])
+            reference = rows[largest]['result']['value']
+
+    lines = format_sweep(variants, sizes, rows, reference, args.tolerance)
+    if args.o is not None:
+        with open(args.o, 'w') as file:
+            for line in lines:
+                print(line, file=file)
+        return
+
+    print('\n\n--------------------------------- R E S U L T '
+          '------------------------------------\n')
+    for line in lines:
+        print(line)
+
+
 def _run():
     _check_extra_requires('console_scripts', 'qiskit_chemistry_cmd')
-    from qiskit.chemistry import run_experiment, run_driver_to_json
+    if sys.argv[1:2] == ['batch']:
+        _run_batch(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ['sweep']:
+        _run_sweep(sys.argv[2:])
+        return
+
+    from qiskit.chemistry import QiskitChemistry
     from qiskit.chemistry._logging import (get_logging_level,
                                            build_logging_config,
                                            set_logging_config,
@@ -96,7 +746,8 @@ def _run():
                                      description='Qiskit Chemistry Command Line Tool')
     parser.add_argument('input',
                         metavar='input',
-                        help='Qiskit Chemistry input file or saved JSON input file')
+                        help='Qiskit Chemistry input file or saved JSON input file, '
+                             'optionally gzip, bzip2 or xz compressed')
     group = parser.add_mutually_exclusive_group(required=False)
     group.add_argument('-o',
                        metavar='output',
@@ -104,6 +755,20 @@ def _run():
     group.add_argument('-jo',
                        metavar='json output',
                        help='Algorithm JSON Output file name')
+    parser.add_argument('--save-algo-input',
+                        metavar='json output',
+                        help=textwrap.dedent('''\
+                            Algorithm JSON Output file name to save, then run the algorithm
+                            in the same process from the qubit operator already built
+                            '''))
+    parser.add_argument('--compact-operators',
+                        metavar='encoding',
+                        choices=OPERATOR_ENCODINGS,
+                        help=textwrap.dedent('''\
+                            Algorithm JSON Output qubit operators as Pauli labels and
+                            complex coefficients arrays: {}
+                            (inline: base64 in the JSON file, sidecar: .npz file next to it)
+                            '''.format(OPERATOR_ENCODINGS)))
     parser.add_argument('-l',
                         metavar='logging',
                         choices=log_levels.keys(),
@@ -113,8 +778,146 @@ def _run():
                             (defaults to level from preferences file: {})
                              '''.format(list(log_levels.keys()), preferences.filepath))
                         )
+    parser.add_argument('--memory-check',
+                        metavar='policy',
+                        choices=MEMORY_CHECK_POLICIES,
+                        default='error',
+                        help=textwrap.dedent('''\
+                            Simulator memory estimate check before running:
+                            {}
+                            (defaults to error: refuse the run if estimate exceeds available memory)
+                             '''.format(MEMORY_CHECK_POLICIES))
+                        )
+    parser.add_argument('--checkpoint',
+                        metavar='dir',
+                        help='Directory to periodically save the optimizer state in')
+    parser.add_argument('--checkpoint-interval',
+                        metavar='seconds',
+                        type=float,
+                        default=Checkpoint.INTERVAL,
+                        help='Seconds between checkpoints (defaults to {})'.format(
+                            Checkpoint.INTERVAL))
+    parser.add_argument('--resume',
+                        action='store_true',
+                        help='Resume from the last checkpoint saved in the checkpoint directory')
+    parser.add_argument('--time-budget',
+                        metavar='seconds',
+                        type=float,
+                        help=textwrap.dedent('''\
+                            Wall clock seconds allowed, the best result so far is returned
+                            when exhausted (overrides {} section time_budget)
+                            '''.format(RUN_OPTIONS)))
+    parser.add_argument('--max-evals',
+                        metavar='evaluations',
+                        type=int,
+                        help=textwrap.dedent('''\
+                            Objective evaluations allowed, the best result so far is returned
+                            when exhausted (overrides {} section max_evals)
+                            '''.format(RUN_OPTIONS)))
+    parser.add_argument('--convergence-window',
+                        metavar='evaluations',
+                        type=int,
+                        help=textwrap.dedent('''\
+                            Stop when the best objective value improved less than the
+                            convergence tolerance over this many evaluations
+                            (overrides {} section convergence_window)
+                            '''.format(RUN_OPTIONS)))
+    parser.add_argument('--convergence-tol',
+                        metavar='tolerance',
+                        type=float,
+                        help=textwrap.dedent('''\
+                            Convergence tolerance (defaults to {}, overrides {} section
+                            convergence_tol)
+                            '''.format(CONVERGENCE_TOL, RUN_OPTIONS)))
+    parser.add_argument('--compare-backends',
+                        metavar='backend',
+                        nargs='+',
+                        help=textwrap.dedent('''\
+                            Run the input on each backend (name or provider:name) at once in
+                            separate processes and report runtime, peak memory and result
+                            '''))
+    parser.add_argument('--max-parallel',
+                        metavar='runs',
+                        type=int,
+                        help='Maximum concurrent backend runs (defaults to the core budget)')
+    parser.add_argument('--cores',
+                        metavar='cores',
+                        type=int,
+                        help=textwrap.dedent('''\
+                            Core budget: numerical libraries and simulator threads, split
+                            between the runs with --compare-backends (defaults to all CPUs)
+                            '''))
+    parser.add_argument('--cpus',
+                        metavar='list',
+                        help='CPUs to take the core budget from, for example 0-3,8 '
+                             '(defaults to the available CPUs)')
+    parser.add_argument('--pin-cpus',
+                        action='store_true',
+                        help='Pin each run to its share of the core budget CPUs')
+    parser.add_argument('--scan',
+                        metavar=('variable', 'start', 'stop', 'points'),
+                        nargs=4,
+                        help=textwrap.dedent('''\
+                            Potential energy surface scan: the input is a template where
+                            $variable is replaced by evenly spaced coordinates and each point
+                            warm starts from the previous one. Drivers run in parallel to fill
+                            the enabled driver and operator caches, with --no-driver-cache
+                            and --no-operator-cache they run one at a time with each point
+                            '''))
+    parser.add_argument('--driver-cache',
+                        metavar='dir',
+                        default=DriverCache.DIRECTORY,
+                        help='Directory caching driver outputs and qubit operators '
+                             '(defaults to {})'.format(DriverCache.DIRECTORY))
+    parser.add_argument('--no-driver-cache',
+                        action='store_true',
+                        help='Always run the driver, neither reading nor saving its output')
+    parser.add_argument('--no-operator-cache',
+                        action='store_true',
+                        help='Always build the qubit operator, neither reading nor saving it')
+    parser.add_argument('--results-db',
+                        metavar='database',
+                        nargs='?',
+                        const=ResultsStore.PATH,
+                        help='Record the run in a SQLite results database (defaults to {})'.format(
+                            ResultsStore.PATH))
+    parser.add_argument('--auto-tune',
+                        action='store_true',
+                        help=textwrap.dedent('''\
+                            With --compare-backends, time short runs of the first backend
+                            to pick the runs and threads split with the best throughput
+                            '''))
+    warm_start_group = parser.add_mutually_exclusive_group(required=False)
+    warm_start_group.add_argument('--warm-start-from',
+                                  metavar='result',
+                                  help='JSON result or checkpoint file to take the '
+                                       'algorithm initial point from')
+    warm_start_group.add_argument('--warm-start',
+                                  action='store_true',
+                                  help=textwrap.dedent('''\
+                                      Take the algorithm initial point from the best previous
+                                      --warm-start result of an input differing only in
+                                      optimizer settings, and record this result
+                                      '''))
 
     args = parser.parse_args()
+    if args.resume and args.checkpoint is None:
+        parser.error('--resume requires --checkpoint')
+    if args.compare_backends is not None and \
+            (args.checkpoint is not None or args.warm_start or args.warm_start_from is not None):
+        parser.error('--compare-backends cannot be used with checkpoints or warm start')
+    if args.scan is not None and \
+            (args.jo is not None or args.compare_backends is not None or
+             args.checkpoint is not None or args.warm_start or args.warm_start_from is not None):
+        parser.error('--scan cannot be used with -jo, --compare-backends, checkpoints '
+                     'or warm start')
+    if args.auto_tune and args.compare_backends is None:
+        parser.error('--auto-tune requires --compare-backends')
+    if args.save_algo_input is not None and \
+            (args.jo is not None or args.compare_backends is not None or args.scan is not None):
+        parser.error('--save-algo-input cannot be used with -jo, --compare-backends or --scan')
+    if args.compact_operators is not None and args.jo is None and args.save_algo_input is None:
+        parser.error('--compact-operators requires -jo or --save-algo-input')
 
     if args.l is not None:
         set_qiskit_chemistry_logging(log_levels.get(args.l, logging.INFO))
@@ -129,24 +932,83 @@ def _run():
         preferences.save()
         set_logging_config(preferences.get_logging_config())
 
-    # check to see if input is json file
+    # the input is read once, its format sniffed from its extension or first character
     params = None
-    try:
-        with open(args.input) as json_file:
-            params = json.load(json_file)
-    except Exception:  # pylint: disable=broad-except
-        pass
+    input_format, contents = read_input(args.input)
+    if input_format == INPUT_JSON:
+        params = parse_json_input(args.input, contents)
 
-    print(APP_DEPRECATION_MSG)
+    # run options are not part of the chemistry input schema
+    input_file = args.input
     if params is not None:
-        _run_algorithm_from_json(params, args.o)
+        run_options = pop_run_options(params)
     else:
-        if args.jo is not None:
-            run_driver_to_json(args.input, args.jo)
+        # compressed inputs are decompressed to a temporary input file
+        run_options, input_file = strip_run_options(args.input, contents)
+        input_file = input_file or args.input
+    del contents
+
+    run_options = merge_run_options(run_options, args)
+    checkpoint = None
+    if args.checkpoint is not None:
+        checkpoint = Checkpoint(args.checkpoint, args.input,
+                                args.checkpoint_interval, args.resume)
+
+    warm_start = WarmStart(args.input, args.warm_start_from, args.warm_start)
+    results_db = None
+    if args.results_db is not None:
+        results_db = (args.results_db, args.input)
+
+    driver_cache = None
+    if params is None and not args.no_driver_cache:
+        driver_cache = DriverCache(args.driver_cache)
+    operator_cache = None
+    if params is None and not args.no_operator_cache:
+        operator_cache = OperatorCache(args.driver_cache)
+
+    cpus = core_budget(args.cores, args.cpus)
+    threads = None
+    if args.compare_backends is None:
+        # thread limits only when a core budget was asked for
+        threads = limit_requested_threads(args.cores, args.cpus, args.pin_cpus)
+
+    print(APP_DEPRECATION_MSG)
+    monitor = RunMonitor()
+    install_stop_handlers(monitor)
+    add_run_checks(monitor, run_options)
+    try:
+        if args.compare_backends is not None:
+            _compare_backends(args, params, run_options, cpus)
+        elif args.scan is not None:
+            if params is not None:
+                raise SystemExit('--scan requires a Qiskit Chemistry input template.')
+            _run_scan(args, input_file, run_options, cpus, threads, results_db)
+        elif params is not None:
+            if args.save_algo_input is not None:
+                raise SystemExit('--save-algo-input requires a Qiskit Chemistry input file.')
+            _run_algorithm_from_json(params, args.o, args.memory_check, monitor,
+                                     checkpoint, warm_start, threads, results_db)
         else:
-            result = run_experiment(args.input, args.o)
-            if result is not None and 'printable' in result:
-                print('\n\n--------------------------------- R E S U L T '
-                      '------------------------------------\n')
-                for line in result['printable']:
-                    print(line)
+            if args.jo is not None:
+                qiskit_chemistry = QiskitChemistry()
+                qiskit_chemistry.run_driver(input_file if driver_cache is None
+                                            else driver_cache.prepare(input_file))
+                _save_algorithm_input(qiskit_chemistry.qiskit_aqua, args.jo,
+                                      args.compact_operators)
+                if driver_cache is not None:
+                    driver_cache.store()
+            else:
+                result = _run_experiment(input_file, args.o, args.memory_check, monitor,
+                                         checkpoint, warm_start, threads, results_db,
+                                         driver_cache, operator_cache, args.save_algo_input,
+                                         args.compact_operators)
+                if result is not None and 'printable' in result:
+                    print('\n\n--------------------------------- R E S U L T '
+                          '------------------------------------\n')
+                    for line in result['printable']:
+                        print(line)
+    finally:
+        if driver_cache is not None:
+            driver_cache.discard()
+        if input_file != args.input:
+            os.remove(input_file)
@@ -102,7 +102,7 @@ class ChemistryGUIProvider(GUIProvider):
         dict_menu.add_command(label='Clipboard', command=self._export_dictionary_to_clipboard)
         dict_menu.add_command(label='File...', command=self._export_dictionary_to_file)
 
-    def create_run_thread(self, model, outputview, thread_queue):
+    def create_run_thread(self, model, outputview, thread_queue, options=None):
         """Creates run thread"""
         filename = None
         if self.save_algo_json.get() != 0:
@@ -116,7 +116,7 @@ class ChemistryGUIProvider(GUIProvider):
             preferences.set_savefile_initialdir(os.path.dirname(filename))
             preferences.save()
 
-        return ChemistryThread(model, outputview, thread_queue, filename)
+        return ChemistryThread(model, outputview, thread_queue, filename, options)
 
     def _export_dictionary_to_clipboard(self):
         if self.controller.is_empty():
@@ -29,14 +29,11 @@ class Controller(BaseController):
     def __init__(self, guiprovider) -> None:
         super().__init__(guiprovider, Model())
 
-    def open_file(self, filename):
-        ret = super().open_file(filename)
-        if ret and not self.model.get_section_names():
+    def on_file_opened(self):
+        if not self.model.get_section_names():
             self.outputview.write_line('The file appears not to be a qiskit chemistry input file; '
                                        'no begin/end sections found.')
 
-        return ret
-
     def cb_section_select(self, section_name):
         self._sections_view.show_remove_button(True)
         self._sections_view_title.set(section_name)
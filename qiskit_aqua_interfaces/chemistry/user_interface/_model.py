@@ -18,6 +18,7 @@ import os
 from collections import OrderedDict
 import logging
 from qiskit_aqua_interfaces.user_interface import BaseModel
+from qiskit_aqua_interfaces.command_line import estimate_chemistry_num_qubits
 from ._uipreferences import UIPreferences
 
 logger = logging.getLogger(__name__)
@@ -41,6 +42,13 @@ class Model(BaseModel):
         uipreferences = UIPreferences()
         return super().load_model(filename, InputParser, uipreferences.get_populate_defaults(True))
 
+    def recover_file(self, recovery_file):
+        """ load the input data of a recovery file """
+        from qiskit.chemistry.parser import InputParser
+        uipreferences = UIPreferences()
+        return super().recover_model(recovery_file, InputParser,
+                                     uipreferences.get_populate_defaults(True))
+
     def default_properties_equals_properties(self, section_name):
         """ check if default properties are the same as current properties """
         from qiskit.aqua.parser import JSONSchema
@@ -122,3 +130,31 @@ class Model(BaseModel):
                 operator_names.append(operator_name)
 
         return operator_names
+
+    def get_num_qubits(self):
+        """ get number of qubits from HDF5 driver data and operator settings """
+        from qiskit.aqua.parser import JSONSchema
+        from qiskit.chemistry.parser import InputParser
+        from qiskit.chemistry import QMolecule
+        driver_name = self.get_section_property(InputParser.DRIVER, JSONSchema.NAME)
+        if driver_name is None or driver_name.lower() != 'hdf5':
+            # other drivers need to run first
+            return None
+
+        hdf5_file = self.get_section_property(driver_name.lower(), 'hdf5_input')
+        if not hdf5_file:
+            return None
+
+        filename = self.get_filename()
+        if filename is not None and not os.path.isabs(hdf5_file):
+            hdf5_file = os.path.join(os.path.dirname(os.path.realpath(filename)), hdf5_file)
+
+        if not os.path.isfile(hdf5_file):
+            return None
+
+        molecule = QMolecule(hdf5_file)
+        molecule.load()
+        return estimate_chemistry_num_qubits(
+            molecule.num_orbitals,
+            molecule.core_orbitals,
+            self.get_section_properties(InputParser.OPERATOR))
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Common Command Line"""
+
+from ._memory import (MEMORY_CHECK_POLICIES,
+                      estimate_simulator_memory,
+                      check_simulator_memory,
+                      estimate_chemistry_num_qubits,
+                      verify_simulator_memory)
+from ._run_monitor import RunInterrupted, RunMonitor, install_stop_handlers
+from ._checkpoint import Checkpoint
+from ._warm_start import warm_start_key, load_result_params, WarmStart
+from ._operator_encoding import (COLUMNAR,
+                                 OPERATOR_ENCODINGS,
+                                 is_encoded_operator,
+                                 encode_operator,
+                                 decode_operator_arrays,
+                                 decode_operator,
+                                 expand_operators,
+                                 sidecar_paths_to_abs,
+                                 encode_operators)
+from ._input_format import (INPUT_JSON,
+                            INPUT_CHEMISTRY,
+                            is_compressed,
+                            input_suffix,
+                            sniff_input_format,
+                            read_input,
+                            parse_json_input,
+                            index_json_sections)
+from ._run_options import (RUN_OPTIONS,
+                           pop_run_options,
+                           strip_run_options,
+                           merge_run_options,
+                           RunBudget,
+                           CONVERGENCE_TOL,
+                           ConvergenceCheck,
+                           add_run_checks,
+                           run_options_to_args)
+from ._benchmark import (vary_seed,
+                         result_json_default,
+                         write_result,
+                         result_value,
+                         summarize,
+                         format_statistics,
+                         run_repeated)
+from ._threads import (THREAD_ENV_VARS,
+                       available_cpus,
+                       parse_cpu_list,
+                       core_budget,
+                       split_cores,
+                       format_cpu_list,
+                       thread_env,
+                       limit_threads,
+                       limit_requested_threads,
+                       set_simulator_threads)
+from ._compare import parallel_runs, compare_backends, format_comparison, auto_tune
+from ._queue import (JOB_STATES,
+                     CLAIM_LEASE,
+                     init_spool,
+                     submit_job,
+                     recover_stale_jobs,
+                     claim_job,
+                     run_job,
+                     run_worker,
+                     queue_status,
+                     format_queue_status)
+from ._results_db import (RUN_COLUMNS,
+                          package_versions,
+                          flatten,
+                          summarize_operators,
+                          parse_filter,
+                          ResultsStore,
+                          record_run,
+                          format_runs,
+                          format_diff)
+from ._jsonl import JSONL_ID, run_jsonl
+from ._driver_cache import driver_cache_key, DriverCache
+from ._operator_cache import (operator_to_arrays,
+                              operator_from_arrays,
+                              operator_cache_key,
+                              OperatorCache)
+from ._pipeline import (cache_driver_outputs,
+                        run_pipeline,
+                        format_pipeline,
+                        export_pipeline_csv)
+from ._molecules import (MOLECULE_VARIABLES,
+                         read_xyz,
+                         read_molecule_library,
+                         write_molecule_inputs)
+from ._sweep import (CHEMICAL_ACCURACY,
+                     sweep_variants,
+                     write_operator_variants,
+                     operator_size,
+                     size_operator_variants,
+                     sweep_cost,
+                     format_sweep)
+from ._scan import scan_points, write_scan_inputs, run_scan_drivers, format_scan
+
+__all__ = ['MEMORY_CHECK_POLICIES',
+           'estimate_simulator_memory',
+           'check_simulator_memory',
+           'estimate_chemistry_num_qubits',
+           'verify_simulator_memory',
+           'RunInterrupted',
+           'RunMonitor',
+           'install_stop_handlers',
+           'Checkpoint',
+           'warm_start_key',
+           'load_result_params',
+           'WarmStart',
+           'COLUMNAR',
+           'OPERATOR_ENCODINGS',
+           'is_encoded_operator',
+           'encode_operator',
+           'decode_operator_arrays',
+           'decode_operator',
+           'expand_operators',
+           'sidecar_paths_to_abs',
+           'encode_operators',
+           'INPUT_JSON',
+           'INPUT_CHEMISTRY',
+           'is_compressed',
+           'input_suffix',
+           'sniff_input_format',
+           'read_input',
+           'parse_json_input',
+           'index_json_sections',
+           'RUN_OPTIONS',
+           'pop_run_options',
+           'strip_run_options',
+           'merge_run_options',
+           'RunBudget',
+           'CONVERGENCE_TOL',
+           'ConvergenceCheck',
+           'add_run_checks',
+           'run_options_to_args',
+           'vary_seed',
+           'result_json_default',
+           'write_result',
+           'result_value',
+           'summarize',
+           'format_statistics',
+           'run_repeated',
+           'THREAD_ENV_VARS',
+           'available_cpus',
+           'parse_cpu_list',
+           'core_budget',
+           'split_cores',
+           'format_cpu_list',
+           'thread_env',
+           'limit_threads',
+           'limit_requested_threads',
+           'set_simulator_threads',
+           'parallel_runs',
+           'compare_backends',
+           'format_comparison',
+           'auto_tune',
+           'JOB_STATES',
+           'CLAIM_LEASE',
+           'init_spool',
+           'submit_job',
+           'recover_stale_jobs',
+           'claim_job',
+           'run_job',
+           'run_worker',
+           'queue_status',
+           'format_queue_status',
+           'RUN_COLUMNS',
+           'package_versions',
+           'flatten',
+           'summarize_operators',
+           'parse_filter',
+           'ResultsStore',
+           'record_run',
+           'format_runs',
+           'format_diff',
+           'JSONL_ID',
+           'run_jsonl',
+           'driver_cache_key',
+           'DriverCache',
+           'operator_to_arrays',
+           'operator_from_arrays',
+           'operator_cache_key',
+           'OperatorCache',
+           'cache_driver_outputs',
+           'run_pipeline',
+           'format_pipeline',
+           'export_pipeline_csv',
+           'MOLECULE_VARIABLES',
+           'read_xyz',
+           'read_molecule_library',
+           'write_molecule_inputs',
+           'CHEMICAL_ACCURACY',
+           'sweep_variants',
+           'write_operator_variants',
+           'operator_size',
+           'size_operator_variants',
+           'sweep_cost',
+           'format_sweep',
+           'scan_points',
+           'write_scan_inputs',
+           'run_scan_drivers',
+           'format_scan']
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Repeated runs statistics"""
+
+import copy
+import json
+import time
+import logging
+import numpy as np
+from ._memory import verify_simulator_memory
+from ._run_monitor import RunMonitor, install_stop_handlers
+from ._run_options import add_run_checks
+from ._threads import set_simulator_threads
+
+logger = logging.getLogger(__name__)
+
+_QUANTILES = [25, 50, 75]
+
+
+def vary_seed(params, index):
+    """
+    Returns a copy of the input with the problem random seed offset by index
+
+    Args:
+        params (dict): Qiskit Aqua json dictionary
+        index (int): run index
+    Returns:
+        dict: input copy
+    """
+    params = copy.deepcopy(params)
+    problem = params.setdefault('problem', {})
+    seed = problem.get('random_seed')
+    problem['random_seed'] = (seed if seed is not None else 0) + index
+    return params
+
+
+def result_json_default(value):
+    """ JSON encoding of result values: numpy arrays and scalars, complex as real and imag """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, complex):
+        return {'real': value.real, 'imag': value.imag}
+
+    return str(value)
+
+
+def write_result(result, file):
+    """
+    Writes an algorithm result as JSON, complex values as real and imag dictionaries
+
+    Args:
+        result (dict): algorithm result
+        file (file): text file
+    """
+    json.dump(result, file, sort_keys=True, indent=4, default=result_json_default)
+    file.write('\n')
+
+
+def _real(value):
+    if isinstance(value, dict):
+        # json converted complex
+        value = value.get('real')
+    return float(np.real(value))
+
+
+def result_value(result):
+    """
+    Returns the objective value of an algorithm result
+
+    Args:
+        result (dict): algorithm result
+    Returns:
+        float: energy, minimum value or first eigenvalue, None if missing
+    """
+    for name in ['energy', 'min_val']:
+        if result.get(name) is not None:
+            return _real(result[name])
+
+    eigvals = result.get('eigvals')
+    if eigvals is not None and len(eigvals) > 0:
+        return _real(eigvals[0])
+
+    return None
+
+
+def summarize(values):
+    """
+    Computes statistics of a list of values
+
+    Args:
+        values (list): values, None entries are ignored
+    Returns:
+        dict: count, mean, std, min, quantiles and max or None if no values
+    """
+    values = [x for x in values if x is not None]
+    if not values:
+        return None
+
+    stats = {
+        'count': len(values),
+        'mean': float(np.mean(values)),
+        'std': float(np.std(values)),
+        'min': float(np.min(values)),
+    }
+    for quantile, value in zip(_QUANTILES, np.percentile(values, _QUANTILES)):
+        stats['{}%'.format(quantile)] = float(value)
+
+    stats['max'] = float(np.max(values))
+    return stats
+
+
+def format_statistics(statistics):
+    """
+    Formats statistics as a table
+
+    Args:
+        statistics (dict): statistics name to summarize result
+    Returns:
+        list: table lines
+    """
+    columns = ['mean', 'std', 'min'] + ['{}%'.format(x) for x in _QUANTILES] + ['max']
+    lines = ['{:<16}'.format('') + ''.join(['{:>16}'.format(x) for x in columns])]
+    for name, stats in statistics.items():
+        if stats is None:
+            lines.append('{:<16}{:>16}'.format(name, 'n/a'))
+            continue
+
+        lines.append('{:<16}'.format(name) +
+                     ''.join(['{:>16.8g}'.format(stats[x]) for x in columns]))
+
+    return lines
+
+
+def run_repeated(params, repeat, warmup=0, seed_vary=False,
+                 run_options=None, memory_check='error', threads=None):
+    """
+    Runs the same input many times in this process
+
+    Args:
+        params (dict): Qiskit Aqua json dictionary
+        repeat (int): number of measured runs
+        warmup (int): number of runs discarded before the measured ones
+        seed_vary (bool): offset the problem random seed by the run index
+        run_options (dict): budget and convergence run options
+        memory_check (str): simulator memory check policy
+        threads (int): simulator threads or None for the backend default
+    Returns:
+        dict: statistics of wall time and result value and the measured runs
+    """
+    from qiskit.aqua import QiskitAqua  # pylint: disable=import-outside-toplevel
+
+    runs = []
+    for index in range(warmup + repeat):
+        run_params = vary_seed(params, index) if seed_vary else copy.deepcopy(params)
+        monitor = RunMonitor()
+        install_stop_handlers(monitor)
+        add_run_checks(monitor, run_options or {})
+        start = time.perf_counter()
+        qiskit_aqua = QiskitAqua(run_params)
+        verify_simulator_memory(qiskit_aqua, memory_check)
+        if threads is not None:
+            set_simulator_threads(qiskit_aqua, threads)
+        monitor.attach(qiskit_aqua)
+        result = monitor.run(qiskit_aqua, True)
+        wall_time = time.perf_counter() - start
+        warming = index < warmup
+        print('{} run {} of {}: {:.3f} s, value {}'.format(
+            'Warmup' if warming else 'Measured',
+            index + 1 if warming else index - warmup + 1,
+            warmup if warming else repeat,
+            wall_time, result_value(result)), flush=True)
+        if not warming:
+            runs.append({
+                'random_seed': run_params.get('problem', {}).get('random_seed'),
+                'wall_time': wall_time,
+                'value': result_value(result),
+                'truncated': result.get('truncated', False),
+            })
+        if monitor.stop_reason == 'cancelled':
+            logger.info('Repeats cancelled after %s runs.', index + 1)
+            break
+
+    return {
+        'repeat': len(runs),
+        'warmup': warmup,
+        'statistics': {
+            'wall time (s)': summarize([x['wall_time'] for x in runs]),
+            'value': summarize([x['value'] for x in runs]),
+        },
+        'runs': runs,
+    }
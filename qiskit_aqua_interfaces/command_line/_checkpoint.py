@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Variational algorithm checkpoint"""
+
+import os
+import json
+import time
+import tempfile
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """
+    Periodically saves the optimizer state of a monitored run in a directory
+    so that an interrupted run can resume from its best parameters.
+    """
+
+    FILENAME = 'checkpoint.json'
+    # default seconds between checkpoints
+    INTERVAL = 60
+
+    def __init__(self, directory, input_file, interval=INTERVAL, resume=False) -> None:
+        """
+        Args:
+            directory (str): checkpoint directory, created if missing
+            input_file (str): run input file, saved to detect mismatched resumes
+            interval (float): minimum seconds between checkpoints
+            resume (bool): resume from the last checkpoint when attached
+        """
+        self._directory = directory
+        self._input_file = os.path.abspath(input_file)
+        self._interval = interval
+        self._resume = resume
+        self._last_save = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def filepath(self):
+        """ returns checkpoint file path """
+        return os.path.join(self._directory, Checkpoint.FILENAME)
+
+    def attach(self, qiskit_aqua, monitor):
+        """
+        Resumes if requested and adds the checkpoint to the monitor checks
+
+        Args:
+            qiskit_aqua (QiskitAqua): Qiskit Aqua object already built
+            monitor (RunMonitor): run monitor already attached
+        """
+        if not monitor.attached:
+            logger.warning('Algorithm has no evaluation callback, no checkpoints will be saved.')
+            return
+
+        if self._resume:
+            self.resume(qiskit_aqua, monitor)
+
+        monitor.add_check(self)
+
+    def __call__(self, monitor):
+        """ run monitor check saving a checkpoint once the interval has elapsed, never stops """
+        if time.monotonic() - self._last_save >= self._interval:
+            self.save(monitor)
+
+    def save(self, monitor):
+        """
+        Saves the monitor state atomically
+
+        Args:
+            monitor (RunMonitor): run monitor
+        """
+        self._last_save = time.monotonic()
+        if monitor.best_params is None:
+            return
+
+        state = {
+            'input': self._input_file,
+            'eval_count': monitor.eval_count,
+            'params': monitor.params,
+            'best_value': monitor.best_value,
+            'best_params': monitor.best_params,
+            'stop_reason': monitor.stop_reason,
+        }
+        f_d, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self._directory)
+        try:
+            with os.fdopen(f_d, 'w') as file:
+                json.dump(state, file, indent=2)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.filepath)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+        logger.debug("Checkpoint saved '%s' at evaluation %s.", self.filepath, monitor.eval_count)
+
+    def load(self):
+        """
+        Loads the last saved state
+
+        Returns:
+            dict: saved state or None if there is no checkpoint
+        """
+        if not os.path.isfile(self.filepath):
+            return None
+
+        with open(self.filepath) as file:
+            state = json.load(file)
+
+        if state.get('input') != self._input_file:
+            logger.warning("Checkpoint '%s' was saved for input '%s'.",
+                           self.filepath, state.get('input'))
+
+        return state
+
+    def resume(self, qiskit_aqua, monitor):
+        """
+        Sets the algorithm initial point to the best parameters of the last
+        checkpoint and restores the monitor evaluation count
+
+        Args:
+            qiskit_aqua (QiskitAqua): Qiskit Aqua object already built
+            monitor (RunMonitor): run monitor
+        Returns:
+            bool: True if resumed, False if there is no checkpoint to resume from
+        Raises:
+            SystemExit: algorithm has no initial point
+        """
+        state = self.load()
+        if state is None:
+            print("No checkpoint found in '{}', starting a new run.".format(self._directory))
+            return False
+
+        algorithm = qiskit_aqua.quantum_algorithm
+        if not hasattr(algorithm, 'initial_point'):
+            raise SystemExit("Algorithm '{}' cannot resume: it has no initial point.".format(
+                algorithm.__class__.__name__))
+
+        algorithm.initial_point = np.asarray(state['best_params'])
+        monitor.restore(state['eval_count'], state['best_value'], state['best_params'])
+        print('Resuming from checkpoint after {} evaluations, best value {}.'.format(
+            state['eval_count'], state['best_value']))
+        return True
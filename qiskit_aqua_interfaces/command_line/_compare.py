@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Concurrent backends comparison"""
+
+import os
+import time
+import shutil
+import tempfile
+import subprocess
+import logging
+import psutil
+from ._memory import format_bytes
+from ._threads import available_cpus, split_cores, format_cpu_list, thread_env
+
+logger = logging.getLogger(__name__)
+
+# seconds between process polls
+_POLL_INTERVAL = 0.1
+
+# evaluations of each auto tuning run
+AUTO_TUNE_EVALS = 20
+
+
+def resolve_backend(model, backend):
+    """
+    Finds the provider of a backend
+
+    Args:
+        model (BaseModel): loaded model
+        backend (str): backend name or provider:name
+    Returns:
+        tuple: provider name, backend name
+    Raises:
+        SystemExit: backend not found
+    """
+    from qiskit.aqua.parser import JSONSchema  # pylint: disable=import-outside-toplevel
+    provider, _, name = backend.rpartition(':')
+    if provider:
+        return provider, name
+
+    model.wait_available_providers()
+    providers = model.providers
+    current = model.get_section_property(JSONSchema.BACKEND, JSONSchema.PROVIDER)
+    if name in providers.get(current, []):
+        return current, name
+
+    for provider, backends in providers.items():
+        if name in backends:
+            return provider, name
+
+    raise SystemExit("Backend '{}' not found in providers: {}".format(
+        name, list(providers.keys())))
+
+
+def parallel_runs(num_runs, max_parallel=None, cores=None):
+    """
+    Returns how many runs to start at once and the threads each may use
+
+    Args:
+        num_runs (int): number of runs
+        max_parallel (int): maximum concurrent runs or None for the core budget
+        cores (int): core budget or None for the CPU count
+    Returns:
+        tuple: concurrent runs, threads per run
+    """
+    cores = cores or os.cpu_count() or 1
+    parallel = max(1, min(num_runs, max_parallel or cores))
+    return parallel, max(1, cores // parallel)
+
+
+class _BackendRun:
+    """ backend run subprocess """
+
+    def __init__(self, backend, input_file, output_file, log_file) -> None:
+        self.backend = backend
+        self.input_file = input_file
+        self.output_file = output_file
+        self.log_file = log_file
+        self.popen = None
+        self.slot = None
+        self.start = None
+        self.runtime = None
+        self.peak_memory = 0
+
+    def launch(self, args, env):
+        """ starts the subprocess """
+        with open(self.log_file, 'w') as log:
+            self.popen = subprocess.Popen(args + [self.input_file],
+                                          stdin=subprocess.DEVNULL,
+                                          stdout=log,
+                                          stderr=subprocess.STDOUT,
+                                          env=env)
+        self.start = time.monotonic()
+
+    def poll(self):
+        """ samples memory, returns True once the subprocess has ended """
+        try:
+            process = psutil.Process(self.popen.pid)
+            memory = process.memory_info().rss
+            for child in process.children(recursive=True):
+                memory += child.memory_info().rss
+            self.peak_memory = max(self.peak_memory, memory)
+        except psutil.Error:
+            pass
+
+        if self.popen.poll() is None:
+            return False
+
+        self.runtime = time.monotonic() - self.start
+        return True
+
+    def kill(self):
+        """ kills the subprocess and its children """
+        try:
+            process = psutil.Process(self.popen.pid)
+            for child in process.children(recursive=True):
+                child.kill()
+            process.kill()
+        except psutil.Error:
+            pass
+
+    def last_output_line(self):
+        """ returns the last non empty line the subprocess printed """
+        with open(self.log_file, errors='ignore') as log:
+            lines = [line.strip() for line in log if line.strip()]
+
+        return lines[-1] if lines else ''
+
+
+def compare_backends(model, backends, command, output_option, read_result,
+                     options=None, max_parallel=None, cpus=None, pin=False):
+    """
+    Runs a loaded input on several backends at once, each in its own process
+
+    Args:
+        model (BaseModel): loaded model, its backend section is changed for each run
+        backends (list): backend names or provider:name
+        command (list): command line running an input file
+        output_option (str): command line option naming the result file
+        read_result (callable): reads the result value from the result file
+        options (list): extra command line arguments
+        max_parallel (int): maximum concurrent runs or None for the core budget
+        cpus (list): CPU numbers of the core budget or None for the available CPUs
+        pin (bool): pin each run to its share of the CPUs
+    Returns:
+        list: dictionaries with backend, status, runtime, peak memory and result
+    """
+    from qiskit.aqua.parser import JSONSchema  # pylint: disable=import-outside-toplevel
+    cpus = cpus or available_cpus()
+    parallel, threads = parallel_runs(len(backends), max_parallel, len(cpus))
+    # each concurrent run gets its own block of the core budget
+    blocks = split_cores(cpus, parallel)
+    env = thread_env(threads)
+    print('Running {} backends, {} at once with {} threads each.'.format(
+        len(backends), parallel, threads), flush=True)
+    filename = model.get_filename()
+    _, ext = os.path.splitext(filename or '')
+    # next to the input, so its relative paths still resolve
+    if filename:
+        directory = tempfile.mkdtemp(prefix='compare_',
+                                     dir=os.path.dirname(os.path.abspath(filename)))
+    else:
+        directory = tempfile.mkdtemp(prefix='compare_')
+    runs = []
+    try:
+        for index, backend in enumerate(backends):
+            provider, name = resolve_backend(model, backend)
+            model.set_section_property(JSONSchema.BACKEND, JSONSchema.PROVIDER, provider)
+            model.set_section_property(JSONSchema.BACKEND, JSONSchema.NAME, name)
+            prefix = os.path.join(directory, str(index))
+            model.save_to_file(prefix + (ext or '.json'))
+            runs.append(_BackendRun(backend, prefix + (ext or '.json'),
+                                    prefix + '.out', prefix + '.log'))
+
+        args = list(command) + list(options or [])
+        pending = list(runs)
+        running = []
+        slots = list(range(len(blocks)))
+        try:
+            while pending or running:
+                while pending and slots:
+                    run = pending.pop(0)
+                    run.slot = slots.pop(0)
+                    block = blocks[run.slot]
+                    run_args = ['--cpus', format_cpu_list(block)]
+                    if pin:
+                        run_args.append('--pin-cpus')
+                    run.launch(args + run_args + [output_option, run.output_file],
+                               thread_env(len(block), env))
+                    running.append(run)
+
+                time.sleep(_POLL_INTERVAL)
+                for run in [x for x in running if x.poll()]:
+                    running.remove(run)
+                    slots.append(run.slot)
+                    print("Backend '{}' finished in {:.3f} s.".format(run.backend, run.runtime),
+                          flush=True)
+        finally:
+            for run in running:
+                run.kill()
+
+        rows = []
+        for run in runs:
+            row = {'backend': run.backend,
+                   'status': 'ok',
+                   'runtime': run.runtime,
+                   'peak_memory': run.peak_memory,
+                   'result': None}
+            try:
+                if run.popen.returncode != 0:
+                    raise Exception(run.last_output_line())
+                row['result'] = read_result(run.output_file)
+            except Exception as ex:  # pylint: disable=broad-except
+                row['status'] = 'failed'
+                row['result'] = str(ex)
+            rows.append(row)
+
+        return rows
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def format_comparison(rows):
+    """
+    Formats a backends comparison as a table
+
+    Args:
+        rows (list): compare_backends result
+    Returns:
+        list: table lines
+    """
+    width = max([len('backend')] + [len(x['backend']) for x in rows])
+    line_format = '{:<' + str(width) + '}  {:<8}{:>12}{:>14}  {}'
+    lines = [line_format.format('backend', 'status', 'runtime (s)', 'peak memory', 'result')]
+    for row in rows:
+        runtime = '' if row['runtime'] is None else '{:.3f}'.format(row['runtime'])
+        lines.append(line_format.format(row['backend'], row['status'], runtime,
+                                        format_bytes(row['peak_memory']), row['result']))
+
+    return lines
+
+
+def auto_tune(model, backend, command, output_option, read_result,
+              options=None, max_parallel=None, cpus=None, pin=False, evals=AUTO_TUNE_EVALS):
+    """
+    Picks the number of concurrent runs with the best throughput by running
+    short runs of one backend with each workers and threads split
+
+    Args:
+        model (BaseModel): loaded model
+        backend (str): backend name or provider:name to tune with
+        command (list): command line running an input file
+        output_option (str): command line option naming the result file
+        read_result (callable): reads the result value from the result file
+        options (list): extra command line arguments
+        max_parallel (int): maximum concurrent runs or None for the core budget
+        cpus (list): CPU numbers of the core budget or None for the available CPUs
+        pin (bool): pin each run to its share of the CPUs
+        evals (int): objective evaluations of each tuning run
+    Returns:
+        int: concurrent runs with the best throughput
+    """
+    cpus = cpus or available_cpus()
+    max_parallel = min(max_parallel or len(cpus), len(cpus))
+    options = list(options or []) + ['--max-evals', str(evals)]
+    best = (None, 1)
+    workers = 1
+    while workers <= max_parallel:
+        rows = compare_backends(model, [backend] * workers, command, output_option, read_result,
+                                options, workers, cpus, pin)
+        if all(x['status'] == 'ok' for x in rows):
+            # runs per second
+            throughput = workers / max(x['runtime'] for x in rows)
+            print('Auto tune: {} runs x {} threads, {:.3f} runs/s.'.format(
+                workers, len(cpus) // workers, throughput), flush=True)
+            if best[0] is None or throughput > best[0]:
+                best = (throughput, workers)
+        workers *= 2
+
+    return best[1]
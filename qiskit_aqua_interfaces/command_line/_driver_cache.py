@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Chemistry driver output cache"""
+
+import os
+import copy
+import json
+import hashlib
+import logging
+import pkg_resources
+
+logger = logging.getLogger(__name__)
+
+_DRIVER = 'driver'
+_NAME = 'name'
+_HDF5 = 'hdf5'
+_HDF5_INPUT = 'hdf5_input'
+_HDF5_OUTPUT = 'hdf5_output'
+
+
+def _canonical(value):
+    # whitespace and blank lines do not change the molecule
+    if isinstance(value, str):
+        return '\n'.join([' '.join(x.split()) for x in value.splitlines() if x.strip()])
+    if isinstance(value, dict):
+        return {str(k).lower(): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        lines = [_canonical(x) for x in value]
+        if all(isinstance(x, str) for x in lines):
+            return _canonical('\n'.join(lines))
+        return lines
+
+    return value
+
+
+def driver_cache_key(sections):
+    """
+    Computes a key identifying the driver output of a chemistry input:
+    the driver section and its driver name section, whitespace ignored
+
+    Args:
+        sections (dict): chemistry input sections
+    Returns:
+        str: hexadecimal key or None if the input has no driver
+    """
+    sections = {name.lower(): value for name, value in sections.items()}
+    driver = _canonical(sections.get(_DRIVER))
+    if not isinstance(driver, dict) or not driver.get(_NAME):
+        return None
+
+    driver.pop(_HDF5_OUTPUT, None)
+    driver_name = str(driver[_NAME]).lower()
+    try:
+        version = pkg_resources.get_distribution('qiskit-chemistry').version
+    except pkg_resources.DistributionNotFound:
+        version = None
+
+    value = json.dumps({'version': version,
+                        _DRIVER: driver,
+                        driver_name: _canonical(sections.get(driver_name))},
+                       sort_keys=True, default=str)
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+class DriverCache:
+    """
+    On disk cache of chemistry driver outputs saved as HDF5 molecule files.
+    A cached input runs the HDF5 driver on the saved molecule instead of
+    its classical driver, other inputs save the driver output in the cache.
+    """
+
+    DIRECTORY = os.path.join(os.path.expanduser('~'), '.qiskit_chemistry_driver_cache')
+
+    def __init__(self, directory=DIRECTORY) -> None:
+        """
+        Args:
+            directory (str): cache directory
+        """
+        self._directory = directory
+        self._key = None
+        self._pending = None
+        self._driver_sections = None
+
+    @property
+    def directory(self):
+        """ returns the cache directory """
+        return self._directory
+
+    @property
+    def key(self):
+        """ returns the key of the last prepared input or None """
+        return self._key
+
+    def cache_file(self, key):
+        """ returns the cache file of a key """
+        return os.path.join(self._directory, '{}.hdf5'.format(key))
+
+    def prepare(self, input_file):
+        """
+        Parses a chemistry input and points its driver at the cache
+
+        Args:
+            input_file (str): chemistry input file
+        Returns:
+            Union(dict, str): input sections to run or the input file if not cached
+        """
+        # pylint: disable=import-outside-toplevel
+        from qiskit.chemistry.parser import InputParser
+
+        self._key = None
+        self._pending = None
+        self._driver_sections = None
+        parser = InputParser(input_file)
+        parser.parse()
+        driver_name = parser.get_section_property(_DRIVER, _NAME)
+        if driver_name is None or driver_name.lower() == _HDF5 or \
+                parser.get_section_property(_DRIVER, _HDF5_OUTPUT) is not None:
+            # nothing to cache or the user saves the driver output
+            return input_file
+
+        sections = parser.to_dictionary()
+        self._key = driver_cache_key(sections)
+        if self._key is None:
+            return input_file
+
+        self._driver_sections = {name: copy.deepcopy(sections[name])
+                                 for name in [_DRIVER, driver_name.lower()] if name in sections}
+        cache_file = self.cache_file(self._key)
+        if os.path.isfile(cache_file):
+            logger.info("Driver '%s' output found in cache '%s'.", driver_name, cache_file)
+            print("Using cached driver output '{}'.".format(cache_file))
+            sections.pop(driver_name.lower(), None)
+            sections[_DRIVER] = {_NAME: 'HDF5'}
+            sections[_HDF5] = {_HDF5_INPUT: cache_file}
+            return sections
+
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+        except OSError as ex:
+            logger.warning("Driver cache '%s' not available: %s", self._directory, str(ex))
+            return input_file
+
+        # each process writes its own file, moved in the cache once complete
+        self._pending = os.path.join(self._directory, '.{}.{}.hdf5'.format(self._key, os.getpid()))
+        sections[_DRIVER] = dict(sections[_DRIVER])
+        sections[_DRIVER][_HDF5_OUTPUT] = self._pending
+        return sections
+
+    def input_sections(self, sections):
+        """
+        Returns run sections with the driver sections of the prepared input
+        instead of the cache ones, so they do not depend on the cache state
+
+        Args:
+            sections (dict): sections of the run
+        Returns:
+            dict: sections
+        """
+        if self._driver_sections is None:
+            return sections
+
+        sections = {name: value for name, value in sections.items()
+                    if name.lower() not in [_DRIVER, _HDF5]}
+        sections.update(copy.deepcopy(self._driver_sections))
+        return sections
+
+    def is_pending(self, hdf5_file):
+        """ returns True if the file is the driver output being cached """
+        return self._pending is not None and hdf5_file is not None and \
+            os.path.abspath(hdf5_file) == os.path.abspath(self._pending)
+
+    def store(self):
+        """
+        Moves the driver output saved by the run in the cache
+
+        Returns:
+            bool: True if stored
+        """
+        pending = self._pending
+        self._pending = None
+        if pending is None or not os.path.isfile(pending):
+            return False
+
+        try:
+            os.replace(pending, self.cache_file(self._key))
+        except OSError as ex:
+            logger.warning("Driver output not cached: %s", str(ex))
+            return False
+
+        logger.info("Driver output cached in '%s'.", self.cache_file(self._key))
+        return True
+
+    def discard(self):
+        """ removes a driver output not moved in the cache """
+        if self._pending is not None and os.path.isfile(self._pending):
+            os.remove(self._pending)
+
+        self._pending = None
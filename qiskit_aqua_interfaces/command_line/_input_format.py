@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Input file format detection and reading"""
+
+import os
+import re
+import bz2
+import gzip
+import lzma
+import json
+from collections import OrderedDict
+from ._operator_encoding import expand_operators
+
+INPUT_JSON = 'json'
+INPUT_CHEMISTRY = 'chemistry'
+
+# compression magic numbers and their openers
+_COMPRESSIONS = [
+    (b'\x1f\x8b', gzip.open),
+    (b'BZh', bz2.open),
+    (b'\xfd7zXZ\x00', lzma.open),
+]
+_COMPRESSED_SUFFIXES = ['.gz', '.bz2', '.xz']
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _opener(input_file):
+    with open(input_file, 'rb') as file:
+        head = file.read(6)
+
+    for magic, opener in _COMPRESSIONS:
+        if head.startswith(magic):
+            return opener
+
+    return open
+
+
+def is_compressed(input_file):
+    """ returns True if the input file is gzip, bzip2 or xz compressed """
+    return _opener(input_file) is not open
+
+
+def input_suffix(input_file):
+    """ returns the input file extension, without a compression extension """
+    name, ext = os.path.splitext(input_file)
+    if ext.lower() in _COMPRESSED_SUFFIXES:
+        _, ext = os.path.splitext(name)
+
+    return ext.lower()
+
+
+def sniff_input_format(input_file, contents):
+    """
+    Detects the format of an input from its extension, then its first
+    non blank character: JSON documents start with '{', chemistry inputs
+    with a section or a comment
+
+    Args:
+        input_file (str): input file
+        contents (str): input file contents
+    Returns:
+        str: INPUT_JSON or INPUT_CHEMISTRY
+    """
+    suffix = input_suffix(input_file)
+    if suffix == '.json':
+        return INPUT_JSON
+    if suffix in ['.txt', '.in', '.inp']:
+        return INPUT_CHEMISTRY
+
+    for char in contents[:4096]:
+        if not char.isspace():
+            return INPUT_JSON if char == '{' else INPUT_CHEMISTRY
+
+    return INPUT_CHEMISTRY
+
+
+def read_input(input_file):
+    """
+    Reads an input file once, decompressing it if needed, and detects its format
+
+    Args:
+        input_file (str): JSON or chemistry input file, optionally gzip, bzip2 or xz compressed
+    Returns:
+        tuple: format, INPUT_JSON or INPUT_CHEMISTRY, and contents
+    Raises:
+        SystemExit: input not readable or not UTF-8
+    """
+    try:
+        with _opener(input_file)(input_file, 'rt', encoding='utf8') as file:
+            contents = file.read()
+    except (OSError, EOFError, lzma.LZMAError, UnicodeDecodeError) as ex:
+        raise SystemExit("Cannot read input '{}': {}".format(input_file, str(ex)))
+
+    return sniff_input_format(input_file, contents), contents
+
+
+def parse_json_input(input_file, contents):
+    """
+    Parses a JSON input document, its columnar encoded operators expanded
+
+    Args:
+        input_file (str): input file, for the error message and operator sidecar files
+        contents (str): input file contents
+    Returns:
+        dict: input sections
+    Raises:
+        SystemExit: invalid JSON, with its line and column, or operator sidecar not found
+    """
+    try:
+        params = json.loads(contents)
+    except json.JSONDecodeError as ex:
+        raise SystemExit("Invalid JSON input '{}' at line {} column {}: {}".format(
+            input_file, ex.lineno, ex.colno, ex.msg))
+
+    if not isinstance(params, dict):
+        raise SystemExit("Invalid JSON input '{}': expected an object of sections.".format(
+            input_file))
+
+    return expand_operators(params, input_file)
+
+
+def index_json_sections(contents, summarize=None):
+    """
+    Indexes the top level sections of a JSON input by their text span, decoding one
+    section at a time, so a large section can be summarized and released before the
+    next one is decoded
+
+    Args:
+        contents (str): JSON input contents
+        summarize (callable): called as summarize(name, length, value) with the section
+            text length, returns what the index keeps instead of the value, or None
+            to keep the values
+    Returns:
+        OrderedDict: (start, end, value) of each section name, spans as contents offsets
+    Raises:
+        json.JSONDecodeError: invalid JSON or not an object
+    """
+    decoder = json.JSONDecoder()
+    sections = OrderedDict()
+
+    def expect(position, chars):
+        position = _WHITESPACE.match(contents, position).end()
+        char = contents[position:position + 1]
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                'Expecting {}'.format(' or '.join([repr(x) for x in chars])), contents, position)
+        return position + 1, char
+
+    position, _ = expect(0, '{')
+    position = _WHITESPACE.match(contents, position).end()
+    if contents[position:position + 1] == '}':
+        position += 1
+    else:
+        char = ','
+        while char == ',':
+            position = _WHITESPACE.match(contents, position).end()
+            if contents[position:position + 1] != '"':
+                raise json.JSONDecodeError(
+                    'Expecting property name enclosed in double quotes', contents, position)
+            name, position = decoder.raw_decode(contents, position)
+            position, _ = expect(position, ':')
+            start = _WHITESPACE.match(contents, position).end()
+            value, end = decoder.raw_decode(contents, start)
+            if summarize is not None:
+                value = summarize(name, end - start, value)
+            sections[name] = (start, end, value)
+            # releases a large section before decoding the next one
+            del value
+            position, char = expect(end, ',}')
+
+    position = _WHITESPACE.match(contents, position).end()
+    if position != len(contents):
+        raise json.JSONDecodeError('Extra data', contents, position)
+
+    return sections
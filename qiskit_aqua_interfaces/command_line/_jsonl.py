@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""JSON lines coprocess mode"""
+
+import sys
+import json
+import time
+import logging
+import contextlib
+from ._memory import verify_simulator_memory
+from ._run_monitor import RunMonitor, install_stop_handlers
+from ._run_options import pop_run_options, add_run_checks
+from ._threads import set_simulator_threads
+from ._results_db import record_run
+from ._benchmark import result_json_default
+from ._operator_encoding import expand_operators
+
+logger = logging.getLogger(__name__)
+
+# optional input document key echoed in its result document
+JSONL_ID = 'id'
+
+
+def run_jsonl(input_stream, output_stream, run_options=None, memory_check='error',
+              threads=None, results_db=None):
+    """
+    Runs one Qiskit Aqua JSON input per line of a stream and writes one JSON
+    result document per line, in input order. Anything the runs print goes
+    to stderr so the output stream only has result documents.
+
+    Args:
+        input_stream (file): text stream of JSON inputs, one per line
+        output_stream (file): text stream the result documents are written to
+        run_options (dict): command line run options, override the input run options sections
+        memory_check (str): simulator memory check policy
+        threads (int): simulator threads or None for the backend default
+        results_db (str): results database to record the runs in or None
+    Returns:
+        int: number of failed inputs
+    """
+    from qiskit.aqua import QiskitAqua  # pylint: disable=import-outside-toplevel
+
+    failed = 0
+    for line_number, line in enumerate(input_stream, 1):
+        if not line.strip():
+            continue
+
+        document = {'line': line_number, JSONL_ID: None, 'status': 'ok'}
+        monitor = RunMonitor()
+        try:
+            params = json.loads(line)
+            if not isinstance(params, dict):
+                raise ValueError('Input line is not a JSON object.')
+
+            document[JSONL_ID] = params.pop(JSONL_ID, None)
+            expand_operators(params)
+            options = pop_run_options(params)
+            options.update({k: v for k, v in (run_options or {}).items() if v is not None})
+            with contextlib.redirect_stdout(sys.stderr):
+                install_stop_handlers(monitor)
+                add_run_checks(monitor, options)
+                qiskit_aqua = QiskitAqua(params)
+                verify_simulator_memory(qiskit_aqua, memory_check)
+                if threads is not None:
+                    set_simulator_threads(qiskit_aqua, threads)
+                monitor.attach(qiskit_aqua)
+                start = time.perf_counter()
+                result = monitor.run(qiskit_aqua, True)
+                document['runtime'] = time.perf_counter() - start
+                if results_db is not None:
+                    record_run(results_db, None, qiskit_aqua.parser.get_sections(),
+                               result, document['runtime'])
+            document['result'] = result
+            # numpy scalars and complex values as the result files write them
+            line = json.dumps(document, sort_keys=True, default=result_json_default)
+        except (Exception, SystemExit) as ex:  # pylint: disable=broad-except
+            failed += 1
+            logger.debug('Input line %s failed', line_number, exc_info=True)
+            document['status'] = 'failed'
+            document['error'] = str(ex)
+            document.pop('result', None)
+            line = json.dumps(document, sort_keys=True, default=str)
+
+        print(line, file=output_stream, flush=True)
+        if monitor.stop_reason == 'cancelled':
+            logger.info('Input stream cancelled after line %s.', line_number)
+            break
+
+    return failed
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Simulator memory estimation"""
+
+import logging
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# size in bytes of one complex128 amplitude
+_AMPLITUDE_SIZE = 16
+
+_QUBIT_MAPPINGS = ['jordan_wigner', 'parity', 'bravyi_kitaev']
+
+MEMORY_CHECK_POLICIES = ['error', 'warn', 'off']
+
+
+def estimate_simulator_memory(num_qubits, backend_name):
+    """
+    Estimates the memory needed by a local simulator
+
+    Args:
+        num_qubits (int): number of qubits
+        backend_name (str): backend name
+    Returns:
+        int: estimated size in bytes or None if not a known simulator
+    """
+    if num_qubits is None or backend_name is None:
+        return None
+
+    name = backend_name.lower()
+    if 'unitary' in name:
+        return _AMPLITUDE_SIZE * 4 ** num_qubits
+    if 'statevector' in name or 'qasm' in name:
+        return _AMPLITUDE_SIZE * 2 ** num_qubits
+
+    return None
+
+
+def available_memory():
+    """ returns available memory in bytes """
+    return psutil.virtual_memory().available
+
+
+def format_bytes(size):
+    """ formats a size in bytes for display """
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size < 1024 or unit == 'TB':
+            break
+        size /= 1024
+
+    return '{:.1f} {}'.format(size, unit)
+
+
+def check_simulator_memory(num_qubits, backend_name):
+    """
+    Compares the simulator estimated memory with the available memory
+
+    Args:
+        num_qubits (int): number of qubits
+        backend_name (str): backend name
+    Returns:
+        str: message if the estimate exceeds available memory, None otherwise
+    """
+    estimate = estimate_simulator_memory(num_qubits, backend_name)
+    if estimate is None:
+        logger.debug("No memory estimate for backend '%s' with %s qubits.",
+                     backend_name, num_qubits)
+        return None
+
+    available = available_memory()
+    logger.debug("Backend '%s' with %s qubits estimated memory %s, available %s.",
+                 backend_name, num_qubits, estimate, available)
+    if estimate <= available:
+        return None
+
+    return "Backend '{}' with {} qubits needs an estimated {} " \
+           "but only {} memory is available.".format(backend_name,
+                                                     num_qubits,
+                                                     format_bytes(estimate),
+                                                     format_bytes(available))
+
+
+def estimate_chemistry_num_qubits(num_orbitals, core_orbitals, operator_properties):
+    """
+    Estimates the number of qubits from molecule orbitals and operator settings
+
+    Args:
+        num_orbitals (int): number of molecular orbitals
+        core_orbitals (list): core orbital indexes
+        operator_properties (dict): chemistry operator section properties
+    Returns:
+        int: number of qubits or None if it cannot be estimated
+    """
+    if num_orbitals is None:
+        return None
+
+    qubit_mapping = operator_properties.get('qubit_mapping', 'parity')
+    if qubit_mapping not in _QUBIT_MAPPINGS:
+        return None
+
+    orbitals = set(core_orbitals) if operator_properties.get('freeze_core', False) else set()
+    orbital_reduction = operator_properties.get('orbital_reduction')
+    if orbital_reduction:
+        orbitals.update([x + num_orbitals if x < 0 else x for x in orbital_reduction])
+
+    orbitals = [x for x in orbitals if 0 <= x < num_orbitals]
+    num_qubits = 2 * (num_orbitals - len(orbitals))
+    if qubit_mapping == 'parity' and operator_properties.get('two_qubit_reduction', True):
+        num_qubits -= 2
+
+    return num_qubits
+
+
+def get_num_qubits(qiskit_aqua):
+    """
+    Returns the number of qubits of the algorithm input operator
+
+    Args:
+        qiskit_aqua (QiskitAqua): Qiskit Aqua object already built
+    Returns:
+        int: number of qubits or None if not available
+    """
+    qubit_op = getattr(qiskit_aqua.algorithm_input, 'qubit_op', None)
+    if qubit_op is None:
+        return None
+
+    return qubit_op.num_qubits
+
+
+def verify_simulator_memory(qiskit_aqua, policy):
+    """
+    Verifies that the simulator of an algorithm fits in the available memory
+
+    Args:
+        qiskit_aqua (QiskitAqua): Qiskit Aqua object already built
+        policy (str): 'error' to refuse the run, 'warn' to only log it, 'off' to skip
+    Raises:
+        SystemExit: estimated memory exceeds available memory and policy is 'error'
+    """
+    if policy == 'off' or qiskit_aqua.quantum_instance is None:
+        return
+
+    message = check_simulator_memory(get_num_qubits(qiskit_aqua),
+                                     qiskit_aqua.quantum_instance.backend_name)
+    if message is None:
+        return
+
+    if policy == 'error':
+        raise SystemExit('{} Run refused, use --memory-check warn to run anyway.'.format(message))
+
+    logger.warning(message)
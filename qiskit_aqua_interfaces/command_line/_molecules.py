@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Molecule library inputs"""
+
+import os
+import re
+import string
+from ._input_format import read_input
+
+# template variables replaced by each molecule
+MOLECULE_VARIABLES = ['name', 'atom', 'geometry']
+
+_NAME = re.compile(r'[^\w.-]+')
+
+
+def _molecule_name(comment):
+    return _NAME.sub('_', comment.split()[0]).strip('_.') if comment.split() else ''
+
+
+def read_xyz(xyz_file):
+    """
+    Reads the molecules of an XYZ file, one or more records of an atom count line,
+    a comment line and one 'symbol x y z' line per atom, coordinates in Angstrom
+
+    Args:
+        xyz_file (str): XYZ file, optionally compressed
+    Returns:
+        list: (name, atoms) tuples, atoms as (symbol, x, y, z) tuples, the name is
+            the first word of the comment line or the file name and record number
+    Raises:
+        SystemExit: invalid XYZ file
+    """
+    _, contents = read_input(xyz_file)
+    stem = os.path.basename(xyz_file).split('.')[0]
+    lines = contents.splitlines()
+    molecules = []
+    index = 0
+    while index < len(lines):
+        if not lines[index].strip():
+            index += 1
+            continue
+        try:
+            count = int(lines[index].split()[0])
+        except ValueError:
+            raise SystemExit("Invalid XYZ file '{}' line {}: expected an atom count.".format(
+                xyz_file, index + 1))
+
+        comment = lines[index + 1] if index + 1 < len(lines) else ''
+        atoms = []
+        for number in range(index + 2, index + 2 + count):
+            fields = lines[number].split() if number < len(lines) else []
+            try:
+                atoms.append((fields[0], float(fields[1]), float(fields[2]), float(fields[3])))
+            except (IndexError, ValueError):
+                raise SystemExit("Invalid XYZ file '{}' line {}: expected 'symbol x y z'.".format(
+                    xyz_file, number + 1))
+
+        molecules.append((_molecule_name(comment), atoms))
+        index += 2 + count
+
+    # records without a name are named after the file
+    if len(molecules) == 1:
+        return [(molecules[0][0] or stem, molecules[0][1])]
+
+    return [(name or '{}_{}'.format(stem, number), atoms)
+            for number, (name, atoms) in enumerate(molecules)]
+
+
+def read_molecule_library(path):
+    """
+    Reads a molecule library: an XYZ file of one or more records or a directory of XYZ files
+
+    Args:
+        path (str): XYZ file or directory
+    Returns:
+        list: (name, atoms) tuples with unique names
+    Raises:
+        SystemExit: no molecule found
+    """
+    if os.path.isdir(path):
+        xyz_files = [os.path.join(path, x) for x in sorted(os.listdir(path))
+                     if '.xyz' in x.lower() and os.path.isfile(os.path.join(path, x))]
+    else:
+        xyz_files = [path]
+
+    molecules = []
+    names = set()
+    for xyz_file in xyz_files:
+        for name, atoms in read_xyz(xyz_file):
+            unique_name = name
+            suffix = 1
+            while unique_name in names:
+                unique_name = '{}_{}'.format(name, suffix)
+                suffix += 1
+            names.add(unique_name)
+            molecules.append((unique_name, atoms))
+
+    if not molecules:
+        raise SystemExit("No molecule found in '{}'.".format(path))
+
+    return molecules
+
+
+def write_molecule_inputs(template_file, molecules, directory):
+    """
+    Writes one input per molecule, replacing in the template $atom by its PySCF
+    style geometry 'symbol x y z; ...', $geometry by one 'symbol x y z' line per
+    atom and $name by its name
+
+    Args:
+        template_file (str): chemistry input template
+        molecules (list): (name, atoms) tuples
+        directory (str): directory to write the inputs in
+    Returns:
+        list: input files
+    Raises:
+        SystemExit: neither $atom nor $geometry in the template
+    """
+    _, contents = read_input(template_file)
+    template = string.Template(contents)
+    if template.safe_substitute({'atom': '', 'geometry': ''}) == contents:
+        raise SystemExit("Molecule template '{}' has neither $atom nor $geometry.".format(
+            template_file))
+
+    input_files = []
+    for name, atoms in molecules:
+        lines = ['{} {:.8f} {:.8f} {:.8f}'.format(*atom) for atom in atoms]
+        input_file = os.path.join(directory, '{}.txt'.format(name))
+        with open(input_file, 'w') as file:
+            file.write(template.safe_substitute({'name': name,
+                                                 'atom': '; '.join(lines),
+                                                 'geometry': '\n'.join(lines)}))
+        input_files.append(input_file)
+
+    return input_files
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Chemistry qubit operator cache"""
+
+import os
+import copy
+import json
+import hashlib
+import tempfile
+import logging
+import numpy as np
+from ._driver_cache import driver_cache_key, DriverCache
+
+logger = logging.getLogger(__name__)
+
+_DRIVER = 'driver'
+_OPERATOR = 'operator'
+_NAME = 'name'
+_HDF5 = 'hdf5'
+_HDF5_INPUT = 'hdf5_input'
+_HDF5_OUTPUT = 'hdf5_output'
+_INFO = 'info_'
+# Hamiltonian attributes computed from the molecule, stored as float arrays
+_HAMILTONIAN_STATE = ['hf_energy', 'nuclear_repulsion_energy', 'nuclear_dipole_moment',
+                      'reverse_dipole_sign', 'energy_shift', 'x_dipole_shift',
+                      'y_dipole_shift', 'z_dipole_shift', 'ph_energy_shift',
+                      'ph_x_dipole_shift', 'ph_y_dipole_shift', 'ph_z_dipole_shift']
+
+
+def operator_to_arrays(operator):
+    """
+    Encodes a weighted Pauli operator as a Pauli labels array and a complex coefficients array
+
+    Args:
+        operator (WeightedPauliOperator): operator
+    Returns:
+        tuple: labels bytes array, complex128 coefficients array
+    """
+    labels = np.array([pauli.to_label() for _, pauli in operator.paulis], dtype=np.bytes_)
+    coeffs = np.array([coeff for coeff, _ in operator.paulis], dtype=np.complex128)
+    return labels, coeffs
+
+
+def operator_from_arrays(labels, coeffs):
+    """
+    Decodes a weighted Pauli operator from labels and coefficients arrays
+
+    Args:
+        labels (numpy.ndarray): Pauli labels
+        coeffs (numpy.ndarray): complex coefficients
+    Returns:
+        WeightedPauliOperator: operator
+    """
+    # pylint: disable=import-outside-toplevel
+    from qiskit.quantum_info import Pauli
+    from qiskit.aqua.operators import WeightedPauliOperator
+    paulis = []
+    for label, coeff in zip(labels, coeffs):
+        label = label.decode('ascii') if isinstance(label, bytes) else str(label)
+        # real coefficients stay real as in the operator dictionary format
+        paulis.append([float(coeff.real) if coeff.imag == 0 else complex(coeff),
+                       Pauli.from_label(label)])
+
+    return WeightedPauliOperator(paulis=paulis)
+
+
+def _hdf5_stamp(sections, directory):
+    # the HDF5 driver reads a local file, its content is identified by path, time and size
+    hdf5 = sections.get(_HDF5)
+    if not isinstance(hdf5, dict):
+        return None
+
+    hdf5 = {str(k).lower(): v for k, v in hdf5.items()}
+    path = hdf5.get(_HDF5_INPUT)
+    if not path:
+        return None
+    path = str(path)
+    if not os.path.isabs(path) and directory is not None:
+        path = os.path.join(directory, path)
+    path = os.path.realpath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return [path, stat.st_mtime_ns, stat.st_size]
+
+
+def operator_cache_key(sections, directory=None):
+    """
+    Computes a key identifying the qubit operator of a chemistry input:
+    its driver output key and operator section, and for the HDF5 driver
+    the resolved molecule file with its modification time and size
+
+    Args:
+        sections (dict): chemistry input sections
+        directory (str): directory relative HDF5 files are in or None
+    Returns:
+        str: hexadecimal key or None if the input has no driver or its HDF5 file is missing
+    """
+    driver_key = driver_cache_key(sections)
+    if driver_key is None:
+        return None
+
+    sections = {name.lower(): value for name, value in sections.items()}
+    value = {_DRIVER: driver_key}
+    driver = {str(k).lower(): v for k, v in sections[_DRIVER].items()}
+    if str(driver.get(_NAME)).lower() == _HDF5:
+        value[_HDF5] = _hdf5_stamp(sections, directory)
+        if value[_HDF5] is None:
+            return None
+
+    operator = sections.get(_OPERATOR)
+    if isinstance(operator, dict):
+        operator = {str(k).lower(): v for k, v in operator.items()}
+    value[_OPERATOR] = operator
+    value = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def _hamiltonian_to_arrays(operator):
+    # computed state of a Hamiltonian, None values as empty arrays
+    arrays = {}
+    for name in _HAMILTONIAN_STATE:
+        value = getattr(operator, '_' + name)
+        arrays[name] = np.array([] if value is None else value, dtype=np.float64)
+    for name, value in operator.molecule_info.items():
+        arrays[_INFO + name] = np.array(value)
+        if arrays[_INFO + name].dtype.hasobject:
+            raise ValueError("Unsupported molecule info '{}'.".format(name))
+
+    return arrays
+
+
+def _hamiltonian_from_arrays(operator, data):
+    # restores the computed state of a Hamiltonian built from the operator section
+    for name in _HAMILTONIAN_STATE:
+        value = data[name]
+        if value.ndim == 0:
+            value = float(value)
+            if name == 'reverse_dipole_sign':
+                value = bool(value)
+        elif value.size == 0:
+            value = None
+        setattr(operator, '_' + name, value)
+    for name in data.files:
+        if name.startswith(_INFO):
+            operator.molecule_info[name[len(_INFO):]] = data[name].tolist()
+
+    return operator
+
+
+class _CachedChemistry:
+    """ QiskitChemistry stand-in built from a cached qubit operator """
+
+    def __init__(self, parser, operator, qiskit_aqua) -> None:
+        self.parser = parser
+        self.operator = operator
+        self.qiskit_aqua = qiskit_aqua
+        self.hdf5_file = None
+
+
+class OperatorCache:
+    """
+    On disk cache of chemistry qubit operators, aux operators and chemistry
+    operator state, so runs differing only in algorithm settings skip the
+    driver and the fermionic to qubit mapping.
+    """
+
+    DIRECTORY = DriverCache.DIRECTORY
+
+    def __init__(self, directory=DIRECTORY) -> None:
+        """
+        Args:
+            directory (str): cache directory
+        """
+        self._directory = directory
+        self._key = None
+
+    @property
+    def key(self):
+        """ returns the key of the last loaded input or None """
+        return self._key
+
+    def cache_file(self, key):
+        """ returns the cache file of a key """
+        return os.path.join(self._directory, '{}.npz'.format(key))
+
+    def load(self, input_file):
+        """
+        Builds the algorithm of a chemistry input from its cached qubit operator
+
+        Args:
+            input_file (str): chemistry input file
+        Returns:
+            object: object with the QiskitChemistry parser, operator and qiskit_aqua
+                attributes or None if not cached
+        """
+        # pylint: disable=import-outside-toplevel
+        from qiskit.aqua import QiskitAqua
+        from qiskit.aqua.input import EnergyInput
+        from qiskit.aqua.parser import JSONSchema
+        from qiskit.aqua.utils.backend_utils import get_provider_from_backend
+        from qiskit.chemistry.core import get_chemistry_operator_class
+        from qiskit.chemistry.parser import InputParser
+
+        self._key = None
+        parser = InputParser(input_file)
+        parser.parse()
+        if parser.get_section_property(JSONSchema.BACKEND, JSONSchema.PROVIDER) is None:
+            backend_name = parser.get_section_property(JSONSchema.BACKEND, JSONSchema.NAME)
+            if backend_name is not None:
+                parser.set_section_property(JSONSchema.BACKEND, JSONSchema.PROVIDER,
+                                            get_provider_from_backend(backend_name))
+
+        parser.validate_merge_defaults()
+        driver_name = parser.get_section_property(_DRIVER, _NAME)
+        if driver_name is None or parser.get_section_property(_DRIVER, _HDF5_OUTPUT) is not None:
+            # the user saves the driver output, the driver has to run
+            return None
+
+        self._key = operator_cache_key(parser.to_dictionary(),
+                                       os.path.dirname(os.path.realpath(input_file)))
+        if self._key is None:
+            return None
+
+        cache_file = self.cache_file(self._key)
+        if not os.path.isfile(cache_file):
+            return None
+
+        try:
+            with np.load(cache_file, allow_pickle=False) as data:
+                qubit_op = operator_from_arrays(data['labels_0'], data['coeffs_0'])
+                aux_ops = [operator_from_arrays(data['labels_{}'.format(i)],
+                                                data['coeffs_{}'.format(i)])
+                           for i in range(1, int(data['num_operators']))]
+                operator = get_chemistry_operator_class(
+                    parser.get_section_property(_OPERATOR, _NAME)).init_params(
+                        parser.get_section_properties(_OPERATOR))
+                _hamiltonian_from_arrays(operator, data)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Ignored invalid operator cache file '%s': %s", cache_file, str(ex))
+            return None
+
+        logger.info("Qubit operator found in cache '%s'.", cache_file)
+        print("Using cached qubit operator '{}'.".format(cache_file))
+        # same algorithm input as QiskitChemistry.run_driver builds
+        parser.process_substitutions(operator.molecule_info)
+        aqua_params = {}
+        for section_name, section in parser.get_sections().items():
+            if section_name in [JSONSchema.NAME, _DRIVER, driver_name.lower(), _OPERATOR] or \
+                    not isinstance(section, dict):
+                continue
+
+            aqua_params[section_name] = copy.deepcopy(section)
+            if section_name == JSONSchema.PROBLEM:
+                aqua_params[section_name].pop(InputParser.AUTO_SUBSTITUTIONS, None)
+
+        qiskit_aqua = QiskitAqua(aqua_params, EnergyInput(qubit_op, aux_ops))
+        return _CachedChemistry(parser, operator, qiskit_aqua)
+
+    def store(self, qiskit_chemistry):
+        """
+        Saves the qubit operators and chemistry operator of a run in the cache
+
+        Args:
+            qiskit_chemistry (QiskitChemistry): chemistry object after running the driver
+        Returns:
+            bool: True if stored
+        """
+        # pylint: disable=import-outside-toplevel
+        from qiskit.chemistry.core import Hamiltonian
+
+        if self._key is None or qiskit_chemistry.qiskit_aqua is None:
+            return False
+        if not isinstance(qiskit_chemistry.operator, Hamiltonian):
+            logger.info('Qubit operator not cached, only Hamiltonian state is stored.')
+            return False
+
+        algorithm_input = qiskit_chemistry.qiskit_aqua.algorithm_input
+        arrays = {}
+        operators = [algorithm_input.qubit_op] + list(algorithm_input.aux_ops or [])
+        for index, operator in enumerate(operators):
+            arrays['labels_{}'.format(index)], arrays['coeffs_{}'.format(index)] = \
+                operator_to_arrays(operator)
+        arrays['num_operators'] = np.array(len(operators))
+        try:
+            arrays.update(_hamiltonian_to_arrays(qiskit_chemistry.operator))
+            os.makedirs(self._directory, exist_ok=True)
+            f_d, temp_path = tempfile.mkstemp(prefix='.', suffix='.npz', dir=self._directory)
+            with os.fdopen(f_d, 'wb') as file:
+                np.savez_compressed(file, **arrays)
+            os.replace(temp_path, self.cache_file(self._key))
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning('Qubit operator not cached: %s', str(ex))
+            return False
+
+        logger.info("Qubit operator cached in '%s'.", self.cache_file(self._key))
+        return True
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Columnar qubit operator encoding of algorithm JSON inputs"""
+
+import os
+import base64
+import struct
+import zipfile
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR = 'columnar'
+OPERATOR_ENCODINGS = ['inline', 'sidecar']
+
+_ENCODING = 'encoding'
+_FILE = 'file'
+_KEY = 'key'
+_INPUT = 'input'
+# local file header size, its name and extra field lengths are its last 4 bytes
+_ZIP_HEADER_SIZE = 30
+
+
+def is_encoded_operator(value):
+    """ returns True if the value is a columnar encoded operator """
+    return isinstance(value, dict) and value.get(_ENCODING) == COLUMNAR
+
+
+def encode_operator(labels, coeffs, sidecar=None, key=None):
+    """
+    Encodes a qubit operator as a Pauli labels array and a complex coefficients
+    array, inline as base64 or referencing an .npz sidecar file
+
+    Args:
+        labels (numpy.ndarray): Pauli labels, as bytes
+        coeffs (numpy.ndarray): complex coefficients
+        sidecar (str): .npz file name the arrays are saved in, relative to the
+            input file, or None to encode them inline
+        key (str): arrays name prefix in the sidecar file
+    Returns:
+        dict: encoded operator
+    """
+    labels = np.asarray(labels, dtype=np.bytes_)
+    num_qubits = len(labels[0]) if len(labels) > 0 else 0
+    encoded = {_ENCODING: COLUMNAR, 'num_qubits': num_qubits, 'num_paulis': len(labels)}
+    if sidecar is not None:
+        encoded[_FILE] = sidecar
+        encoded[_KEY] = key
+        return encoded
+
+    encoded['labels'] = base64.b64encode(
+        labels.astype('S{}'.format(max(1, num_qubits))).tobytes()).decode('ascii')
+    encoded['coeffs'] = base64.b64encode(
+        np.asarray(coeffs, dtype='<c16').tobytes()).decode('ascii')
+    return encoded
+
+
+def _load_npz_member(npz_file, name):
+    # uncompressed members are memory mapped, numpy only maps .npy files
+    with zipfile.ZipFile(npz_file) as archive:
+        info = archive.getinfo(name + '.npy')
+    if info.compress_type == zipfile.ZIP_STORED:
+        with open(npz_file, 'rb') as file:
+            file.seek(info.header_offset)
+            header = file.read(_ZIP_HEADER_SIZE)
+            name_length, extra_length = struct.unpack('<HH', header[26:30])
+            file.seek(info.header_offset + _ZIP_HEADER_SIZE + name_length + extra_length)
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+            offset = file.tell()
+        if not dtype.hasobject:
+            if 0 in shape:
+                return np.empty(shape, dtype=dtype)
+            return np.memmap(npz_file, dtype=dtype, mode='r', offset=offset, shape=shape,
+                             order='F' if fortran_order else 'C')
+
+    with np.load(npz_file) as data:
+        return data[name]
+
+
+def decode_operator_arrays(encoded, directory=None):
+    """
+    Decodes the arrays of a columnar encoded operator
+
+    Args:
+        encoded (dict): encoded operator
+        directory (str): directory of the input file, sidecar files are relative to
+    Returns:
+        tuple: labels bytes array, complex128 coefficients array
+    Raises:
+        SystemExit: sidecar file not found
+    """
+    if _FILE in encoded:
+        npz_file = encoded[_FILE]
+        if not os.path.isabs(npz_file) and directory is not None:
+            npz_file = os.path.join(directory, npz_file)
+        if not os.path.isfile(npz_file):
+            raise SystemExit("Operator sidecar file '{}' not found.".format(npz_file))
+        key = encoded[_KEY]
+        return (_load_npz_member(npz_file, key + '_labels'),
+                _load_npz_member(npz_file, key + '_coeffs'))
+
+    labels = np.frombuffer(base64.b64decode(encoded['labels']),
+                           dtype='S{}'.format(max(1, encoded['num_qubits'])))
+    coeffs = np.frombuffer(base64.b64decode(encoded['coeffs']), dtype='<c16')
+    return labels, coeffs
+
+
+def decode_operator(encoded, directory=None):
+    """
+    Decodes a columnar encoded operator to the Pauli dictionary format of
+    WeightedPauliOperator.to_dict
+
+    Args:
+        encoded (dict): encoded operator
+        directory (str): directory of the input file, sidecar files are relative to
+    Returns:
+        dict: operator dictionary
+    """
+    labels, coeffs = decode_operator_arrays(encoded, directory)
+    paulis = []
+    for label, real, imag in zip(np.char.decode(labels, 'ascii').tolist(),
+                                 coeffs.real.tolist(), coeffs.imag.tolist()):
+        paulis.append({'label': label,
+                       'coeff': {'real': real, 'imag': imag} if imag != 0 else {'real': real}})
+
+    return {'paulis': paulis}
+
+
+def expand_operators(params, input_file=None):
+    """
+    Replaces the columnar encoded operators of an algorithm JSON input section
+    by their Pauli dictionaries, in place
+
+    Args:
+        params (dict): algorithm JSON input sections
+        input_file (str): input file, sidecar files are relative to, or None
+    Returns:
+        dict: params
+    """
+    section = params.get(_INPUT)
+    if not isinstance(section, dict):
+        return params
+
+    directory = None if input_file is None else os.path.dirname(os.path.abspath(input_file))
+    for name, value in section.items():
+        if is_encoded_operator(value):
+            section[name] = decode_operator(value, directory)
+        elif isinstance(value, list) and any(is_encoded_operator(x) for x in value):
+            section[name] = [decode_operator(x, directory) if is_encoded_operator(x) else x
+                             for x in value]
+
+    return params
+
+
+def sidecar_paths_to_abs(params, input_file):
+    """
+    Makes the sidecar files of the encoded operators absolute, so the input
+    can be saved in another directory, in place
+
+    Args:
+        params (dict): algorithm JSON input sections
+        input_file (str): input file, sidecar files are relative to
+    Returns:
+        bool: True if a path changed
+    """
+    section = params.get(_INPUT)
+    if not isinstance(section, dict) or input_file is None:
+        return False
+
+    directory = os.path.dirname(os.path.abspath(input_file))
+    changed = False
+    for value in section.values():
+        for item in value if isinstance(value, list) else [value]:
+            if is_encoded_operator(item) and _FILE in item and not os.path.isabs(item[_FILE]):
+                item[_FILE] = os.path.join(directory, item[_FILE])
+                changed = True
+
+    return changed
+
+
+def encode_operators(operators, json_file, encoding='inline'):
+    """
+    Encodes the qubit operators of an algorithm JSON input, saving the
+    sidecar file next to the JSON file if needed
+
+    Args:
+        operators (list): (key, labels, coeffs) tuples
+        json_file (str): algorithm JSON file the operators are written in
+        encoding (str): 'inline' or 'sidecar'
+    Returns:
+        dict: encoded operator of each key
+    """
+    if encoding == 'inline':
+        return {key: encode_operator(labels, coeffs) for key, labels, coeffs in operators}
+
+    npz_file = os.path.splitext(json_file)[0] + '.npz'
+    arrays = {}
+    encoded = {}
+    for key, labels, coeffs in operators:
+        arrays[key + '_labels'] = np.asarray(labels, dtype=np.bytes_)
+        arrays[key + '_coeffs'] = np.asarray(coeffs, dtype=np.complex128)
+        encoded[key] = encode_operator(labels, coeffs, os.path.basename(npz_file), key)
+
+    # uncompressed so the arrays can be memory mapped on load
+    with open(npz_file, 'wb') as file:
+        np.savez(file, **arrays)
+    logger.info("Operators saved in '%s'.", npz_file)
+    return encoded
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Chemistry driver and algorithm stages pipeline"""
+
+import os
+import csv
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from ._threads import limit_threads
+from ._run_options import strip_run_options
+from ._driver_cache import DriverCache
+from ._operator_cache import OperatorCache
+
+logger = logging.getLogger(__name__)
+
+
+def cache_driver_outputs(input_file, cache_directory, cpus=None,
+                         driver_cache=True, operator_cache=True):
+    """
+    Runs the driver of a chemistry input to fill the driver and qubit operator
+    caches, so the algorithm run of the input skips both
+
+    Args:
+        input_file (str): chemistry input file
+        cache_directory (str): driver and operator cache directory
+        cpus (list): CPUs of the process, only their number is used, or None for all
+        driver_cache (bool): fill the driver output cache
+        operator_cache (bool): fill the qubit operator cache
+    """
+    from qiskit.chemistry import QiskitChemistry  # pylint: disable=import-outside-toplevel
+    if not driver_cache and not operator_cache:
+        return
+
+    if cpus is not None:
+        limit_threads(cpus)
+    # the run options section is not part of the chemistry input schema
+    _, temp_file = strip_run_options(input_file)
+    driver_cache = DriverCache(cache_directory) if driver_cache else None
+    operator_cache = OperatorCache(cache_directory) if operator_cache else None
+    try:
+        if operator_cache is not None and \
+                operator_cache.load(temp_file or input_file) is not None:
+            return
+
+        qiskit_chemistry = QiskitChemistry()
+        if driver_cache is None:
+            qiskit_chemistry.run_driver(temp_file or input_file)
+        else:
+            qiskit_chemistry.run_driver(driver_cache.prepare(temp_file or input_file))
+            driver_cache.store()
+        if operator_cache is not None:
+            operator_cache.store(qiskit_chemistry)
+    finally:
+        if driver_cache is not None:
+            driver_cache.discard()
+        if temp_file is not None:
+            os.remove(temp_file)
+
+
+def _timed(function, *args):
+    # process pool worker: returns the stage seconds and result
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def run_pipeline(items, driver_stage, algorithm_stage, driver_workers=1, algorithm_workers=1,
+                 queue_size=None, driver_args=(), algorithm_args=(), callback=None):
+    """
+    Runs two stages over items, each stage in its own process pool, connected by a bounded
+    queue: the driver stage of the next items runs while the algorithm stage of the
+    previous ones runs. A driver worker waits when the queue is full, so drivers never
+    run more than the queue size ahead of the algorithm stage.
+
+    Args:
+        items (list): stage inputs, usually input files
+        driver_stage (callable): picklable function called as driver_stage(item, *driver_args)
+        algorithm_stage (callable): picklable function called as
+            algorithm_stage(item, driver_result, *algorithm_args)
+        driver_workers (int): driver stage processes
+        algorithm_workers (int): algorithm stage processes
+        queue_size (int): items done with the driver stage waiting for the algorithm stage,
+            defaults to the algorithm workers
+        driver_args (tuple): extra driver stage arguments
+        algorithm_args (tuple): extra algorithm stage arguments
+        callback (callable): called with each row as its item completes, or None
+    Returns:
+        list: rows with item, driver_time, algorithm_time, result and error, in items order
+    """
+    driver_workers = max(1, driver_workers)
+    algorithm_workers = max(1, algorithm_workers)
+    rows = [{'item': x, 'driver_time': None, 'algorithm_time': None,
+             'result': None, 'error': None} for x in items]
+    handoff = queue.Queue(maxsize=max(1, queue_size or algorithm_workers))
+    pending = iter(range(len(rows)))
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def complete(row):
+        if callback is not None:
+            with lock:
+                callback(row)
+
+    def drive(pool):
+        while not stop.is_set():
+            with lock:
+                index = next(pending, None)
+            if index is None:
+                return
+            row = rows[index]
+            try:
+                row['driver_time'], driver_result = \
+                    pool.submit(_timed, driver_stage, row['item'], *driver_args).result()
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.debug("Driver stage of '%s' failed", row['item'], exc_info=True)
+                row['error'] = 'driver: {}'.format(str(ex))
+                complete(row)
+                continue
+            # blocks while the algorithm stage is behind
+            handoff.put((index, driver_result))
+
+    def run_algorithm(pool):
+        while True:
+            entry = handoff.get()
+            if entry is None:
+                return
+            index, driver_result = entry
+            row = rows[index]
+            if not stop.is_set():
+                try:
+                    row['algorithm_time'], row['result'] = pool.submit(
+                        _timed, algorithm_stage, row['item'], driver_result,
+                        *algorithm_args).result()
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.debug("Algorithm stage of '%s' failed", row['item'], exc_info=True)
+                    row['error'] = 'algorithm: {}'.format(str(ex))
+            else:
+                row['error'] = 'cancelled'
+            complete(row)
+
+    with ProcessPoolExecutor(max_workers=driver_workers) as driver_pool, \
+            ProcessPoolExecutor(max_workers=algorithm_workers) as algorithm_pool:
+        drivers = [threading.Thread(target=drive, args=(driver_pool,), daemon=True)
+                   for _ in range(driver_workers)]
+        algorithms = [threading.Thread(target=run_algorithm, args=(algorithm_pool,), daemon=True)
+                      for _ in range(algorithm_workers)]
+        for thread in drivers + algorithms:
+            thread.start()
+        try:
+            for thread in drivers:
+                thread.join()
+            for _ in algorithms:
+                handoff.put(None)
+            for thread in algorithms:
+                thread.join()
+        except KeyboardInterrupt:
+            stop.set()
+            logger.info('Pipeline cancelled, waiting for the running stages.')
+            # unblock the driver threads, then the algorithm threads
+            while any(thread.is_alive() for thread in drivers):
+                try:
+                    index, _ = handoff.get(timeout=0.1)
+                    rows[index]['error'] = 'cancelled'
+                except queue.Empty:
+                    pass
+            for _ in algorithms:
+                handoff.put(None)
+            for thread in algorithms:
+                thread.join()
+
+    for row in rows:
+        if row['error'] is None and row['algorithm_time'] is None:
+            row['error'] = 'cancelled'
+
+    return rows
+
+
+def _pipeline_columns(row):
+    result = row['result'] or {}
+    return [os.path.splitext(os.path.basename(str(row['item'])))[0],
+            result.get('value'),
+            result.get('dipole'),
+            result.get('eval_count'),
+            row['driver_time'],
+            row['algorithm_time'],
+            row['error'] or result.get('status', 'ok')]
+
+
+def format_pipeline(rows, value_name='energy'):
+    """
+    Formats pipeline rows as a table
+
+    Args:
+        rows (list): run_pipeline rows, results are dictionaries with value,
+            dipole, eval_count and status
+        value_name (str): value column title
+    Returns:
+        list: table lines
+    """
+    line_format = '{:<32}{:>24}{:>14}{:>8}{:>12}{:>14}  {}'
+    lines = [line_format.format('input', value_name, 'dipole', 'evals', 'driver (s)',
+                                'algorithm (s)', 'status')]
+    for row in rows:
+        name, value, dipole, eval_count, driver_time, algorithm_time, status = \
+            _pipeline_columns(row)
+        lines.append(line_format.format(
+            name,
+            '' if value is None else '{:.12f}'.format(value),
+            '' if dipole is None else '{:.6f}'.format(dipole),
+            '' if eval_count is None else eval_count,
+            '' if driver_time is None else '{:.3f}'.format(driver_time),
+            '' if algorithm_time is None else '{:.3f}'.format(algorithm_time),
+            status))
+
+    return lines
+
+
+def export_pipeline_csv(rows, file, value_name='energy'):
+    """
+    Writes pipeline rows as CSV
+
+    Args:
+        rows (list): run_pipeline rows
+        file (file): text file
+        value_name (str): value column title
+    """
+    writer = csv.writer(file)
+    writer.writerow(['input', value_name, 'dipole', 'eval_count', 'driver_time',
+                     'algorithm_time', 'status'])
+    for row in rows:
+        writer.writerow(['' if x is None else x for x in _pipeline_columns(row)])
@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Spool directory job queue"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import socket
+import tempfile
+import logging
+import psutil
+from ._memory import format_bytes
+from ._compare import _BackendRun
+
+logger = logging.getLogger(__name__)
+
+# job states, each one a spool subdirectory
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+JOB_STATES = [PENDING, RUNNING, DONE, FAILED]
+
+_INPUTS = 'inputs'
+_MAX_PRIORITY = 9999
+# seconds between job process polls
+_POLL_INTERVAL = 0.5
+# seconds a claim lasts without its worker renewing it
+CLAIM_LEASE = 300.0
+# seconds between claim renewals
+_RENEW_INTERVAL = 30.0
+
+
+def _job_key(job):
+    # pending jobs sort by descending priority then submission time
+    return '{:04d}-{:016d}-{}'.format(_MAX_PRIORITY - job['priority'],
+                                      int(job['submitted'] * 1e6), job['id'])
+
+
+def _write_job(filepath, job):
+    f_d, temp_path = tempfile.mkstemp(prefix='.', suffix='.tmp',
+                                      dir=os.path.dirname(filepath))
+    with os.fdopen(f_d, 'w') as file:
+        json.dump(job, file, indent=2)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, filepath)
+
+
+def _read_job(filepath):
+    with open(filepath) as file:
+        return json.load(file)
+
+
+def _job_files(spool, state):
+    directory = os.path.join(spool, state)
+    if not os.path.isdir(directory):
+        return []
+
+    return sorted([x for x in os.listdir(directory)
+                   if x.endswith('.json') and not x.startswith('.')])
+
+
+def init_spool(spool):
+    """
+    Creates the spool subdirectories
+
+    Args:
+        spool (str): spool directory
+    """
+    for name in JOB_STATES + [_INPUTS]:
+        os.makedirs(os.path.join(spool, name), exist_ok=True)
+
+
+def submit_job(spool, input_file, priority=0, retries=0,
+               memory_limit=None, time_limit=None, options=None):
+    """
+    Copies an input file in the spool directory and queues it
+
+    Args:
+        spool (str): spool directory
+        input_file (str): input file
+        priority (int): jobs with higher priority run first, 0 to 9999
+        retries (int): times a failed job is queued again
+        memory_limit (int): bytes the job may use before it is killed or None
+        time_limit (float): seconds the job may run before it is killed or None
+        options (list): extra command line arguments
+    Returns:
+        dict: job
+    Raises:
+        SystemExit: invalid priority or retries
+    """
+    if not 0 <= priority <= _MAX_PRIORITY:
+        raise SystemExit('Job priority must be between 0 and {}.'.format(_MAX_PRIORITY))
+    if retries < 0:
+        raise SystemExit('Job retries must be non-negative.')
+
+    init_spool(spool)
+    job_id = uuid.uuid4().hex[:12]
+    _, ext = os.path.splitext(input_file)
+    input_name = job_id + ext
+    shutil.copyfile(input_file, os.path.join(spool, _INPUTS, input_name))
+    job = {
+        'id': job_id,
+        'name': os.path.basename(input_file),
+        'input': input_name,
+        'priority': priority,
+        'retries': retries,
+        'attempts': 0,
+        'memory_limit': memory_limit,
+        'time_limit': time_limit,
+        'options': list(options or []),
+        'submitted': time.time(),
+        'worker': None,
+        'runtime': None,
+        'peak_memory': None,
+        'error': None,
+    }
+    job['key'] = _job_key(job)
+    _write_job(os.path.join(spool, PENDING, job['key'] + '.json'), job)
+    return job
+
+
+def _worker_ended(worker):
+    # workers are named host:pid, only the processes of this host can be checked
+    host, _, pid = str(worker).rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+
+    return not psutil.pid_exists(int(pid))
+
+
+def recover_stale_jobs(spool, lease=CLAIM_LEASE):
+    """
+    Ends the claims of running jobs whose worker stopped renewing them or
+    ended on this host, the lost run counts as a failed attempt: the job is
+    queued again if it has retries left
+
+    Args:
+        spool (str): spool directory
+        lease (float): seconds a claim lasts without being renewed
+    Returns:
+        list: recovered jobs
+    """
+    recovered = []
+    for name in _job_files(spool, RUNNING):
+        running_path = os.path.join(spool, RUNNING, name)
+        try:
+            age = time.time() - os.path.getmtime(running_path)
+            job = _read_job(running_path)
+        except (OSError, ValueError):
+            # finished or being written by its worker
+            continue
+
+        if age <= lease and not _worker_ended(job['worker']):
+            continue
+
+        # takes the job file first, only one worker recovers it
+        job_path = os.path.join(spool, RUNNING, '.{}.{}'.format(name, uuid.uuid4().hex[:8]))
+        try:
+            os.rename(running_path, job_path)
+        except OSError:
+            continue
+
+        job = _read_job(job_path)
+        job['error'] = "Worker '{}' lost.".format(job['worker'])
+        job['worker'] = None
+        state = PENDING if job['attempts'] <= job['retries'] else FAILED
+        logger.info("Job '%s' claim ended, %s: %s", job['id'], state, job['error'])
+        _finish_job(spool, job, state, job_path)
+        job['state'] = state
+        recovered.append(job)
+
+    return recovered
+
+
+def claim_job(spool, worker, lease=CLAIM_LEASE):
+    """
+    Claims the next pending job by renaming it to the running directory,
+    only one of the workers renaming the same job succeeds. Stale claims are
+    recovered first.
+
+    Args:
+        spool (str): spool directory
+        worker (str): worker name recorded in the job
+        lease (float): seconds a claim lasts without being renewed
+    Returns:
+        dict: claimed job or None if no job is pending
+    """
+    recover_stale_jobs(spool, lease)
+    for name in _job_files(spool, PENDING):
+        pending_path = os.path.join(spool, PENDING, name)
+        running_path = os.path.join(spool, RUNNING, name)
+        try:
+            # the claim starts fresh, renaming keeps the submission time
+            os.utime(pending_path)
+            os.rename(pending_path, running_path)
+        except OSError:
+            # claimed by another worker
+            continue
+
+        job = _read_job(running_path)
+        job['worker'] = worker
+        job['attempts'] += 1
+        _write_job(running_path, job)
+        return job
+
+    return None
+
+
+def _finish_job(spool, job, state, job_path=None):
+    running = os.path.join(spool, RUNNING, job['key'])
+    target = os.path.join(spool, state, job['key'])
+    if job_path is None:
+        # takes the job file first, a recovered claim is not finished twice
+        job_path = os.path.join(spool, RUNNING,
+                                '.{}.{}'.format(job['key'], uuid.uuid4().hex[:8]))
+        try:
+            os.rename(running + '.json', job_path)
+        except OSError:
+            logger.warning("Job '%s' claim lost, its result is dropped.", job['id'])
+            return False
+
+    for ext in ['.out', '.log']:
+        if not os.path.exists(running + ext):
+            continue
+        if state == PENDING:
+            # the next attempt writes its own output
+            os.remove(running + ext)
+        else:
+            os.replace(running + ext, target + ext)
+
+    # the job file moves last so a finished job always has its output next to it
+    _write_job(job_path, job)
+    os.replace(job_path, target + '.json')
+    return True
+
+
+def run_job(spool, job, command):
+    """
+    Runs a claimed job, its output and log are written next to the job file
+    in the done or failed directory, failed jobs with retries left are queued again.
+    The claim is renewed while the job runs, a job whose claim was recovered by
+    another worker is killed.
+
+    Args:
+        spool (str): spool directory
+        job (dict): claimed job
+        command (list): command line running an input file
+    Returns:
+        str: state the job moved to or None if its claim was lost
+    """
+    prefix = os.path.join(spool, RUNNING, job['key'])
+    run = _BackendRun(job['name'], os.path.join(spool, _INPUTS, job['input']),
+                      prefix + '.out', prefix + '.log')
+    run.launch(list(command) + job['options'] + ['-jo', run.output_file], None)
+    error = None
+    renewed = time.monotonic()
+    try:
+        while not run.poll():
+            time.sleep(_POLL_INTERVAL)
+            if time.monotonic() - renewed > _RENEW_INTERVAL:
+                renewed = time.monotonic()
+                try:
+                    os.utime(prefix + '.json')
+                except FileNotFoundError:
+                    logger.warning("Job '%s' claim lost, run killed.", job['id'])
+                    run.kill()
+                    run.popen.wait()
+                    return None
+            elapsed = time.monotonic() - run.start
+            if job['time_limit'] is not None and elapsed > job['time_limit']:
+                error = 'Time limit of {} s exceeded.'.format(job['time_limit'])
+            elif job['memory_limit'] is not None and run.peak_memory > job['memory_limit']:
+                error = 'Memory limit of {} exceeded.'.format(format_bytes(job['memory_limit']))
+            if error is not None:
+                run.kill()
+                run.popen.wait()
+                run.poll()
+                break
+    except BaseException:
+        # worker interrupted, the job goes back to the queue
+        run.kill()
+        job['attempts'] -= 1
+        job['worker'] = None
+        _finish_job(spool, job, PENDING)
+        raise
+
+    if error is None and run.popen.returncode != 0:
+        error = run.last_output_line() or 'Exit code {}.'.format(run.popen.returncode)
+
+    job['runtime'] = run.runtime
+    job['peak_memory'] = run.peak_memory
+    job['error'] = error
+    if error is None:
+        state = DONE
+    elif job['attempts'] <= job['retries']:
+        logger.info("Job '%s' failed, queued again: %s", job['id'], error)
+        job['worker'] = None
+        state = PENDING
+    else:
+        state = FAILED
+
+    if not _finish_job(spool, job, state):
+        return None
+
+    return state
+
+
+def run_worker(spool, command, once=False, poll=5.0, max_jobs=None, lease=CLAIM_LEASE):
+    """
+    Claims and runs jobs until stopped
+
+    Args:
+        spool (str): spool directory
+        command (list): command line running an input file
+        once (bool): return as soon as no job is pending
+        poll (float): seconds between checks for pending jobs
+        max_jobs (int): return after running this many jobs or None
+        lease (float): seconds a claim lasts without being renewed, longer than
+            the claim renewal interval
+    Returns:
+        int: number of jobs run
+    Raises:
+        SystemExit: lease not longer than the claim renewal interval
+    """
+    # a shorter lease queues again the jobs other workers are still running
+    if lease <= _RENEW_INTERVAL:
+        raise SystemExit('Claim lease must be longer than the {:g} seconds claim renewal '
+                         'interval.'.format(_RENEW_INTERVAL))
+
+    init_spool(spool)
+    worker = '{}:{}'.format(socket.gethostname(), os.getpid())
+    count = 0
+    while max_jobs is None or count < max_jobs:
+        job = claim_job(spool, worker, lease)
+        if job is None:
+            if once:
+                break
+            time.sleep(poll)
+            continue
+
+        print("Running job '{}' ({}), attempt {}.".format(
+            job['id'], job['name'], job['attempts']), flush=True)
+        state = run_job(spool, job, command)
+        print("Job '{}' {}.".format(job['id'], state or 'claim lost'), flush=True)
+        count += 1
+
+    return count
+
+
+def queue_status(spool):
+    """
+    Lists the spool jobs
+
+    Args:
+        spool (str): spool directory
+    Returns:
+        list: jobs with their state, pending ones in running order
+    """
+    jobs = []
+    for state in JOB_STATES:
+        for name in _job_files(spool, state):
+            try:
+                job = _read_job(os.path.join(spool, state, name))
+            except (OSError, ValueError):
+                # moved or being written by a worker
+                continue
+            job['state'] = state
+            jobs.append(job)
+
+    return jobs
+
+
+def format_queue_status(jobs):
+    """
+    Formats spool jobs as a table
+
+    Args:
+        jobs (list): queue_status result
+    Returns:
+        list: table lines
+    """
+    counts = ['{} {}'.format(len([x for x in jobs if x['state'] == state]), state)
+              for state in JOB_STATES]
+    line_format = '{:<14}{:<9}{:>9}{:>10}{:>12}{:>14}  {}'
+    lines = [', '.join(counts),
+             line_format.format('job', 'state', 'priority', 'attempts', 'runtime (s)',
+                                'peak memory', 'input')]
+    for job in jobs:
+        runtime = '' if job['runtime'] is None else '{:.3f}'.format(job['runtime'])
+        peak_memory = '' if job['peak_memory'] is None else format_bytes(job['peak_memory'])
+        name = job['name']
+        if job['state'] == RUNNING:
+            name += ' on ' + str(job['worker'])
+        elif job['error']:
+            name += ': ' + job['error']
+        lines.append(line_format.format(job['id'], job['state'], job['priority'],
+                                        job['attempts'], runtime, peak_memory, name))
+
+    return lines
@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""SQLite results store"""
+
+import os
+import re
+import csv
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import pkg_resources
+from ._benchmark import result_value, result_json_default
+from ._operator_encoding import is_encoded_operator
+
+logger = logging.getLogger(__name__)
+
+# packages whose versions are recorded with each run
+_PACKAGES = ['qiskit-terra', 'qiskit-aer', 'qiskit-aqua', 'qiskit-chemistry',
+             'qiskit-aqua-interfaces']
+
+# run columns, in listing order
+RUN_COLUMNS = ['id', 'created', 'input_file', 'algorithm', 'backend', 'value',
+               'runtime', 'eval_count', 'stop_reason']
+# run columns compared as numbers
+_NUMERIC_COLUMNS = ['id', 'value', 'runtime', 'eval_count']
+# run columns indexed for filters and sorting
+_INDEXED_COLUMNS = ['created', 'input_file', 'algorithm', 'backend', 'value']
+
+_SCHEMA = '''CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created TEXT,
+    input_file TEXT,
+    algorithm TEXT,
+    backend TEXT,
+    value REAL,
+    runtime REAL,
+    eval_count INTEGER,
+    stop_reason TEXT,
+    input TEXT,
+    result TEXT,
+    versions TEXT)'''
+_INDEX = 'CREATE INDEX IF NOT EXISTS runs_{0} ON runs ({0})'
+
+_FILTER = re.compile(r'^\s*([\w.]+)\s*(<=|>=|!=|=|<|>)\s*(.*?)\s*$')
+_OPERATORS = {
+    '=': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+def package_versions():
+    """ returns the installed versions of the Qiskit packages """
+    versions = {}
+    for name in _PACKAGES:
+        try:
+            versions[name] = pkg_resources.get_distribution(name).version
+        except pkg_resources.DistributionNotFound:
+            pass
+
+    return versions
+
+
+def flatten(value, prefix=''):
+    """
+    Flattens nested dictionaries into section.property keys
+
+    Args:
+        value (dict): nested dictionary
+        prefix (str): key prefix
+    Returns:
+        dict: flat dictionary
+    """
+    flat = {}
+    for name, item in value.items():
+        key = prefix + str(name)
+        if isinstance(item, dict):
+            flat.update(flatten(item, key + '.'))
+        else:
+            flat[key] = item
+
+    return flat
+
+
+def _is_operator(value):
+    return is_encoded_operator(value) or (isinstance(value, dict) and 'paulis' in value)
+
+
+def _operator_summary(value):
+    # the size and a hash of an operator, its Pauli terms are not stored
+    text = json.dumps(value, sort_keys=True, default=result_json_default)
+    summary = {'sha256': hashlib.sha256(text.encode('utf-8')).hexdigest()}
+    if is_encoded_operator(value):
+        summary['num_qubits'] = value.get('num_qubits')
+        summary['num_paulis'] = value.get('num_paulis')
+    else:
+        paulis = value.get('paulis') or []
+        summary['num_qubits'] = len(paulis[0]['label']) if paulis else 0
+        summary['num_paulis'] = len(paulis)
+
+    return summary
+
+
+def summarize_operators(sections):
+    """
+    Replaces the qubit operators of the input section by their number of qubits,
+    number of Pauli terms and hash, so recorded inputs stay small
+
+    Args:
+        sections (dict): input sections
+    Returns:
+        dict: sections, the input section copied if it holds operators
+    """
+    section = sections.get('input')
+    if not isinstance(section, dict):
+        return sections
+
+    summarized = {}
+    for name, value in section.items():
+        if _is_operator(value):
+            summarized[name] = _operator_summary(value)
+        elif isinstance(value, list) and value and all(_is_operator(x) for x in value):
+            summarized[name] = [_operator_summary(x) for x in value]
+    if not summarized:
+        return sections
+
+    sections = dict(sections)
+    sections['input'] = dict(section, **summarized)
+    return sections
+
+
+def _run_value(run, key):
+    # run column or input section.property, as a number or a string
+    value = run.get(key, run['flat_input'].get(key))
+    if value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)):
+        return value
+
+    return json.dumps(value) if isinstance(value, (bool, list)) else str(value)
+
+
+def _parse_filter(text):
+    match = _FILTER.match(text)
+    if match is None:
+        raise SystemExit("Invalid filter '{}', expected for example "
+                         "backend=qasm_simulator or value<-1.8.".format(text))
+
+    return match.groups()
+
+
+def _filter_sql(key, operator, expected):
+    # SQL condition of a run column filter, matching the predicate of parse_filter
+    if key in _NUMERIC_COLUMNS:
+        try:
+            expected = float(expected)
+        except ValueError:
+            return '0', ()
+    if operator == '!=':
+        return '({0} IS NULL OR {0} != ?)'.format(key), (expected,)
+
+    return '{} {} ?'.format(key, operator), (expected,)
+
+
+def parse_filter(text):
+    """
+    Parses a run filter like 'backend=qasm_simulator' or 'optimizer.maxiter>100'
+
+    Args:
+        text (str): column or input section.property, operator and value
+    Returns:
+        callable: predicate on a run dictionary
+    Raises:
+        SystemExit: invalid filter
+    """
+    key, operator, expected = _parse_filter(text)
+
+    def predicate(run):
+        value = _run_value(run, key)
+        if value is None:
+            return operator == '!='
+        if isinstance(value, str):
+            return _OPERATORS[operator](value, expected)
+        try:
+            return _OPERATORS[operator](value, float(expected))
+        except ValueError:
+            return False
+
+    return predicate
+
+
+class ResultsStore:
+    """
+    SQLite database of run results, with their input after defaults merge,
+    timings and package versions.
+    """
+
+    PATH = os.path.join(os.path.expanduser('~'), '.qiskit_aqua_ui_results.sqlite')
+
+    def __init__(self, path=PATH) -> None:
+        """
+        Args:
+            path (str): database file, created if missing
+        """
+        self._path = path
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute(_SCHEMA)
+        for column in _INDEXED_COLUMNS:
+            self._connection.execute(_INDEX.format(column))
+        self._connection.commit()
+
+    @property
+    def path(self):
+        """ returns the database file """
+        return self._path
+
+    def close(self):
+        """ closes the database """
+        self._connection.close()
+
+    def add_run(self, input_file, sections, result, runtime=None):
+        """
+        Records a run
+
+        Args:
+            input_file (str): run input file
+            sections (dict): input sections after defaults merge, operators are
+                recorded by their size and hash
+            result (dict): algorithm result
+            runtime (float): run seconds
+        Returns:
+            int: run id
+        """
+        sections = summarize_operators(sections or {})
+        algorithm = sections.get('algorithm', {}).get('name')
+        backend = sections.get('backend', {}).get('name')
+        cursor = self._connection.execute(
+            'INSERT INTO runs (created, input_file, algorithm, backend, value, runtime, '
+            'eval_count, stop_reason, input, result, versions) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (time.strftime('%Y-%m-%d %H:%M:%S'),
+             os.path.abspath(input_file) if input_file else None,
+             algorithm,
+             backend,
+             result_value(result),
+             runtime,
+             result.get('eval_count'),
+             result.get('stop_reason'),
+             json.dumps(sections, sort_keys=True, default=result_json_default),
+             json.dumps(result, sort_keys=True, default=result_json_default),
+             json.dumps(package_versions(), sort_keys=True)))
+        self._connection.commit()
+        return cursor.lastrowid
+
+    def get_run(self, run_id):
+        """
+        Returns a run
+
+        Args:
+            run_id (int): run id
+        Returns:
+            dict: run columns with decoded input, result and versions
+        Raises:
+            SystemExit: run not found
+        """
+        runs = self._runs('WHERE id = ?', (run_id,))
+        if not runs:
+            raise SystemExit("Run '{}' not found in '{}'.".format(run_id, self._path))
+
+        return runs[0]
+
+    def _runs(self, where='', params=(), order='id', limit=None):
+        query = 'SELECT {}, input, result, versions FROM runs {} ORDER BY {}'.format(
+            ', '.join(RUN_COLUMNS), where, order)
+        if limit is not None:
+            query += ' LIMIT ?'
+            params = tuple(params) + (limit,)
+        runs = []
+        for row in self._connection.execute(query, params):
+            run = dict(zip(RUN_COLUMNS, row))
+            for index, name in enumerate(['input', 'result', 'versions']):
+                run[name] = json.loads(row[len(RUN_COLUMNS) + index] or '{}')
+            run['flat_input'] = flatten(run['input'])
+            runs.append(run)
+
+        return runs
+
+    def list_runs(self, filters=None, sort=None, descending=False, limit=None):
+        """
+        Lists runs, filters and sorting on run columns run in the database
+
+        Args:
+            filters (list): filter expressions, see parse_filter
+            sort (str): column or input section.property to sort by or None for the run id
+            descending (bool): sort descending
+            limit (int): maximum number of runs or None
+        Returns:
+            list: runs
+        """
+        conditions = []
+        params = ()
+        predicates = []
+        for text in filters or []:
+            key, operator, expected = _parse_filter(text)
+            if key in RUN_COLUMNS:
+                condition, values = _filter_sql(key, operator, expected)
+                conditions.append(condition)
+                params += values
+            else:
+                predicates.append(parse_filter(text))
+
+        where = 'WHERE ' + ' AND '.join(conditions) if conditions else ''
+        if not predicates and (sort is None or sort in RUN_COLUMNS):
+            order = 'id'
+            if sort is not None:
+                # runs without the value sort last
+                order = '{0} IS NULL, {0}{1}, id'.format(sort, ' DESC' if descending else '')
+            return self._runs(where, params, order, limit)
+
+        # input section.property filters or sorting
+        runs = [x for x in self._runs(where, params)
+                if all(predicate(x) for predicate in predicates)]
+        if sort is not None:
+            # runs without the value sort last
+            missing = [x for x in runs if _run_value(x, sort) is None]
+            runs = [x for x in runs if _run_value(x, sort) is not None]
+            runs.sort(key=lambda x: (isinstance(_run_value(x, sort), str), _run_value(x, sort)),
+                      reverse=descending)
+            runs += missing
+
+        return runs[:limit] if limit is not None else runs
+
+    def diff(self, first_id, second_id):
+        """
+        Compares the input, result and versions of two runs
+
+        Args:
+            first_id (int): run id
+            second_id (int): run id
+        Returns:
+            list: (key, first value, second value) tuples of the differences
+        """
+        first = self.get_run(first_id)
+        second = self.get_run(second_id)
+        rows = []
+        for name in ['input', 'result', 'versions']:
+            first_flat = flatten(first[name], name + '.')
+            second_flat = flatten(second[name], name + '.')
+            for key in sorted(set(first_flat) | set(second_flat)):
+                if first_flat.get(key) != second_flat.get(key):
+                    rows.append((key, first_flat.get(key), second_flat.get(key)))
+
+        return rows
+
+    @staticmethod
+    def export_csv(runs, file):
+        """
+        Writes runs as CSV, one column per run column and input section.property
+
+        Args:
+            runs (list): runs
+            file (file): text file
+        """
+        input_keys = sorted(set().union(*[x['flat_input'].keys() for x in runs]))
+        writer = csv.writer(file)
+        writer.writerow(RUN_COLUMNS + input_keys)
+        for run in runs:
+            writer.writerow([run[x] for x in RUN_COLUMNS] +
+                            [json.dumps(run['flat_input'][x])
+                             if isinstance(run['flat_input'].get(x), (list, bool))
+                             else run['flat_input'].get(x) for x in input_keys])
+
+
+def record_run(path, input_file, sections, result, runtime=None):
+    """
+    Records a run in a results database, failures are logged, not raised
+
+    Args:
+        path (str): database file
+        input_file (str): run input file
+        sections (dict): input sections after defaults merge, operators are
+            recorded by their size and hash
+        result (dict): algorithm result
+        runtime (float): run seconds
+    Returns:
+        int: run id or None if not recorded
+    """
+    try:
+        store = ResultsStore(path)
+        try:
+            run_id = store.add_run(input_file, sections, result, runtime)
+        finally:
+            store.close()
+    except sqlite3.Error as ex:
+        logger.warning("Run not recorded in '%s': %s", path, str(ex))
+        return None
+
+    logger.info("Run recorded in '%s' as %s.", path, run_id)
+    return run_id
+
+
+def format_runs(runs):
+    """
+    Formats runs as a table
+
+    Args:
+        runs (list): runs
+    Returns:
+        list: table lines
+    """
+    line_format = '{:>6}  {:<20}{:<16}{:<24}{:>20}{:>12}{:>8}  {}'
+    lines = [line_format.format('id', 'created', 'algorithm', 'backend', 'value',
+                                'runtime (s)', 'evals', 'input')]
+    for run in runs:
+        value = '' if run['value'] is None else '{:.10g}'.format(run['value'])
+        runtime = '' if run['runtime'] is None else '{:.3f}'.format(run['runtime'])
+        lines.append(line_format.format(run['id'], run['created'], run['algorithm'] or '',
+                                        run['backend'] or '', value, runtime,
+                                        '' if run['eval_count'] is None else run['eval_count'],
+                                        os.path.basename(run['input_file'] or '')))
+
+    return lines
+
+
+def format_diff(rows):
+    """
+    Formats a runs diff as lines
+
+    Args:
+        rows (list): ResultsStore.diff result
+    Returns:
+        list: lines
+    """
+    if not rows:
+        return ['Runs are identical.']
+
+    return ['{}: {} -> {}'.format(key, first, second) for key, first, second in rows]
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Variational algorithm run monitor"""
+
+import sys
+import signal
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RunInterrupted(Exception):
+    """Raised from the algorithm callback to stop the optimizer."""
+    pass
+
+
+class RunMonitor:
+    """
+    Monitors a variational algorithm through its evaluation callback,
+    keeping the best parameters found so far and stopping the optimizer
+    cleanly when requested.
+    """
+
+    def __init__(self) -> None:
+        self._attached = False
+        self._stop_reason = None
+        self._eval_offset = 0
+        self._eval_count = 0
+        self._params = None
+        self._best_value = None
+        self._best_params = None
+        self._checks = []
+
+    @property
+    def attached(self):
+        """ returns True if attached to an algorithm callback """
+        return self._attached
+
+    @property
+    def stop_reason(self):
+        """ returns the reason the run was stopped or None """
+        return self._stop_reason
+
+    @property
+    def eval_count(self):
+        """ returns number of evaluations so far """
+        return self._eval_count
+
+    @property
+    def params(self):
+        """ returns parameters of the last evaluation """
+        return self._params
+
+    @property
+    def best_value(self):
+        """ returns best objective value so far """
+        return self._best_value
+
+    @property
+    def best_params(self):
+        """ returns parameters of the best objective value so far """
+        return self._best_params
+
+    def attach(self, qiskit_aqua):
+        """
+        Attaches the monitor to the algorithm evaluation callback
+
+        Args:
+            qiskit_aqua (QiskitAqua): Qiskit Aqua object already built
+        Returns:
+            bool: True if the algorithm supports a callback
+        """
+        algorithm = qiskit_aqua.quantum_algorithm
+        if not hasattr(algorithm, '_callback'):
+            if self._checks:
+                logger.warning("Algorithm '%s' has no evaluation callback, evaluation budget "
+                               "and convergence checks are ignored.",
+                               algorithm.__class__.__name__)
+            else:
+                logger.debug("Algorithm '%s' has no evaluation callback.",
+                             algorithm.__class__.__name__)
+            return False
+
+        callback = algorithm._callback
+
+        def _callback(eval_count, parameters, value, *args):
+            if callback is not None:
+                callback(eval_count, parameters, value, *args)
+            self.update(eval_count, parameters, value)
+
+        algorithm._callback = _callback
+        self._attached = True
+        return True
+
+    def add_check(self, check):
+        """
+        Adds a check called after each evaluation
+
+        Args:
+            check (callable): called with this monitor, returns a stop reason or None
+        """
+        self._checks.append(check)
+
+    def restore(self, eval_count, best_value, best_params):
+        """
+        Restores the state of a previous run so that evaluations
+        continue counting from it
+
+        Args:
+            eval_count (int): evaluations already done
+            best_value (float): best objective value already found
+            best_params (list): parameters of the best objective value
+        """
+        self._eval_offset = eval_count
+        self._eval_count = eval_count
+        self._best_value = best_value
+        self._best_params = best_params
+
+    def request_stop(self, reason):
+        """ asks the run to stop after the current evaluation """
+        if self._stop_reason is None:
+            self._stop_reason = reason
+
+    def update(self, eval_count, parameters, value):
+        """
+        Records an evaluation
+
+        Args:
+            eval_count (int): evaluation count
+            parameters (numpy.ndarray): evaluation parameters
+            value (float): objective value
+        Raises:
+            RunInterrupted: a stop was requested
+        """
+        self._eval_count = self._eval_offset + eval_count
+        self._params = [float(x) for x in parameters]
+        value = float(value)
+        if self._best_value is None or value < self._best_value:
+            self._best_value = value
+            self._best_params = self._params
+
+        self.check()
+        if self._stop_reason is not None:
+            raise RunInterrupted(self._stop_reason)
+
+    def check(self):
+        """ checks stop conditions after each evaluation """
+        for check in self._checks:
+            reason = check(self)
+            if reason is not None:
+                self.request_stop(reason)
+
+    def partial_result(self):
+        """ returns the best result seen so far, marked as truncated """
+        logger.info('Run stopped (%s) after %s evaluations.', self._stop_reason, self._eval_count)
+        return {
+            'truncated': True,
+            'stop_reason': self._stop_reason,
+            'eval_count': self._eval_count,
+            'min_val': self._best_value,
+            'energy': self._best_value,
+            'eigvals': [self._best_value],
+            'opt_params': self._best_params,
+        }
+
+    def run(self, qiskit_aqua, json_output=False):
+        """
+        Runs the algorithm returning the best result so far if stopped
+
+        Args:
+            qiskit_aqua (QiskitAqua): Qiskit Aqua object already built
+            json_output (bool): True for json conversion of the result
+        Returns:
+            dict: algorithm result
+        Raises:
+            SystemExit: run stopped before any evaluation
+        """
+        try:
+            return qiskit_aqua.run(json_output)
+        except RunInterrupted:
+            if self._best_value is None:
+                raise SystemExit('Run stopped ({}) before any evaluation.'.format(
+                    self._stop_reason))
+
+            return self.partial_result()
+
+
+def install_stop_handlers(monitor):
+    """
+    Handles stop signals cooperatively: the first one asks the monitored
+    run to stop after the current evaluation, a second one exits.
+
+    Args:
+        monitor (RunMonitor): run monitor
+    """
+    def _handler(signum, frame):
+        # pylint: disable=unused-argument
+        if not monitor.attached or monitor.stop_reason is not None:
+            sys.exit('Run cancelled.')
+
+        print('Stop requested, finishing current evaluation.', flush=True)
+        monitor.request_stop('cancelled')
+
+    signums = [signal.SIGINT, signal.SIGTERM]
+    if hasattr(signal, 'SIGBREAK'):
+        # Windows CTRL_BREAK_EVENT
+        signums.append(signal.SIGBREAK)
+
+    for signum in signums:
+        signal.signal(signum, _handler)
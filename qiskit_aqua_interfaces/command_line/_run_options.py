@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Run options input section, run budget and convergence"""
+
+import os
+import json
+import time
+import tempfile
+import logging
+from collections import deque
+from ._input_format import (INPUT_JSON,
+                            is_compressed,
+                            sniff_input_format,
+                            read_input,
+                            parse_json_input)
+
+logger = logging.getLogger(__name__)
+
+RUN_OPTIONS = 'run_options'
+
+# run options section properties and their types
+RUN_OPTIONS_PROPERTIES = {
+    'time_budget': float,
+    'max_evals': int,
+    'convergence_window': int,
+    'convergence_tol': float,
+}
+
+# default objective improvement below which a run has converged
+CONVERGENCE_TOL = 1e-6
+
+
+def _convert_run_options(properties):
+    run_options = {}
+    for name, value in properties.items():
+        name = name.strip().lower()
+        if name not in RUN_OPTIONS_PROPERTIES:
+            raise SystemExit("Unknown property '{}' in section '{}', valid properties: {}".format(
+                name, RUN_OPTIONS, list(RUN_OPTIONS_PROPERTIES.keys())))
+
+        if value is None or (isinstance(value, str) and value.strip().lower() in ['', 'none']):
+            run_options[name] = None
+            continue
+
+        try:
+            run_options[name] = RUN_OPTIONS_PROPERTIES[name](value)
+        except (TypeError, ValueError):
+            raise SystemExit("Invalid value '{}' for property '{}' in section '{}'.".format(
+                value, name, RUN_OPTIONS))
+
+    return run_options
+
+
+def pop_run_options(sections):
+    """
+    Removes the run options section from a JSON input dictionary
+
+    Args:
+        sections (dict): input sections
+    Returns:
+        dict: run options
+    Raises:
+        SystemExit: invalid run options
+    """
+    for name in list(sections.keys()):
+        if name.strip().lower() == RUN_OPTIONS:
+            return _convert_run_options(sections.pop(name))
+
+    return {}
+
+
+def _write_temp_input(input_file, suffix, write):
+    directory = os.path.dirname(os.path.abspath(input_file))
+    try:
+        f_d, temp_input = tempfile.mkstemp(suffix=suffix, dir=directory)
+    except OSError:
+        logger.warning("Cannot write in '%s', relative paths in '%s' may not resolve.",
+                       directory, input_file)
+        f_d, temp_input = tempfile.mkstemp(suffix=suffix)
+
+    with os.fdopen(f_d, 'w') as file:
+        write(file)
+
+    return temp_input
+
+
+def strip_run_options(input_file, contents=None):
+    """
+    Removes the run options section from a JSON or chemistry input file.
+    When found, or when the input is compressed, the remaining input is written
+    to a temporary file in the same directory so relative paths still resolve.
+
+    Args:
+        input_file (str): JSON or chemistry input file, optionally compressed
+        contents (str): input file contents if already read, or None to read them
+    Returns:
+        tuple: run options and temporary input file path or None if not needed
+    Raises:
+        SystemExit: invalid JSON input or run options
+    """
+    if contents is None:
+        input_format, contents = read_input(input_file)
+    else:
+        input_format = sniff_input_format(input_file, contents)
+    compressed = is_compressed(input_file)
+
+    if input_format == INPUT_JSON:
+        params = parse_json_input(input_file, contents)
+        num_sections = len(params)
+        run_options = pop_run_options(params)
+        if len(params) == num_sections and not compressed:
+            return {}, None
+
+        return run_options, _write_temp_input(input_file, '.json',
+                                              lambda file: json.dump(params, file, indent=4))
+
+    properties = None
+    lines = []
+    in_section = False
+    for line in contents.splitlines(keepends=True):
+        strip_line = line.strip()
+        if in_section:
+            if strip_line.lower().startswith('&end'):
+                in_section = False
+            elif strip_line and not strip_line.startswith('#') and '=' in strip_line:
+                key, value = strip_line.split('#', 1)[0].split('=', 1)
+                properties[key] = value.strip()
+            continue
+
+        if strip_line.lower() == '&' + RUN_OPTIONS:
+            in_section = True
+            properties = {}
+            continue
+
+        lines.append(line)
+
+    if properties is None and not compressed:
+        return {}, None
+
+    run_options = _convert_run_options(properties or {})
+    return run_options, _write_temp_input(input_file, '.txt',
+                                          lambda file: file.writelines(lines))
+
+
+def merge_run_options(run_options, args):
+    """
+    Overrides input run options with the ones given on the command line
+
+    Args:
+        run_options (dict): input run options
+        args (argparse.Namespace): command line arguments
+    Returns:
+        dict: run options
+    """
+    run_options = dict(run_options)
+    for name in RUN_OPTIONS_PROPERTIES:
+        value = getattr(args, name, None)
+        if value is not None:
+            run_options[name] = value
+
+    return run_options
+
+
+def run_options_to_args(run_options):
+    """
+    Converts run options to command line arguments
+
+    Args:
+        run_options (dict): run options
+    Returns:
+        list: command line arguments
+    """
+    args = []
+    for name, value in run_options.items():
+        if value is not None:
+            args.extend(['--{}'.format(name.replace('_', '-')), str(value)])
+
+    return args
+
+
+class RunBudget:
+    """
+    Run monitor check stopping the run once its wall clock time
+    or evaluation count budget is exhausted.
+    """
+
+    def __init__(self, time_budget=None, max_evals=None) -> None:
+        """
+        Args:
+            time_budget (float): seconds allowed since creation or None
+            max_evals (int): evaluations allowed or None
+        """
+        self._time_budget = time_budget
+        self._max_evals = max_evals
+        self._start = time.monotonic()
+
+    def __call__(self, monitor):
+        """ run monitor check returning the exhausted budget or None """
+        if self._max_evals is not None and monitor.eval_count >= self._max_evals:
+            return 'max_evals'
+
+        if self._time_budget is not None and \
+                time.monotonic() - self._start >= self._time_budget:
+            return 'time_budget'
+
+        return None
+
+
+class ConvergenceCheck:
+    """
+    Run monitor check stopping the run once the best objective value
+    improved less than a tolerance over a window of evaluations.
+    """
+
+    def __init__(self, window, tol=CONVERGENCE_TOL) -> None:
+        """
+        Args:
+            window (int): number of evaluations
+            tol (float): minimum improvement over the window
+        """
+        self._tol = tol
+        self._best_values = deque(maxlen=window + 1)
+
+    def __call__(self, monitor):
+        """ run monitor check returning 'converged' or None """
+        self._best_values.append(monitor.best_value)
+        if len(self._best_values) < self._best_values.maxlen:
+            return None
+
+        if self._best_values[0] - self._best_values[-1] < self._tol:
+            return 'converged'
+
+        return None
+
+
+def add_run_checks(monitor, run_options):
+    """
+    Adds the budget and convergence checks requested by run options
+
+    Args:
+        monitor (RunMonitor): run monitor
+        run_options (dict): run options
+    Raises:
+        SystemExit: invalid convergence window
+    """
+    if run_options.get('time_budget') is not None or run_options.get('max_evals') is not None:
+        monitor.add_check(RunBudget(run_options.get('time_budget'),
+                                    run_options.get('max_evals')))
+    window = run_options.get('convergence_window')
+    if window is None:
+        return
+
+    if window < 1:
+        raise SystemExit('Convergence window must be at least 1 evaluation.')
+
+    tol = run_options.get('convergence_tol')
+    monitor.add_check(ConvergenceCheck(window, CONVERGENCE_TOL if tol is None else tol))
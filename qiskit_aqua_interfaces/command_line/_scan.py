@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Potential energy surface scan"""
+
+import os
+import string
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ._pipeline import cache_driver_outputs
+
+logger = logging.getLogger(__name__)
+
+
+def scan_points(start, stop, points):
+    """
+    Returns evenly spaced scan coordinates, both ends included
+
+    Args:
+        start (float): first coordinate
+        stop (float): last coordinate
+        points (int): number of coordinates
+    Returns:
+        list: coordinates
+    Raises:
+        SystemExit: less than one point
+    """
+    if points < 1:
+        raise SystemExit('A scan needs at least 1 point.')
+
+    return [float(x) for x in np.linspace(start, stop, points)]
+
+
+def write_scan_inputs(template_file, variable, values, directory):
+    """
+    Writes one input per scan coordinate, replacing $variable or ${variable}
+    in the template
+
+    Args:
+        template_file (str): chemistry input template
+        variable (str): geometry variable name
+        values (list): coordinates
+        directory (str): directory to write the inputs in
+    Returns:
+        list: input files
+    Raises:
+        SystemExit: variable not found in the template
+    """
+    with open(template_file, 'rt', encoding="utf8", errors='ignore') as file:
+        template = string.Template(file.read())
+
+    if template.safe_substitute({variable: ''}) == template.template:
+        raise SystemExit("Scan variable '${}' not found in '{}'.".format(variable, template_file))
+
+    _, ext = os.path.splitext(template_file)
+    input_files = []
+    for index, value in enumerate(values):
+        input_file = os.path.join(directory, 'point_{:04d}{}'.format(index, ext or '.txt'))
+        with open(input_file, 'w') as file:
+            file.write(template.safe_substitute({variable: '{:.8g}'.format(value)}))
+        input_files.append(input_file)
+
+    return input_files
+
+
+def run_scan_drivers(input_files, cache_directory, parallel, cpus,
+                     driver_cache=True, operator_cache=True):
+    """
+    Runs the drivers of scan inputs in parallel processes, caching their
+    outputs and qubit operators for the algorithm runs
+
+    Args:
+        input_files (list): chemistry input files
+        cache_directory (str): driver and operator cache directory
+        parallel (int): number of processes
+        cpus (list): CPUs of each process, only their number is used
+        driver_cache (bool): fill the driver output cache
+        operator_cache (bool): fill the qubit operator cache
+    Returns:
+        list: error message of each input or None
+    """
+    with ProcessPoolExecutor(max_workers=parallel) as executor:
+        futures = [executor.submit(cache_driver_outputs, x, cache_directory, cpus,
+                                   driver_cache, operator_cache)
+                   for x in input_files]
+        errors = []
+        for input_file, future in zip(input_files, futures):
+            try:
+                future.result()
+                errors.append(None)
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning("Driver of '%s' failed: %s", input_file, str(ex))
+                errors.append(str(ex))
+
+    return errors
+
+
+def format_scan(variable, rows):
+    """
+    Formats a scan as a table
+
+    Args:
+        variable (str): geometry variable name
+        rows (list): dictionaries with coordinate, energy, evaluations and status
+    Returns:
+        list: table lines
+    """
+    line_format = '{:>14}{:>24}{:>10}  {}'
+    lines = [line_format.format(variable, 'energy', 'evals', 'status')]
+    for row in rows:
+        energy = '' if row['energy'] is None else '{:.12f}'.format(row['energy'])
+        lines.append(line_format.format('{:.8g}'.format(row['value']), energy,
+                                        '' if row['eval_count'] is None else row['eval_count'],
+                                        row['status']))
+
+    return lines
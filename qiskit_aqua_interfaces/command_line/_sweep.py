@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Chemistry operator settings sweep"""
+
+import os
+import ast
+import json
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from ._memory import estimate_simulator_memory, format_bytes
+from ._input_format import read_input
+from ._run_options import strip_run_options
+from ._operator_cache import OperatorCache
+from ._pipeline import cache_driver_outputs
+
+logger = logging.getLogger(__name__)
+
+_OPERATOR = 'operator'
+
+# chemical accuracy in Hartree
+CHEMICAL_ACCURACY = 1.6e-3
+
+
+def _parse_value(text):
+    for parse in [json.loads, ast.literal_eval]:
+        try:
+            return parse(text)
+        except (ValueError, SyntaxError):
+            pass
+
+    return text
+
+
+def sweep_variants(vary):
+    """
+    Builds the operator settings of each sweep variant, every combination of the values
+
+    Args:
+        vary (list): lists of an operator property name followed by its values, values
+            as JSON or Python literals, for example ['orbital_reduction', '[]', '[-2,-1]']
+    Returns:
+        list: operator properties dictionaries
+    Raises:
+        SystemExit: property without values
+    """
+    names = []
+    values = []
+    for entry in vary:
+        if len(entry) < 2:
+            raise SystemExit("Sweep property '{}' has no values.".format(entry[0]))
+        names.append(entry[0])
+        values.append([_parse_value(x) for x in entry[1:]])
+
+    return [dict(zip(names, x)) for x in itertools.product(*values)]
+
+
+def _set_operator_properties(contents, properties):
+    lines = []
+    remaining = {k.lower(): (k, v) for k, v in properties.items()}
+    new_lines = ['   {}={}'.format(k, v) for k, v in properties.items()]
+    in_section = False
+    found = False
+    for line in contents.splitlines():
+        strip_line = line.strip()
+        if in_section:
+            if strip_line.lower().startswith('&end'):
+                lines += ['   {}={}'.format(k, v) for k, v in remaining.values()]
+                in_section = False
+            elif '=' in strip_line and not strip_line.startswith('#'):
+                key = strip_line.split('=', 1)[0].strip().lower()
+                if key in remaining:
+                    lines.append('   {}={}'.format(*remaining.pop(key)))
+                    continue
+        elif strip_line.lower() == '&' + _OPERATOR:
+            in_section = True
+            found = True
+        lines.append(line)
+
+    if not found:
+        lines += ['', '&' + _OPERATOR, '   name=hamiltonian'] + new_lines + ['&end']
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_operator_variants(input_file, variants, directory):
+    """
+    Writes one chemistry input per sweep variant, with its operator section properties
+
+    Args:
+        input_file (str): chemistry input file
+        variants (list): operator properties dictionaries
+        directory (str): directory to write the inputs in
+    Returns:
+        list: input files
+    """
+    _, contents = read_input(input_file)
+    input_files = []
+    for index, properties in enumerate(variants):
+        variant_file = os.path.join(directory, 'variant_{:04d}.txt'.format(index))
+        with open(variant_file, 'w') as file:
+            file.write(_set_operator_properties(contents, properties))
+        input_files.append(variant_file)
+
+    return input_files
+
+
+def operator_size(input_file, cache_directory, cpus=None):
+    """
+    Builds the qubit operator of a chemistry input, filling the driver and operator
+    caches, and returns its size
+
+    Args:
+        input_file (str): chemistry input file
+        cache_directory (str): driver and operator cache directory
+        cpus (list): CPUs of the process, only their number is used, or None for all
+    Returns:
+        dict: number of qubits, number of Pauli terms and backend name
+    """
+    cache_driver_outputs(input_file, cache_directory, cpus)
+    _, temp_file = strip_run_options(input_file)
+    try:
+        cached = OperatorCache(cache_directory).load(temp_file or input_file)
+    finally:
+        if temp_file is not None:
+            os.remove(temp_file)
+
+    if cached is None:
+        raise ValueError('Qubit operator not cached.')
+
+    qubit_op = cached.qiskit_aqua.algorithm_input.qubit_op
+    quantum_instance = cached.qiskit_aqua.quantum_instance
+    return {'num_qubits': qubit_op.num_qubits,
+            'num_paulis': len(qubit_op.paulis),
+            'backend': None if quantum_instance is None else quantum_instance.backend_name}
+
+
+def size_operator_variants(input_files, cache_directory, parallel, cpus=None):
+    """
+    Sizes the qubit operators of sweep variants: the driver runs once for the
+    first variant, the other variants reuse its cached output in parallel processes
+
+    Args:
+        input_files (list): variant input files, sharing their driver sections
+        cache_directory (str): driver and operator cache directory
+        parallel (int): number of processes
+        cpus (list): CPUs of each process, only their number is used, or None for all
+    Returns:
+        list: operator_size dictionaries, with an error message instead if it failed
+    """
+    sizes = []
+    with ProcessPoolExecutor(max_workers=max(1, parallel)) as executor:
+        futures = [executor.submit(operator_size, input_files[0], cache_directory, cpus)]
+        # the first variant fills the driver cache before the others start
+        futures[0].exception()
+        futures += [executor.submit(operator_size, x, cache_directory, cpus)
+                    for x in input_files[1:]]
+        for input_file, future in zip(input_files, futures):
+            try:
+                sizes.append(future.result())
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning("Operator of '%s' failed: %s", input_file, str(ex))
+                sizes.append({'error': str(ex)})
+
+    return sizes
+
+
+def sweep_cost(size):
+    """
+    Estimates the relative cost of an objective evaluation: Pauli terms
+    times state amplitudes
+
+    Args:
+        size (dict): operator_size dictionary
+    Returns:
+        int: cost or None if not sized
+    """
+    if size.get('num_qubits') is None:
+        return None
+
+    return size['num_paulis'] * 2 ** size['num_qubits']
+
+
+def format_sweep(variants, sizes, rows=None, reference=None, tolerance=CHEMICAL_ACCURACY):
+    """
+    Formats a sweep as a table, the cheapest variant within tolerance of the
+    reference energy marked with '*'
+
+    Args:
+        variants (list): operator properties dictionaries
+        sizes (list): operator_size dictionaries
+        rows (list): run_pipeline rows of each variant, None if not run
+        reference (float): reference energy or None
+        tolerance (float): energy difference still reproducing the reference
+    Returns:
+        list: table lines
+    """
+    rows = rows or [None] * len(variants)
+    cheapest = None
+    if reference is not None:
+        within = [index for index, row in enumerate(rows)
+                  if row is not None and row['result'] is not None and
+                  row['result'].get('value') is not None and
+                  abs(row['result']['value'] - reference) <= tolerance]
+        if within:
+            cheapest = min(within, key=lambda x: sweep_cost(sizes[x]))
+
+    line_format = '{:>1}{:>4}{:>8}{:>8}{:>12}{:>12}{:>22}{:>12}  {:<12}{}'
+    lines = [line_format.format('', '#', 'qubits', 'paulis', 'cost', 'memory', 'energy',
+                                'error', 'status', 'settings')]
+    for index, (properties, size, row) in enumerate(zip(variants, sizes, rows)):
+        result = (row or {}).get('result') or {}
+        value = result.get('value')
+        memory = estimate_simulator_memory(size.get('num_qubits'), size.get('backend'))
+        if 'error' in size:
+            status = 'failed: {}'.format(size['error'])
+        elif row is None:
+            status = 'skipped'
+        else:
+            status = row['error'] or result.get('status', 'ok')
+        lines.append(line_format.format(
+            '*' if index == cheapest else '',
+            index,
+            size.get('num_qubits', ''),
+            size.get('num_paulis', ''),
+            '' if sweep_cost(size) is None else '{:.3g}'.format(sweep_cost(size)),
+            '' if memory is None else format_bytes(memory),
+            '' if value is None else '{:.12f}'.format(value),
+            '' if value is None or reference is None else '{:.2e}'.format(value - reference),
+            status,
+            ' '.join(['{}={}'.format(k, v) for k, v in properties.items()])))
+
+    return lines
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Thread count and CPU affinity management"""
+
+import os
+import logging
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# environment variables limiting the threads of numerical libraries
+THREAD_ENV_VARS = ['OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS']
+
+_MAX_PARALLEL_THREADS = 'max_parallel_threads'
+
+
+def available_cpus():
+    """ returns the CPUs this process may run on """
+    try:
+        return sorted(psutil.Process().cpu_affinity())
+    except (AttributeError, psutil.Error):
+        # cpu affinity not supported on this platform
+        return list(range(os.cpu_count() or 1))
+
+
+def parse_cpu_list(text):
+    """
+    Parses a CPU list like '0-3,8'
+
+    Args:
+        text (str): comma separated CPU numbers or ranges
+    Returns:
+        list: sorted CPU numbers
+    Raises:
+        SystemExit: invalid CPU list
+    """
+    cpus = set()
+    try:
+        for item in text.split(','):
+            first, _, last = item.strip().partition('-')
+            cpus.update(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise SystemExit("Invalid CPU list '{}', expected for example 0-3,8.".format(text))
+
+    return sorted(cpus)
+
+
+def core_budget(cores=None, cpus=None):
+    """
+    Returns the CPUs of a core budget
+
+    Args:
+        cores (int): number of cores or None for all the CPUs
+        cpus (str): CPU list to take the cores from or None for the available CPUs
+    Returns:
+        list: CPU numbers
+    Raises:
+        SystemExit: invalid core budget
+    """
+    cpus = parse_cpu_list(cpus) if cpus is not None else available_cpus()
+    if cores is not None:
+        if cores < 1:
+            raise SystemExit('Core budget must be at least 1 core.')
+        cpus = cpus[:cores]
+
+    return cpus
+
+
+def split_cores(cpus, workers):
+    """
+    Splits CPUs in contiguous blocks, one per worker
+
+    Args:
+        cpus (list): CPU numbers
+        workers (int): number of workers
+    Returns:
+        list: CPU numbers of each worker
+    """
+    workers = max(1, min(workers, len(cpus)))
+    size, extra = divmod(len(cpus), workers)
+    blocks = []
+    start = 0
+    for index in range(workers):
+        end = start + size + (1 if index < extra else 0)
+        blocks.append(cpus[start:end])
+        start = end
+
+    return blocks
+
+
+def format_cpu_list(cpus):
+    """ formats CPU numbers as a CPU list """
+    return ','.join([str(x) for x in cpus])
+
+
+def thread_env(threads, env=None):
+    """
+    Returns an environment limiting numerical libraries threads
+
+    Args:
+        threads (int): threads per process
+        env (dict): environment to copy, defaults to this process environment
+    Returns:
+        dict: environment
+    """
+    env = dict(os.environ if env is None else env)
+    for name in THREAD_ENV_VARS:
+        env[name] = str(threads)
+
+    return env
+
+
+def limit_threads(cpus, pin=False):
+    """
+    Limits this process to a number of threads, optionally pinned to CPUs.
+    Libraries loaded later read the thread environment variables, BLAS
+    already loaded is limited when threadpoolctl is installed.
+
+    Args:
+        cpus (list): CPU numbers of the core budget
+        pin (bool): pin this process to the CPUs
+    Returns:
+        int: number of threads
+    """
+    threads = len(cpus)
+    os.environ.update({name: str(threads) for name in THREAD_ENV_VARS})
+    try:
+        from threadpoolctl import threadpool_limits  # pylint: disable=import-outside-toplevel
+        threadpool_limits(threads)
+    except ImportError:
+        logger.debug('threadpoolctl not installed, loaded BLAS threads not limited.')
+
+    if pin:
+        try:
+            psutil.Process().cpu_affinity(cpus)
+        except (AttributeError, psutil.Error, ValueError) as ex:
+            logger.warning('CPU affinity not set: %s', str(ex))
+
+    return threads
+
+
+def limit_requested_threads(cores=None, cpus=None, pin=False):
+    """
+    Limits this process threads to a core budget, only when one was given,
+    otherwise the thread environment variables are left as they are
+
+    Args:
+        cores (int): number of cores or None for all the CPUs
+        cpus (str): CPU list to take the cores from or None for the available CPUs
+        pin (bool): pin this process to the CPUs
+    Returns:
+        int: number of threads or None if no core budget was given
+    """
+    if cores is None and cpus is None and not pin:
+        return None
+
+    return limit_threads(core_budget(cores, cpus), pin)
+
+
+def _input_simulator_threads(qiskit_aqua):
+    params = getattr(qiskit_aqua, 'params', None) or {}
+    backend = params.get('backend') or {}
+    options = backend.get('backend_options') or {}
+    for value in [backend.get(_MAX_PARALLEL_THREADS), options.get(_MAX_PARALLEL_THREADS)]:
+        if value is not None:
+            return value
+
+    return None
+
+
+def set_simulator_threads(qiskit_aqua, threads):
+    """
+    Sets the Aer simulator max_parallel_threads backend option, unless the
+    input sets it
+
+    Args:
+        qiskit_aqua (QiskitAqua): Qiskit Aqua object already built
+        threads (int): number of threads or None to leave the backend default
+    """
+    # pylint: disable=import-outside-toplevel
+    from qiskit.aqua.utils.backend_utils import is_aer_provider
+    if threads is None:
+        return
+
+    quantum_instance = qiskit_aqua.quantum_instance
+    if quantum_instance is None or not is_aer_provider(quantum_instance.backend):
+        return
+
+    if _input_simulator_threads(qiskit_aqua) is not None:
+        logger.debug("Backend '%s' max_parallel_threads set by the input, not changed.",
+                     quantum_instance.backend_name)
+        return
+
+    quantum_instance.set_config(max_parallel_threads=threads)
+    logger.debug("Backend '%s' max_parallel_threads set to %s.",
+                 quantum_instance.backend_name, threads)
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Variational algorithm warm start"""
+
+import os
+import ast
+import copy
+import json
+import hashlib
+import tempfile
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# sections that do not change the meaning of the optimal parameters
+_IGNORED_SECTIONS = ['optimizer']
+# algorithm section properties that do not change the meaning of the optimal parameters
+_IGNORED_ALGORITHM_PROPERTIES = ['initial_point']
+
+
+def warm_start_key(sections):
+    """
+    Computes a key identifying inputs that differ only in optimizer settings
+
+    Args:
+        sections (dict): input sections
+    Returns:
+        str: hexadecimal key
+    """
+    sections = {name.lower(): value for name, value in sections.items()
+                if name.lower() not in _IGNORED_SECTIONS}
+    algorithm = sections.get('algorithm')
+    if isinstance(algorithm, dict):
+        algorithm = copy.copy(algorithm)
+        for name in _IGNORED_ALGORITHM_PROPERTIES:
+            algorithm.pop(name, None)
+        sections['algorithm'] = algorithm
+
+    value = json.dumps(sections, sort_keys=True, default=str)
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def load_result_params(filepath):
+    """
+    Loads optimal parameters from a result file
+
+    Args:
+        filepath (str): JSON result or checkpoint file
+    Returns:
+        list: optimal parameters
+    Raises:
+        SystemExit: file has no optimal parameters
+    """
+    with open(filepath) as file:
+        content = file.read()
+
+    try:
+        result = json.loads(content)
+    except json.JSONDecodeError:
+        # result files written as python dictionaries by earlier versions
+        try:
+            result = ast.literal_eval(content)
+        except (ValueError, SyntaxError):
+            raise SystemExit("Result file '{}' is not valid JSON.".format(filepath))
+
+    params = None
+    if isinstance(result, dict):
+        params = result.get('opt_params', result.get('best_params'))
+
+    if params is None:
+        raise SystemExit("Result file '{}' has no optimal parameters.".format(filepath))
+
+    return [float(x) for x in params]
+
+
+class WarmStart:
+    """
+    Seeds the algorithm initial point from the optimal parameters of a
+    previous result, either a given result file, given parameters or the best
+    result recorded for an input differing only in optimizer settings. Results
+    are only recorded by lookup warm starts.
+    """
+
+    DIRECTORY = os.path.join(os.path.expanduser('~'), '.qiskit_aqua_ui_results')
+
+    def __init__(self, input_file, result_file=None, lookup=False, directory=DIRECTORY,
+                 params=None, source=None) -> None:
+        """
+        Args:
+            input_file (str): run input file, saved with the recorded results
+            result_file (str): result file to warm start from
+            lookup (bool): warm start from the results recorded for the same input
+                and record the result
+            directory (str): directory where results are recorded
+            params (list): optimal parameters to warm start from
+            source (str): description of where the parameters come from
+        """
+        self._input_file = os.path.abspath(input_file)
+        self._result_file = result_file
+        self._params = params
+        self._source = source
+        self._lookup = lookup
+        self._directory = directory
+        self._key = None
+
+    def _record_path(self):
+        return os.path.join(self._directory, '{}.json'.format(self._key))
+
+    def lookup(self):
+        """
+        Returns the best result recorded for the current key
+
+        Returns:
+            dict: recorded result or None
+        """
+        filepath = self._record_path()
+        if self._key is None or not os.path.isfile(filepath):
+            return None
+
+        try:
+            with open(filepath) as file:
+                return json.load(file)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.debug("Failed to read recorded result '%s': %s", filepath, str(ex))
+
+        return None
+
+    def attach(self, qiskit_aqua, sections):
+        """
+        Sets the algorithm initial point from a previous result
+
+        Args:
+            qiskit_aqua (QiskitAqua): Qiskit Aqua object already built
+            sections (dict): input sections after defaults merge, so inputs writing
+                a default value or leaving it out share their recorded results
+        Returns:
+            bool: True if the initial point was set
+        """
+        # only lookup warm starts read and record results
+        self._key = warm_start_key(sections) if self._lookup else None
+        params = None
+        source = None
+        if self._params is not None:
+            params = [float(x) for x in self._params]
+            source = self._source
+        elif self._result_file is not None:
+            params = load_result_params(self._result_file)
+            source = self._result_file
+        elif self._lookup:
+            record = self.lookup()
+            if record is not None:
+                params = record['opt_params']
+                source = record.get('input')
+
+        if params is None:
+            if self._lookup:
+                print('No previous result found to warm start from.')
+            return False
+
+        algorithm = qiskit_aqua.quantum_algorithm
+        if not hasattr(algorithm, 'initial_point'):
+            logger.warning("Algorithm '%s' has no initial point to warm start.",
+                           algorithm.__class__.__name__)
+            return False
+
+        var_form = getattr(algorithm, 'var_form', None)
+        num_parameters = getattr(var_form, 'num_parameters', len(params))
+        if num_parameters != len(params):
+            logger.warning('Warm start ignored: %s parameters found, algorithm expects %s.',
+                           len(params), num_parameters)
+            return False
+
+        algorithm.initial_point = np.asarray(params)
+        print("Warm start from '{}'.".format(source))
+        return True
+
+    def save(self, result):
+        """
+        Records a result if it is the best one for the current key,
+        lookup warm starts only
+
+        Args:
+            result (dict): algorithm result
+        """
+        if self._key is None or result.get('opt_params') is None:
+            return
+
+        min_val = result.get('min_val', result.get('energy'))
+        if min_val is not None:
+            min_val = float(np.real(min_val))
+
+        record = self.lookup()
+        if record is not None and record.get('min_val') is not None and \
+                min_val is not None and record['min_val'] < min_val:
+            return
+
+        record = {
+            'input': self._input_file,
+            'min_val': min_val,
+            'opt_params': [float(x) for x in result['opt_params']],
+            'eval_count': result.get('eval_count'),
+        }
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            f_d, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self._directory)
+            with os.fdopen(f_d, 'w') as file:
+                json.dump(record, file, indent=2)
+            os.replace(temp_path, self._record_path())
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.debug("Failed to record result '%s': %s", self._record_path(), str(ex))
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Model autosave to a recovery file"""
+
+import os
+import glob
+import json
+import threading
+import logging
+from .base_model import write_file_atomically
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = '.recovery'
+
+
+def recovery_file_name(preferences_file, pid=None):
+    """ returns the recovery file of a process, next to the preferences file """
+    return '{}.{}{}'.format(preferences_file, pid or os.getpid(), _SUFFIX)
+
+
+def _process_alive(pid):
+    if pid == os.getpid():
+        return False
+    if os.name != 'posix':
+        # no cheap check, another running UI may be offered its edits
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+
+    return True
+
+
+def find_recovery_files(preferences_file):
+    """
+    Finds the recovery files of UI processes that ended without saving their edits
+
+    Args:
+        preferences_file (str): preferences file the recovery files are next to
+    Returns:
+        list: recovery files, newest first
+    """
+    files = []
+    prefix = preferences_file + '.'
+    for file in glob.glob(glob.escape(prefix) + '*' + _SUFFIX):
+        pid = file[len(prefix):-len(_SUFFIX)]
+        if pid.isdigit() and not _process_alive(int(pid)):
+            files.append(file)
+
+    return sorted(files, key=os.path.getmtime, reverse=True)
+
+
+def read_recovery_filename(recovery_file):
+    """ returns the input file a recovery file was edited from, or None """
+    with open(recovery_file) as file:
+        return json.load(file).get('filename')
+
+
+def _section_text(section_name, section, texts):
+    # properties are replaced, not changed in place, unchanged ones compare by identity
+    written = texts.get(section_name)
+    if written is not None and written['value'] == section:
+        return written['text']
+
+    return json.dumps(section, separators=(',', ':'))
+
+
+def write_recovery_file(snapshot, recovery_file, texts=None):
+    """
+    Writes a model snapshot to a recovery file atomically
+
+    Args:
+        snapshot (dict): model snapshot
+        recovery_file (str): recovery file
+        texts (dict): JSON texts of the sections last written, reused for unchanged
+            sections and updated, or None
+    """
+    written = {}
+    for section_name, section in snapshot['sections'].items():
+        written[section_name] = {'value': section,
+                                 'text': _section_text(section_name, section, texts or {})}
+    fields = ['{}:{}'.format(json.dumps(name), json.dumps(value, separators=(',', ':')))
+              for name, value in snapshot.items() if name != 'sections']
+    fields.append('"sections":{' + ','.join(['{}:{}'.format(json.dumps(name), x['text'])
+                                             for name, x in written.items()]) + '}')
+    text = '{' + ','.join(fields) + '}'
+
+    def write(temp_file):
+        with open(temp_file, 'w') as file:
+            file.write(text)
+
+    write_file_atomically(recovery_file, write)
+    if texts is not None:
+        texts.clear()
+        texts.update(written)
+
+
+def remove_recovery_file(recovery_file):
+    """ removes a recovery file, if any """
+    try:
+        os.remove(recovery_file)
+    except FileNotFoundError:
+        pass
+
+
+class Autosave:
+    """
+    Writes model snapshots to a recovery file in a worker thread. Only the latest
+    pending snapshot is written, a slow write never queues up older ones.
+    """
+
+    def __init__(self, recovery_file) -> None:
+        self._recovery_file = recovery_file
+        self._condition = threading.Condition()
+        self._pending = None
+        self._stopped = False
+        self._thread = None
+        # section texts of the last recovery file, used by the worker thread only
+        self._texts = {}
+
+    @property
+    def recovery_file(self):
+        """ returns the recovery file """
+        return self._recovery_file
+
+    def _request(self, snapshot):
+        with self._condition:
+            if self._stopped:
+                return
+            # a tuple, so a None snapshot requests the removal
+            self._pending = (snapshot,)
+            self._condition.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(name='Autosave', target=self._run, daemon=True)
+                self._thread.start()
+
+    def save(self, snapshot):
+        """ writes a model snapshot, replacing any snapshot not written yet """
+        self._request(snapshot)
+
+    def discard(self):
+        """ removes the recovery file, dropping any snapshot not written yet """
+        self._request(None)
+
+    def stop(self, timeout=None):
+        """ writes the pending request and stops the worker thread """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                snapshot, = self._pending
+                self._pending = None
+
+            try:
+                if snapshot is None:
+                    self._texts.clear()
+                    remove_recovery_file(self._recovery_file)
+                else:
+                    write_recovery_file(snapshot, self._recovery_file, self._texts)
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning("Autosave to '%s' failed: %s", self._recovery_file, str(ex))
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Model file operation thread"""
+
+import copy
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FileOperation(threading.Thread):
+    """
+    Runs a model file operation in a worker thread. A cancelled operation is not
+    interrupted, its result is dropped and its changes are never committed.
+    """
+
+    def __init__(self, name, function, args=()) -> None:
+        super().__init__(name=name)
+        self.daemon = True
+        self._function = function
+        self._args = args
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._committed = False
+        self.result = None
+        self.exception = None
+
+    @property
+    def cancelled(self):
+        """ returns True if the operation was cancelled """
+        return self._cancelled
+
+    def cancel(self):
+        """ cancels the operation, returns False if it already committed its changes """
+        with self._lock:
+            if self._committed:
+                return False
+
+            self._cancelled = True
+            return True
+
+    def commit(self, function, *args):
+        """ runs function unless the operation was cancelled, returns True if it ran """
+        with self._lock:
+            if self._cancelled:
+                return False
+
+            function(*args)
+            self._committed = True
+            return True
+
+    def run(self):
+        try:
+            self.result = self._function(self, *self._args)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.debug('%s failed', self.name, exc_info=True)
+            self.exception = ex
+
+
+def load_model(operation, model, filename):
+    """
+    Loads a file into a copy of the model, so the model in use is only replaced
+    once loading succeeded
+
+    Args:
+        operation (FileOperation): operation running the load
+        model (BaseModel): model in use
+        filename (str): input file
+    Returns:
+        tuple: loaded model copy, validation exception or None
+    Raises:
+        Exception: file not loaded
+    """
+    # pylint: disable=unused-argument
+    loaded = copy.copy(model)
+    try:
+        loaded.load_file(filename)
+    except Exception as ex:  # pylint: disable=broad-except
+        # a file that loaded but did not validate is still shown
+        if loaded.get_filename() is None or isinstance(ex, FileNotFoundError):
+            raise
+        return loaded, ex
+
+    return loaded, None
+
+
+def recover_model(operation, model, recovery_file):
+    """
+    Loads a recovery file into a copy of the model, so the model in use is
+    only replaced once recovering succeeded
+
+    Args:
+        operation (FileOperation): operation running the recovery
+        model (BaseModel): model in use
+        recovery_file (str): recovery file
+    Returns:
+        tuple: recovered model copy, None
+    """
+    # pylint: disable=unused-argument
+    loaded = copy.copy(model)
+    loaded.recover_file(recovery_file)
+    return loaded, None
+
+
+def save_model(operation, model, filename):
+    """
+    Saves the model, its temporary file only replaces the file
+    unless the operation was cancelled
+
+    Args:
+        operation (FileOperation): operation running the save
+        model (BaseModel): model to save
+        filename (str): file to save to
+    Returns:
+        bool: True if written, False if cancelled or not edited
+    """
+    return model.save_to_file(filename, operation.commit)
@@ -76,6 +76,14 @@ class MainView(ttk.Frame):
                        state='disabled',
                        command=self._guiprovider.controller.toggle)
         self._guiprovider.controller._start_button.pack(side=tk.LEFT)
+        checkbutton = ttk.Checkbutton(toolbar,
+                                      text="Warm Start",
+                                      variable=self._guiprovider.controller.warm_start)
+        checkbutton.pack(side=tk.LEFT)
+        checkbutton = ttk.Checkbutton(toolbar,
+                                      text="Early Stop",
+                                      variable=self._guiprovider.controller.early_stop)
+        checkbutton.pack(side=tk.LEFT)
         self._guiprovider.add_toolbar_items(toolbar)
         self._guiprovider.controller._progress = ttk.Progressbar(toolbar, orient=tk.HORIZONTAL)
         self._guiprovider.controller._progress.pack(side=tk.RIGHT, fill=tk.BOTH, expand=tk.TRUE)
@@ -145,10 +153,21 @@ class MainView(ttk.Frame):
         filename = tkfd.askopenfilename(parent=self,
                                         title='Open File',
                                         initialdir=preferences.get_openfile_initialdir())
-        if filename and self._guiprovider.controller.open_file(filename):
-            preferences.add_recent_file(filename)
+        if filename:
+            self._guiprovider.controller.open_file(
+                filename, lambda ret: self._add_recent_file(ret, filename, False))
+
+    def _add_recent_file(self, opened, filename, saved):
+        if not opened:
+            return
+
+        preferences = self._guiprovider.create_uipreferences()
+        preferences.add_recent_file(filename)
+        if saved:
+            preferences.set_savefile_initialdir(os.path.dirname(filename))
+        else:
             preferences.set_openfile_initialdir(os.path.dirname(filename))
-            preferences.save()
+        preferences.save()
 
     def _open_recent_file(self, filename):
         self._guiprovider.controller.open_file(filename)
@@ -170,10 +189,9 @@ class MainView(ttk.Frame):
         filename = tkfd.asksaveasfilename(parent=self,
                                           title='Save File',
                                           initialdir=preferences.get_savefile_initialdir())
-        if filename and self._guiprovider.controller.save_file_as(filename):
-            preferences.add_recent_file(filename)
-            preferences.set_savefile_initialdir(os.path.dirname(filename))
-            preferences.save()
+        if filename:
+            self._guiprovider.controller.save_file_as(
+                filename, lambda ret: self._add_recent_file(ret, filename, True))
 
     def _create_pane(self):
         label_font = font.nametofont('TkHeadingFont').copy()
@@ -239,6 +257,9 @@ class MainView(ttk.Frame):
         sys.stderr = self._guiprovider.controller.outputview
         # update logging after redirect
         self.after(0, self._set_preferences_logging)
+        # edits of a UI that ended without saving them, then autosave these ones
+        self.after(0, self._guiprovider.controller.offer_recovery)
+        self.after(0, self._guiprovider.controller.start_autosave)
 
         self.update_idletasks()
         self._guiprovider.controller._sections_view.show_add_button(False)
@@ -260,7 +281,9 @@ class MainView(ttk.Frame):
             preferences = self._guiprovider.create_uipreferences()
             preferences.set_geometry(self.master.winfo_geometry())
             preferences.save()
+            self._guiprovider.controller.end_file_operations()
             self._guiprovider.controller.stop()
+            self._guiprovider.controller.stop_autosave()
             ttk.Frame.quit(self)
             return True
 
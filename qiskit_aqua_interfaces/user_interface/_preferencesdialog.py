@@ -16,8 +16,11 @@
 
 import tkinter as tk
 import tkinter.ttk as ttk
+from tkinter import messagebox
 from collections import OrderedDict
 import logging
+from qiskit_aqua_interfaces.command_line import CONVERGENCE_TOL
+from .guiprovider import GUIProvider
 from ._dialog import Dialog
 from ._credentialsview import CredentialsView
 
@@ -42,6 +45,10 @@ class PreferencesDialog(Dialog):
         self._level_combo = None
         self._check_button = None
         self._populate_defaults = tk.IntVar()
+        self._stop_timeout = tk.StringVar()
+        self._convergence_window = tk.StringVar()
+        self._convergence_tol = tk.StringVar()
+        self._autosave_interval = tk.StringVar()
 
     def body(self, parent, options):
         preferences = self._guiprovider.create_uipreferences()
@@ -51,6 +58,13 @@ class PreferencesDialog(Dialog):
 
         populate = preferences.get_populate_defaults(True)
         self._populate_defaults.set(1 if populate else 0)
+        self._stop_timeout.set(str(preferences.get_stop_timeout(GUIProvider.STOP_TIMEOUT)))
+        self._convergence_window.set(
+            str(preferences.get_convergence_window(GUIProvider.CONVERGENCE_WINDOW)))
+        self._convergence_tol.set(
+            str(preferences.get_convergence_tol(CONVERGENCE_TOL)))
+        self._autosave_interval.set(
+            str(preferences.get_autosave_interval(GUIProvider.AUTOSAVE_INTERVAL)))
 
         current_row = 0
         from qiskit.aqua.utils import has_ibmq
@@ -78,6 +92,44 @@ class PreferencesDialog(Dialog):
                                              text="Populate on file new/open",
                                              variable=self._populate_defaults)
         self._check_button.grid(row=0, column=1, sticky='nsw')
+        ttk.Label(defaults_group,
+                  text="Autosave interval (seconds, 0 disables):",
+                  borderwidth=0,
+                  anchor=tk.E).grid(row=1, column=0, sticky='nsew')
+        ttk.Entry(defaults_group,
+                  width=8,
+                  textvariable=self._autosave_interval).grid(row=1, column=1, sticky='nsw')
+
+        run_group = ttk.LabelFrame(parent,
+                                   text='Run',
+                                   padding=(6, 6, 6, 6),
+                                   borderwidth=4,
+                                   relief=tk.GROOVE)
+        run_group.grid(padx=(7, 7), pady=6, row=current_row, column=0, sticky='nsw')
+        run_group.columnconfigure(1, pad=7)
+        current_row += 1
+
+        ttk.Label(run_group,
+                  text="Stop timeout (seconds):",
+                  borderwidth=0,
+                  anchor=tk.E).grid(row=0, column=0, sticky='nsew')
+        ttk.Entry(run_group,
+                  width=8,
+                  textvariable=self._stop_timeout).grid(row=0, column=1, sticky='nsw')
+        ttk.Label(run_group,
+                  text="Early stop window (evaluations):",
+                  borderwidth=0,
+                  anchor=tk.E).grid(row=1, column=0, sticky='nsew')
+        ttk.Entry(run_group,
+                  width=8,
+                  textvariable=self._convergence_window).grid(row=1, column=1, sticky='nsw')
+        ttk.Label(run_group,
+                  text="Early stop tolerance:",
+                  borderwidth=0,
+                  anchor=tk.E).grid(row=2, column=0, sticky='nsew')
+        ttk.Entry(run_group,
+                  width=8,
+                  textvariable=self._convergence_tol).grid(row=2, column=1, sticky='nsw')
 
         logging_group = ttk.LabelFrame(parent,
                                        text='Logging Configuration',
@@ -107,6 +159,34 @@ class PreferencesDialog(Dialog):
         return self.entry  # initial focus
 
     def validate(self):
+        try:
+            if int(self._stop_timeout.get()) < 0:
+                raise ValueError()
+        except ValueError:
+            messagebox.showerror('Error', 'Stop timeout must be a non-negative integer.')
+            return False
+
+        try:
+            if int(self._convergence_window.get()) < 1:
+                raise ValueError()
+        except ValueError:
+            messagebox.showerror('Error', 'Early stop window must be a positive integer.')
+            return False
+
+        try:
+            if float(self._convergence_tol.get()) < 0:
+                raise ValueError()
+        except ValueError:
+            messagebox.showerror('Error', 'Early stop tolerance must be a non-negative number.')
+            return False
+
+        try:
+            if int(self._autosave_interval.get()) < 0:
+                raise ValueError()
+        except ValueError:
+            messagebox.showerror('Error', 'Autosave interval must be a non-negative integer.')
+            return False
+
         if self._credentialsview:
             if not self._credentialsview.validate():
                 self.initial_focus = self._credentialsview.initial_focus
@@ -128,6 +208,10 @@ class PreferencesDialog(Dialog):
             preferences = self._guiprovider.create_uipreferences()
             preferences.set_logging_config(logging_config)
             preferences.set_populate_defaults(populate != 0)
+            preferences.set_stop_timeout(int(self._stop_timeout.get()))
+            preferences.set_convergence_window(int(self._convergence_window.get()))
+            preferences.set_convergence_tol(float(self._convergence_tol.get()))
+            preferences.set_autosave_interval(int(self._autosave_interval.get()))
             preferences.save()
 
             self._guiprovider.set_logging_config(logging_config)
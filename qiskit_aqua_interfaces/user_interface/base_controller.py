@@ -16,6 +16,7 @@
 
 from abc import ABC, abstractmethod
 import os
+import time
 import threading
 import queue
 import tkinter as tk
@@ -23,8 +24,12 @@ from tkinter import messagebox
 import ast
 import json
 import logging
+from qiskit_aqua_interfaces.command_line import check_simulator_memory, CONVERGENCE_TOL
 from .guiprovider import GUIProvider
 from .base_model import BaseModel
+from ._fileoperation import FileOperation, load_model, save_model, recover_model
+from ._autosave import (Autosave, recovery_file_name, find_recovery_files,
+                        read_recovery_filename, remove_recovery_file)
 from ._customwidgets import (EntryPopup, ComboboxPopup, TextPopup)
 
 logger = logging.getLogger(__name__)
@@ -51,8 +56,15 @@ class BaseController(ABC):
         self._progress = None
         self._button_text = None
         self._start_button = None
+        self._warm_start = None
+        self._early_stop = None
         self._thread_queue = queue.Queue()
         self._thread = None
+        self._stopping_thread = None
+        self._file_operation = None
+        self._save_operation = None
+        self._autosave = None
+        self._autosave_revision = None
         self._command = GUIProvider.START
         self._process_stop = False
         self._validate_integer_command = None
@@ -136,6 +148,24 @@ class BaseController(ABC):
         """ return model """
         return self._model
 
+    @property
+    def warm_start(self):
+        """ get warm start from previous results flag """
+        if self._warm_start is None:
+            self._warm_start = tk.IntVar()
+            self._warm_start.set(0)
+
+        return self._warm_start
+
+    @property
+    def early_stop(self):
+        """ get early stop on convergence flag """
+        if self._early_stop is None:
+            self._early_stop = tk.IntVar()
+            self._early_stop.set(0)
+
+        return self._early_stop
+
     def new_input(self):
         """ load new input data """
         ret = True
@@ -165,74 +195,337 @@ class BaseController(ABC):
 
         return ret
 
-    def open_file(self, filename):
-        """ open file """
-        ret = True
+    def open_file(self, filename, callback=None):
+        """
+        Opens a file in a worker thread, the current input stays in use until
+        the file loaded and replaces it
+
+        Args:
+            filename (str): input file
+            callback (callable): called with True once the file opened, False if it failed
+        Returns:
+            bool: True if opening started
+        """
+        # a cancelled save holds the model until its worker thread ended
+        if self._file_operation is not None or self.model.read_only:
+            self.outputview.write_line('Another file operation is in progress.')
+            return False
+
         try:
             self.stop()
-            self.outputview.clear()
-            self._start_button.state(['disabled'])
-            self._title.set('')
-            self._sections_view.clear()
-            self._sections_view.show_add_button(True)
-            self._sections_view.show_remove_button(False)
-            self._text_view.clear()
-            self._sections_view_title.set('')
-            self._properties_view.clear()
-            self._properties_view.show_remove_button(False)
-            self._empty_view.tkraise()
-            try:
-                self.model.load_file(filename)
-            except Exception as ex:  # pylint: disable=broad-except
-                messagebox.showerror("Error", str(ex))
-                # Only return false if no file or if file not found
-                if self.model.get_filename() is None or isinstance(ex, FileNotFoundError):
-                    ret = False
+            self._start_file_operation('Opening {}'.format(filename),
+                                       load_model, (self.model, filename),
+                                       lambda operation: self._open_file_done(filename,
+                                                                              operation,
+                                                                              callback))
+        except Exception as ex:  # pylint: disable=broad-except
+            self.outputview.write_line(str(ex))
+            return False
 
-            self._title.set(os.path.basename(filename))
-            section_names = self.model.get_section_names()
-            self._sections_view.populate(section_names)
-            self._start_button.state(['!disabled'])
-            missing = self.get_sections_names_missing()
-            self._sections_view.show_add_button(bool(missing))
+        return True
+
+    def _open_file_done(self, filename, operation, callback):
+        ret = True
+        try:
+            self.outputview.clear()
+            if operation.exception is not None:
+                messagebox.showerror("Error", str(operation.exception))
+                # the current input stays in use
+                ret = False
+            else:
+                loaded, error = operation.result
+                self._start_button.state(['disabled'])
+                self._title.set('')
+                self._sections_view.clear()
+                self._sections_view.show_add_button(True)
+                self._sections_view.show_remove_button(False)
+                self._text_view.clear()
+                self._sections_view_title.set('')
+                self._properties_view.clear()
+                self._properties_view.show_remove_button(False)
+                self._empty_view.tkraise()
+                self.model.swap(loaded)
+                if error is not None:
+                    messagebox.showerror("Error", str(error))
+
+                self._title.set(os.path.basename(filename))
+                section_names = self.model.get_section_names()
+                self._sections_view.populate(section_names)
+                self._start_button.state(['!disabled'])
+                missing = self.get_sections_names_missing()
+                self._sections_view.show_add_button(bool(missing))
+                self.on_file_opened()
         except Exception as ex:  # pylint: disable=broad-except
             self.outputview.clear()
             self.outputview.write_line(str(ex))
             ret = False
 
-        return ret
+        if callback is not None:
+            callback(ret)
+
+    def on_file_opened(self):
+        """ file opened callback """
+        pass
 
     def is_empty(self):
         """ check if is empty """
         return self.model.is_empty()
 
-    def save_file(self):
-        """ save file """
+    def save_file(self, callback=None):
+        """
+        Saves the file in a worker thread
+
+        Args:
+            callback (callable): called with True once the file saved, False if it failed
+        Returns:
+            bool: True if saving started
+        """
         filename = self.model.get_filename()
         if not filename:
             self.outputview.write_line("No file to save.")
             return False
 
+        return self._save(filename, False, callback)
+
+    def save_file_as(self, filename, callback=None):
+        """
+        Saves the file to a different path in a worker thread, then opens it
+
+        Args:
+            filename (str): file to save to
+            callback (callable): called with True once the file saved and opened,
+                False if it failed
+        Returns:
+            bool: True if saving started
+        """
+        return self._save(filename, True, callback)
+
+    def _save(self, filename, reopen, callback):
+        # a cancelled save holds the model until its worker thread ended
+        if self._file_operation is not None or self.model.read_only:
+            self.outputview.write_line('Another file operation is in progress.')
+            return False
+
+        def done(operation):
+            if operation.exception is not None:
+                messagebox.showerror("Error", str(operation.exception))
+            elif reopen:
+                if self.open_file(filename, callback):
+                    return
+            else:
+                self.outputview.write_line("Saved file: {}".format(filename) if operation.result
+                                           else "File not edited: {}".format(filename))
+                if callback is not None:
+                    callback(True)
+                return
+
+            if callback is not None:
+                callback(False)
+
         try:
-            self.model.save_to_file(filename)
-            self.outputview.write_line("Saved file: {}".format(filename))
-            return True
+            # edits wait for the save, the worker thread serializes the input
+            self._start_file_operation('Saving {}'.format(filename),
+                                       save_model, (self.model, filename), done, True)
         except Exception as ex:  # pylint: disable=broad-except
+            self.model.read_only = False
             messagebox.showerror("Error", str(ex))
+            return False
 
-        return False
+        return True
+
+    def _start_file_operation(self, message, function, args, done, read_only=False):
+        """
+        Runs a file operation in a worker thread, showing progress, the start
+        button cancels it unless a run is in progress
+
+        Args:
+            message (str): operation description
+            function (callable): called in the worker thread as function(operation, *args)
+            args (tuple): function arguments
+            done (callable): called on the Tk thread as done(operation) once the
+                operation ended, unless cancelled
+            read_only (bool): the model stays read only until the worker thread ended,
+                even if the operation was cancelled
+        """
+        operation = FileOperation(message, function, args)
+        if read_only:
+            self.model.read_only = True
+            self._save_operation = operation
+        self._file_operation = operation
+        self.outputview.write_line('{} ...'.format(message))
+        if self._command is GUIProvider.START:
+            self._progress.start(100)
+            self._command = GUIProvider.CANCEL
+            self._button_text.set(self._command)
+            self._start_button.state(['!disabled'])
+        for index in [0, 1, 2, 4, 5]:
+            self._filemenu.entryconfig(index, state='disabled')
+        operation.start()
+        self._view.after(100, self._process_file_operation, operation, done, read_only)
+
+    def _process_file_operation(self, operation, done, read_only):
+        if operation.is_alive():
+            self._view.after(100, self._process_file_operation, operation, done, read_only)
+            return
 
-    def save_file_as(self, filename):
-        """ save file to a different path """
+        if read_only:
+            self.model.read_only = False
+            self._save_operation = None
+        if operation is not self._file_operation:
+            # cancelled, its result is dropped
+            return
+
+        self._end_file_operation()
+        done(operation)
+
+    def _end_file_operation(self):
+        self._file_operation = None
+        if self._command is GUIProvider.CANCEL:
+            self._progress.stop()
+            self._command = GUIProvider.START
+            self._button_text.set(self._command)
+        self._filemenu.entryconfig(4, state='normal')
+        self._filemenu.entryconfig(5, state='normal')
+        if self._thread is None:
+            self._filemenu.entryconfig(0, state='normal')
+            self._filemenu.entryconfig(1, state='normal')
+            self._filemenu.entryconfig(2, state='normal')
+
+    def cancel_file_operation(self):
+        """ cancels the file operation in progress, returns True if cancelled """
+        operation = self._file_operation
+        if operation is None or not operation.cancel():
+            return False
+
+        self._end_file_operation()
+        self.outputview.write_line('{} cancelled.'.format(operation.name))
+        return True
+
+    def end_file_operations(self):
+        """
+        Ends the file operations before quitting: a save in progress, even a cancelled
+        one, is waited for, so the file is either written or left as it was, other
+        operations are cancelled
+        """
+        operation = self._save_operation
+        if operation is None:
+            self.cancel_file_operation()
+            return
+
+        if operation.is_alive():
+            self.outputview.write_line('Waiting for {} to end ...'.format(operation.name))
+            self._view.update_idletasks()
+            operation.join()
+
+    def start_autosave(self):
+        """ starts the periodic autosave of edits to a recovery file """
+        if self._autosave is not None:
+            return
+
+        preferences = self._guiprovider.create_uipreferences()
+        self._autosave = Autosave(recovery_file_name(preferences.filepath))
+        self._autosave_revision = None
+        self._schedule_autosave(preferences)
+
+    def _schedule_autosave(self, preferences):
+        interval = preferences.get_autosave_interval(GUIProvider.AUTOSAVE_INTERVAL)
+        # disabled autosaves check the preference again
+        self._view.after(1000 * (interval if interval > 0 else 10),
+                         self._autosave_tick, interval > 0)
+
+    def _autosave_tick(self, enabled):
+        if self._autosave is None:
+            return
+
+        # a file operation owns the model until it ends
+        if enabled and self._file_operation is None and not self.model.read_only:
+            try:
+                # dirty sections stand for is_modified, without comparing every section
+                if not self.model.is_dirty():
+                    if self._autosave_revision is not None:
+                        self._autosave.discard()
+                        self._autosave_revision = None
+                elif self.model.get_revision() != self._autosave_revision:
+                    # a shallow copy on the Tk thread, serialized by the autosave thread
+                    self._autosave.save(self.model.snapshot())
+                    self._autosave_revision = self.model.get_revision()
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.debug('Autosave snapshot failed: %s', str(ex))
+
+        self._schedule_autosave(self._guiprovider.create_uipreferences())
+
+    def stop_autosave(self):
+        """
+        Stops the autosave, removing the recovery file if the edits were saved,
+        otherwise keeping it with the latest edits to be recovered on the next start
+        """
+        if self._autosave is None:
+            return
+
+        autosave = self._autosave
+        self._autosave = None
         try:
-            self.model.save_to_file(filename)
-            self.open_file(filename)
-            return True
+            if not self.model.is_dirty():
+                autosave.discard()
+            elif self.model.get_revision() != self._autosave_revision:
+                autosave.save(self.model.snapshot())
         except Exception as ex:  # pylint: disable=broad-except
-            messagebox.showerror("Error", str(ex))
+            logger.debug('Autosave snapshot failed: %s', str(ex))
+        autosave.stop(5)
+
+    def offer_recovery(self):
+        """
+        Offers to recover the edits a UI did not save before it ended,
+        from its recovery file
+
+        Returns:
+            bool: True if recovering started
+        """
+        preferences = self._guiprovider.create_uipreferences()
+        for recovery_file in find_recovery_files(preferences.filepath):
+            try:
+                filename = read_recovery_filename(recovery_file)
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.debug("Recovery file '%s' not readable: %s", recovery_file, str(ex))
+                remove_recovery_file(recovery_file)
+                continue
+
+            name = filename if filename else 'a new input'
+            modified = time.strftime('%Y-%m-%d %H:%M',
+                                     time.localtime(os.path.getmtime(recovery_file)))
+            if not messagebox.askyesno('Recover edits',
+                                       'Edits of {} not saved, autosaved on {}, were found. '
+                                       'Recover them?'.format(name, modified)):
+                remove_recovery_file(recovery_file)
+                continue
+
+            return self._recover(recovery_file, filename, name)
 
         return False
 
+    def _recover(self, recovery_file, filename, name):
+        # a cancelled save holds the model until its worker thread ended
+        if self._file_operation is not None or self.model.read_only:
+            self.outputview.write_line('Another file operation is in progress.')
+            return False
+
+        def recovered(opened):
+            if opened:
+                remove_recovery_file(recovery_file)
+
+        try:
+            self.stop()
+            self._start_file_operation('Recovering {}'.format(name),
+                                       recover_model, (self.model, recovery_file),
+                                       lambda operation: self._open_file_done(filename or '',
+                                                                              operation,
+                                                                              recovered))
+        except Exception as ex:  # pylint: disable=broad-except
+            self.outputview.write_line(str(ex))
+            return False
+
+        return True
+
     @abstractmethod
     def cb_section_select(self, section_name):
         """ select section callback """
@@ -452,10 +745,35 @@ class BaseController(ABC):
 
     def toggle(self):
         """ toggle between start/stop """
+        if self._command is GUIProvider.CANCEL:
+            self.cancel_file_operation()
+            return
+
+        if self._command is GUIProvider.KILL:
+            self.kill()
+            return
+
         if self.model.is_empty():
             self.outputview.write_line("Missing Input")
             return
 
+        options = []
+        if self._command is GUIProvider.START:
+            options = self._verify_simulator_memory()
+            if options is None:
+                return
+
+            if self.warm_start.get() != 0:
+                options.append('--warm-start')
+            if self.early_stop.get() != 0:
+                preferences = self._guiprovider.create_uipreferences()
+                options.extend(['--convergence-window',
+                                str(preferences.get_convergence_window(
+                                    GUIProvider.CONVERGENCE_WINDOW)),
+                                '--convergence-tol',
+                                str(preferences.get_convergence_tol(
+                                    CONVERGENCE_TOL))])
+
         self._start_button.state(['disabled'])
         self._filemenu.entryconfig(0, state='disabled')
         self._filemenu.entryconfig(1, state='disabled')
@@ -465,7 +783,7 @@ class BaseController(ABC):
             if self._command is GUIProvider.START:
                 self.outputview.clear()
                 self._thread = self._guiprovider.create_run_thread(
-                    self.model, self.outputview, self._thread_queue)
+                    self.model, self.outputview, self._thread_queue, options)
                 if self._thread is not None:
                     self._thread.daemon = True
                     self._thread.start()
@@ -486,18 +804,58 @@ class BaseController(ABC):
             self._filemenu.entryconfig(1, state='normal')
             self._filemenu.entryconfig(2, state='normal')
 
+    def _verify_simulator_memory(self):
+        """
+        Checks the simulator memory estimate before a run
+
+        Returns:
+            list: command line options for the run or None if the run was cancelled
+        """
+        from qiskit.aqua.parser import JSONSchema
+        try:
+            message = check_simulator_memory(
+                self.model.get_num_qubits(),
+                self.model.get_section_property(JSONSchema.BACKEND, JSONSchema.NAME))
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.debug('Memory estimate failed: %s', str(ex))
+            return []
+
+        if message is None:
+            return []
+
+        if not messagebox.askyesno('Memory', '{}\n\nRun anyway?'.format(message)):
+            self.outputview.write_line(message)
+            return None
+
+        return ['--memory-check', 'warn']
+
     def stop(self):
-        """ stop start thread """
+        """ stop start thread, the start button kills its process while it stops """
         if self._thread is not None:
+            # the run thread posts STOP once its process has written partial results and ended
             stopthread = threading.Thread(target=BaseController._stop,
                                           args=(self._thread,),
                                           name='Stop thread')
             stopthread.daemon = True
             stopthread.start()
-            self.outputview.clear_buffer()
+            self._stopping_thread = self._thread
             self._thread = None
             self._process_stop = True
-            self._thread_queue.put(GUIProvider.STOP)
+            self.outputview.write_line('Stopping process ...')
+            self._command = GUIProvider.KILL
+            self._button_text.set(self._command)
+            self._start_button.state(['!disabled'])
+
+    def kill(self):
+        """ kill the process of a stopping start thread, without its partial results """
+        if self._stopping_thread is not None:
+            self._start_button.state(['disabled'])
+            killthread = threading.Thread(target=BaseController._kill,
+                                          args=(self._stopping_thread,),
+                                          name='Kill thread')
+            killthread.daemon = True
+            killthread.start()
+            self.outputview.write_line('Killing process ...')
 
     @staticmethod
     def _stop(thread):
@@ -507,6 +865,13 @@ class BaseController(ABC):
         except Exception:  # pylint: disable=broad-except
             pass
 
+    @staticmethod
+    def _kill(thread):
+        try:
+            thread.kill()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
     def _process_thread_queue(self):
         try:
             line = self._thread_queue.get_nowait()
@@ -523,13 +888,15 @@ class BaseController(ABC):
                     self._thread_queue.put(GUIProvider.STOP)
                 else:
                     self._thread = None
+                    self._stopping_thread = None
                     self._progress.stop()
                     self._command = GUIProvider.START
                     self._button_text.set(self._command)
                     self._start_button.state(['!disabled'])
-                    self._filemenu.entryconfig(0, state='normal')
-                    self._filemenu.entryconfig(1, state='normal')
-                    self._filemenu.entryconfig(2, state='normal')
+                    if self._file_operation is None:
+                        self._filemenu.entryconfig(0, state='normal')
+                        self._filemenu.entryconfig(1, state='normal')
+                        self._filemenu.entryconfig(2, state='normal')
                     if self._process_stop:
                         self._process_stop = False
                         self.outputview.write_line('Process stopped.')
@@ -15,23 +15,99 @@
 """Qiskit User Interface base model"""
 
 from abc import ABC, abstractmethod
+import os
 import json
 from collections import OrderedDict
 import copy
+import stat
+import tempfile
+import itertools
 import threading
 import logging
+from qiskit_aqua_interfaces.command_line import index_json_sections
 
 logger = logging.getLogger(__name__)
 
+# temporary files are created private, saved files get the usual permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+# edit revisions, unique across models
+_REVISIONS = itertools.count(1)
+
+
+def _replace(function, *args):
+    function(*args)
+    return True
+
+
+def _fsync_directory(directory):
+    # a rename is durable once its directory is flushed, directories cannot be opened on Windows
+    if os.name != 'posix':
+        return
+
+    handle = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(handle)
+    finally:
+        os.close(handle)
+
 # pylint: disable=import-outside-toplevel
 
 
+def write_file_atomically(filename, write, commit=None):
+    """
+    Writes a file atomically: a temporary file next to it is written, flushed
+    to disk and renamed over the file, keeping its permissions
+
+    Args:
+        filename (str): file to write
+        write (callable): called as write(temp_file) to write the temporary file
+        commit (callable): called as commit(os.replace, temp_file, filename) to
+            replace the file, returns False to keep the file, defaults to replacing it
+    Returns:
+        bool: True if the file was written
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    handle, temp_file = tempfile.mkstemp(prefix='.{}.'.format(os.path.basename(filename)),
+                                         dir=directory)
+    os.close(handle)
+    try:
+        write(temp_file)
+        with open(temp_file, 'rb+') as file:
+            os.fsync(file.fileno())
+        if os.path.exists(filename):
+            os.chmod(temp_file, stat.S_IMODE(os.stat(filename).st_mode))
+        else:
+            os.chmod(temp_file, 0o666 & ~_UMASK)
+        if not (commit or _replace)(os.replace, temp_file, filename):
+            return False
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+    _fsync_directory(directory)
+    return True
+
+
 class BaseModel(ABC):
     """Base GUI Model."""
 
+    # lazy sections at least this long are loaded on first use
+    LAZY_SECTION_SIZE = 1024 * 1024
+
     def __init__(self) -> None:
         """Create Model object."""
         self._parser = None
+        self._filename = None
+        self._deferred_sections = OrderedDict()
+        self._populate_defaults = False
+        self._dirty_sections = set()
+        self._section_texts = {}
+        # shallow copies of the sections as loaded from the file
+        self._file_sections = {}
+        self._revision = next(_REVISIONS)
+        self._lock = threading.RLock()
+        self.read_only = False
         self._custom_providers = {}
         self._available_providers = {}
         self._backendsthread = None
@@ -56,6 +132,12 @@ class BaseModel(ABC):
         self._backendsthread.daemon = True
         self._backendsthread.start()
 
+    def wait_available_providers(self, timeout=None):
+        """ wait for the available providers lookup to finish """
+        thread = self._backendsthread
+        if thread is not None:
+            thread.join(timeout)
+
     def _get_available_providers(self):
         try:
             self._available_providers = OrderedDict([x for x in
@@ -65,6 +147,28 @@ class BaseModel(ABC):
         finally:
             self._backendsthread = None
 
+    def swap(self, model):
+        """ takes over the input data of a model copy loaded in the background """
+        # pylint: disable=protected-access
+        self._parser = model._parser
+        self._filename = model._filename
+        self._deferred_sections = model._deferred_sections
+        self._populate_defaults = model._populate_defaults
+        self._dirty_sections = model._dirty_sections
+        self._section_texts = model._section_texts
+        self._file_sections = model._file_sections
+        self._revision = model._revision
+
+    def _start_edit(self, section_name):
+        if self._parser is None:
+            raise Exception('Input not initialized.')
+        if self.read_only:
+            raise Exception('Input is being saved, edit it again once saved.')
+
+        self._dirty_sections.add(section_name)
+        self._section_texts.pop(section_name, None)
+        self._revision = next(_REVISIONS)
+
     def is_empty(self):
         """ check if no data """
         return self._parser is None or len(self._parser.get_section_names()) == 0
@@ -77,6 +181,12 @@ class BaseModel(ABC):
             with open(jsonfile) as json_file:
                 json_dict = json.load(json_file)
 
+            self._filename = None
+            self._deferred_sections = OrderedDict()
+            self._dirty_sections = set()
+            self._section_texts = {}
+            self._file_sections = {}
+            self._revision = next(_REVISIONS)
             self._parser = parser_class(json_dict)
             self._parser.parse()
             if populate_defaults:
@@ -95,7 +205,14 @@ class BaseModel(ABC):
         if filename is None:
             return []
         try:
-            self._parser = parser_class(filename)
+            self._filename = filename
+            self._deferred_sections = OrderedDict()
+            self._dirty_sections = set()
+            self._section_texts = {}
+            self._file_sections = {}
+            self._revision = next(_REVISIONS)
+            self._populate_defaults = populate_defaults
+            self._parser = parser_class(self._index_sections(filename))
             self._parser.parse()
             # check if there was any data, if there is no data, just return empty file
             if not self.get_section_names():
@@ -126,28 +243,298 @@ class BaseModel(ABC):
             return self.get_section_names()
         finally:
             self._parser.commit_changes()
+            self._remember_file_sections()
+
+    def _remember_file_sections(self):
+        # the loaded sections equal the file
+        for section_name in self._parser.get_section_names():
+            if section_name not in self._deferred_sections:
+                self._file_sections[section_name] = \
+                    copy.copy(self._parser.get_section(section_name))
+
+    def lazy_section_names(self):
+        """ returns the names of the sections loaded on first use from large files """
+        return []
+
+    def summarize_section(self, section_name, properties):
+        """
+        Summarizes a section loaded on first use, before its properties are released
+
+        Args:
+            section_name (str): section name
+            properties (dict): section properties
+        Returns:
+            dict: what is known of the section until it is loaded
+        """
+        # pylint: disable=unused-argument
+        return {}
+
+    def get_section_summary(self, section_name):
+        """ returns the summary of a section not loaded yet, None if loaded """
+        deferred = self._deferred_sections.get(section_name)
+        return None if deferred is None else deferred['summary']
+
+    def _index_sections(self, filename):
+        # small files and models without lazy sections are parsed from the file
+        lazy_section_names = self.lazy_section_names()
+        if not lazy_section_names or os.path.getsize(filename) < self.LAZY_SECTION_SIZE:
+            return filename
+
+        def summarize(name, length, value):
+            if name not in lazy_section_names or length < self.LAZY_SECTION_SIZE or \
+                    not isinstance(value, dict):
+                return value
+
+            self._deferred_sections[name] = {'summary': self.summarize_section(name, value)}
+            # the parser only gets the scalar properties, such as the section name
+            return OrderedDict([(k, v) for k, v in value.items()
+                                if v is None or isinstance(v, (str, int, float, bool))])
+
+        with open(filename) as json_file:
+            contents = json_file.read()
+
+        sections = OrderedDict()
+        for name, (start, end, value) in index_json_sections(contents, summarize).items():
+            sections[name] = value
+            if name in self._deferred_sections:
+                # the text is kept, the file may change or be removed before the section loads
+                self._deferred_sections[name]['text'] = contents[start:end]
+
+        return sections
+
+    def load_section(self, section_name):
+        """
+        Loads a section deferred when its file was loaded, and validates it
+
+        Args:
+            section_name (str): section name
+        """
+        if section_name not in self._deferred_sections:
+            return
+
+        # a save in a worker thread may be loading it
+        with self._lock:
+            deferred = self._deferred_sections.get(section_name)
+            if deferred is None or self._parser is None:
+                return
+
+            logger.debug("Loading section '%s'.", section_name)
+            properties = self.decode_section(section_name, deferred['text'])
+            modified = self._parser.is_modified()
+            sections = self._parser.get_sections()
+            # properties merged with the defaults of the section placeholder
+            section = OrderedDict(sections.get(section_name) or {})
+            section.update(properties)
+            sections[section_name] = section
+            if self._populate_defaults:
+                self._parser.validate_merge_defaults()
+            if not modified:
+                self._parser.commit_changes()
+            del self._deferred_sections[section_name]
+            if section_name not in self._dirty_sections:
+                self._file_sections[section_name] = \
+                    copy.copy(self._parser.get_section(section_name))
+
+    def decode_section(self, section_name, text):
+        """ returns the properties of a section loaded on first use from its JSON text """
+        # pylint: disable=unused-argument
+        return json.loads(text)
+
+    def load_sections(self):
+        """ loads all sections deferred when the file was loaded """
+        for section_name in list(self._deferred_sections.keys()):
+            self.load_section(section_name)
 
     def get_filename(self):
         """ get filename """
         if self._parser is None:
             return None
 
-        return self._parser.get_filename()
+        return self._parser.get_filename() or self._filename
 
     def is_modified(self):
         """ check if data was modified """
         if self._parser is None:
             return False
 
-        return self._parser.is_modified()
+        # edits are known without comparing all sections, recovered ones differ from the file
+        return bool(self._dirty_sections) or self._parser.is_modified()
+
+    def get_num_qubits(self):
+        """ get number of qubits, None if only known after running """
+        return None
+
+    def is_dirty(self):
+        """ check if sections were edited since the file was loaded or saved """
+        return bool(self._dirty_sections)
+
+    def get_revision(self):
+        """ returns a number changing with each edit and each loaded file """
+        return self._revision
 
-    def save_to_file(self, filename):
-        """ save to another file """
+    def snapshot(self):
+        """
+        Returns a copy of the input data for a recovery file. Sections are copied
+        shallow: their properties are replaced, not changed in place, so a worker
+        thread can serialize the copy while editing goes on. Sections not loaded
+        yet or unchanged since loaded are left out, they are read from the file.
+
+        Returns:
+            dict: file name, changed sections and names of the sections left out
+        """
+        if self._parser is None:
+            raise Exception('Input not initialized.')
+
+        filename = self.get_filename()
+        from_file = filename is not None and os.path.isfile(filename)
+        sections = OrderedDict()
+        file_sections = []
+        for section_name in self._parser.get_section_names():
+            section = self._parser.get_section(section_name)
+            # unchanged properties are the same objects, compared without recursing
+            if section_name in self._deferred_sections or \
+                    (from_file and section_name not in self._dirty_sections and
+                     section_name in self._file_sections and
+                     self._file_sections[section_name] == section):
+                file_sections.append(section_name)
+            else:
+                sections[section_name] = copy.copy(section)
+
+        return {'filename': filename,
+                'sections': sections,
+                'file_sections': file_sections}
+
+    def recover_model(self, recovery_file, parser_class, populate_defaults):
+        """
+        Loads the input data of a recovery file, the sections it left out come from
+        the file it was edited from
+
+        Args:
+            recovery_file (str): file written from a snapshot
+            parser_class (type): parser class
+            populate_defaults (bool): populate the defaults of the file sections
+        Returns:
+            list: section names
+        Raises:
+            Exception: file of the sections left out not found
+        """
+        with open(recovery_file) as json_file:
+            recovery = json.load(json_file, object_pairs_hook=OrderedDict)
+
+        filename = recovery.get('filename')
+        sections = recovery['sections']
+        file_sections = recovery.get('file_sections')
+        if file_sections:
+            if filename is None or not os.path.isfile(filename):
+                raise Exception("Input file '{}' of the recovered sections not found.".format(
+                    filename))
+
+            try:
+                self.load_file(filename)  # pylint: disable=no-member
+            except Exception:  # pylint: disable=broad-except
+                # the recovered sections replace the ones that did not validate
+                if self._parser is None:
+                    raise
+            # sections deleted or recovered are dropped from the file ones
+            parser_sections = self._parser.get_sections()
+            for section_name in list(parser_sections.keys()):
+                if section_name not in file_sections:
+                    del parser_sections[section_name]
+                    self._deferred_sections.pop(section_name, None)
+            parser_sections.update(sections)
+            # applies the schemas of the recovered pluggable names
+            self._parser.parse()
+        else:
+            try:
+                self._filename = filename
+                self._deferred_sections = OrderedDict()
+                self._section_texts = {}
+                self._file_sections = {}
+                self._populate_defaults = populate_defaults
+                self._parser = parser_class(sections)
+                self._parser.parse()
+            except Exception:
+                self._parser = None
+                raise
+
+        # recovered edits are not saved
+        self._dirty_sections = set(sections.keys())
+        self._revision = next(_REVISIONS)
+        return self.get_section_names()
+
+    def save_to_file(self, filename, commit=None):
+        """
+        Saves to a file atomically: writes a temporary file next to it, flushes
+        it to disk and renames it over the file. Saving the model file again
+        without edits is skipped.
+
+        Args:
+            filename (str): file to save to
+            commit (callable): called as commit(os.replace, temp_file, filename) to
+                replace the file, returns False to keep the file, defaults to replacing it
+        Returns:
+            bool: True if the file was written
+        Raises:
+            Exception: empty input data
+        """
         if self.is_empty():
             raise Exception("Empty input data.")
 
+        model_file = self.get_filename()
+        same_file = model_file is not None and os.path.exists(filename) and \
+            os.path.realpath(filename) == os.path.realpath(model_file)
+        if same_file and not self._dirty_sections:
+            logger.debug("'%s' not edited, not saved.", filename)
+            return False
+
+        # loading sections and reading their texts is not shared with other threads
+        with self._lock:
+            if not write_file_atomically(filename, self.write_file, commit):
+                return False
+
+            if same_file:
+                self._dirty_sections.clear()
+                self._remember_file_sections()
+
+        return True
+
+    def write_file(self, filename):
+        """ writes the input data to a file through the parser """
+        self.load_sections()
         self._parser.save_to_file(filename)
 
+    def get_section_json(self, section_name, deferred=True):
+        """
+        Returns the JSON text of a section, indented as a top level property. Large
+        sections are written compact, their text is reused until they change.
+
+        Args:
+            section_name (str): section name
+            deferred (bool): returns the file text of a section not loaded yet,
+                False loads it first
+        Returns:
+            str: JSON text
+        """
+        with self._lock:
+            deferred_section = self._deferred_sections.get(section_name)
+            if deferred_section is not None:
+                if deferred:
+                    return deferred_section['text']
+                self.load_section(section_name)
+
+            section = self._parser.get_section(section_name)
+            # edits drop the text, properties are replaced, not changed in place
+            written = self._section_texts.get(section_name)
+            if written is not None and written['value'] == section:
+                return written['text']
+
+            text = json.dumps(section, sort_keys=True)
+            if len(text) < self.LAZY_SECTION_SIZE:
+                return json.dumps(section, sort_keys=True, indent=4).replace('\n', '\n    ')
+
+            self._section_texts[section_name] = {'text': text, 'value': copy.copy(section)}
+            return text
+
     def get_section_names(self):
         """ get section names """
         if self._parser is None:
@@ -171,10 +558,12 @@ class BaseModel(ABC):
 
     def get_section(self, section_name):
         """ get section """
+        self.load_section(section_name)
         return self._parser.get_section(section_name) if self._parser is not None else None
 
     def get_section_text(self, section_name):
         """ get section text """
+        self.load_section(section_name)
         if self._parser is None:
             return ''
 
@@ -182,6 +571,7 @@ class BaseModel(ABC):
 
     def get_section_properties(self, section_name):
         """ get section properties """
+        self.load_section(section_name)
         if self._parser is None:
             return {}
 
@@ -194,6 +584,7 @@ class BaseModel(ABC):
 
     def get_section_property(self, section_name, property_name):
         """ get section property """
+        self.load_section(section_name)
         if self._parser is None:
             return None
 
@@ -201,8 +592,8 @@ class BaseModel(ABC):
 
     def set_section(self, section_name):
         """ set section """
-        if self._parser is None:
-            raise Exception('Input not initialized.')
+        self._start_edit(section_name)
+        self.load_section(section_name)
 
         value = self._parser.get_section_default_properties(section_name)
         if isinstance(value, dict):
@@ -239,8 +630,8 @@ class BaseModel(ABC):
         """ set default properties for name key """
         from qiskit.aqua.parser import JSONSchema
         from qiskit.aqua import get_backends_from_provider
-        if self._parser is None:
-            raise Exception('Input not initialized.')
+        self._start_edit(section_name)
+        self.load_section(section_name)
 
         # First get the properties that will remain
         provider_name = None
@@ -326,9 +717,9 @@ class BaseModel(ABC):
 
     def delete_section(self, section_name):
         """ delete a section """
-        if self._parser is None:
-            raise Exception('Input not initialized.')
+        self._start_edit(section_name)
 
+        self._deferred_sections.pop(section_name, None)
         self._parser.delete_section(section_name)
 
     def get_default_sections(self):
@@ -371,8 +762,8 @@ class BaseModel(ABC):
         from qiskit.aqua.parser import BaseParser
         from qiskit.aqua.parser import JSONSchema
         from qiskit.aqua import get_backends_from_provider
-        if self._parser is None:
-            raise Exception('Input not initialized.')
+        self._start_edit(section_name)
+        self.load_section(section_name)
 
         self._parser.set_section_property(section_name, property_name, value)
         value = self._parser.get_section_property(section_name, property_name)
@@ -412,8 +803,8 @@ class BaseModel(ABC):
         """ delete section property """
         from qiskit.aqua.parser import BaseParser
         from qiskit.aqua.parser import JSONSchema
-        if self._parser is None:
-            raise Exception('Input not initialized.')
+        self._start_edit(section_name)
+        self.load_section(section_name)
 
         self._parser.delete_section_property(section_name, property_name)
         if property_name == JSONSchema.NAME and BaseParser.is_pluggable_section(section_name):
@@ -424,7 +815,7 @@ class BaseModel(ABC):
 
     def set_section_text(self, section_name, value):
         """ set section text """
-        if self._parser is None:
-            raise Exception('Input not initialized.')
+        self._start_edit(section_name)
+        self.load_section(section_name)
 
         self._parser.set_section_data(section_name, value)
@@ -20,7 +20,14 @@ from abc import ABC, abstractmethod
 class GUIProvider(ABC):
     """Base class for GUIProviders."""
 
-    START, STOP = 'Start', 'Stop'
+    START, STOP, CANCEL, KILL = 'Start', 'Stop', 'Cancel', 'Kill'
+
+    # default seconds to wait for a stopped run before killing it
+    STOP_TIMEOUT = 30
+    # default evaluations window of the early stop convergence check
+    CONVERGENCE_WINDOW = 50
+    # default seconds between autosaves of edits to a recovery file
+    AUTOSAVE_INTERVAL = 60
 
     @abstractmethod
     def __init__(self) -> None:
@@ -80,6 +87,6 @@ class GUIProvider(ABC):
         pass
 
     @abstractmethod
-    def create_run_thread(self, model, outputview, thread_queue):
-        """Creates run thread"""
+    def create_run_thread(self, model, outputview, thread_queue, options=None):
+        """Creates run thread, options are extra command line arguments"""
         pass
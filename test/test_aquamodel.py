@@ -14,10 +14,18 @@
 
 """Aqua Model test."""
 
+import os
+import tempfile
 import unittest
 from test.common import QiskitAquaUisTestCase
 from qiskit.aqua import AquaError
 from qiskit_aqua_interfaces.aqua.user_interface._model import Model
+from qiskit_aqua_interfaces.user_interface._fileoperation import (FileOperation,
+                                                                  load_model,
+                                                                  save_model)
+from qiskit_aqua_interfaces.user_interface._autosave import (Autosave,
+                                                             recovery_file_name,
+                                                             find_recovery_files)
 
 
 class TestAquaModel(QiskitAquaUisTestCase):
@@ -147,6 +155,106 @@ class TestAquaModel(QiskitAquaUisTestCase):
         with self.assertRaises(AquaError):
             self._model.set_section_text('algorithm', 'dummy')
 
+    def test_get_num_qubits(self):
+        """Test if model finds the number of qubits from the input operator."""
+        num_qubits = self._model.get_num_qubits()
+        self.assertEqual(num_qubits, 2)
+
+    def test_lazy_input_section(self):
+        """Test the input section of a large file loads when first used."""
+        model = Model()
+        model.LAZY_SECTION_SIZE = 1
+        model.load_file(self._get_resource_path('resources/vqe.json'))
+        self.assertIn('input', model.get_section_names())
+        self.assertEqual(model.get_section_summary('input'), {'num_qubits': 2})
+        self.assertEqual(model.get_num_qubits(), 2)
+        properties = model.get_section_properties('input')
+        self.assertIsNone(model.get_section_summary('input'))
+        self.assertEqual(len(properties['qubit_op']['paulis']),
+                         len(self._model.get_section_property('input', 'qubit_op')['paulis']))
+        self.assertFalse(model.is_modified())
+
+    def test_file_operations(self):
+        """Test loading and saving in a worker thread, cancelled saves leave no file."""
+        model = Model()
+        operation = FileOperation('Opening', load_model,
+                                  (model, self._get_resource_path('resources/vqe.json')))
+        operation.start()
+        operation.join()
+        loaded, error = operation.result
+        self.assertIsNone(error)
+        # the model in use only changes when the loaded copy is swapped in
+        self.assertTrue(model.is_empty())
+        model.swap(loaded)
+        self.assertIn('input', model.get_section_names())
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'vqe.json')
+            operation = FileOperation('Saving', save_model, (model, filename))
+            self.assertTrue(operation.cancel())
+            operation.run()
+            self.assertFalse(operation.result)
+            self.assertEqual(os.listdir(directory), [])
+            operation = FileOperation('Saving', save_model, (model, filename))
+            operation.run()
+            self.assertTrue(operation.result)
+            self.assertFalse(operation.cancel())
+            self.assertEqual(os.listdir(directory), ['vqe.json'])
+
+    def test_save_to_file(self):
+        """Test saves replace the file and are skipped without edits."""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'vqe.json')
+            self.assertTrue(self._model.save_to_file(filename))
+            model = Model()
+            model.load_file(filename)
+            self.assertFalse(model.save_to_file(filename))
+            model.set_section_property('algorithm', 'initial_point', None)
+            self.assertTrue(model.is_dirty())
+            self.assertTrue(model.save_to_file(filename))
+            self.assertFalse(model.is_dirty())
+            # a rejected commit keeps the file and the edits
+            model.set_section_property('variational_form', 'depth', 2)
+            self.assertFalse(model.save_to_file(filename, lambda function, *args: False))
+            self.assertTrue(model.is_dirty())
+            self.assertEqual(os.listdir(directory), ['vqe.json'])
+            model = Model()
+            model.load_file(filename)
+            self.assertEqual(model.get_section_property('variational_form', 'depth'), 3)
+
+    def test_autosave_recovery(self):
+        """Test autosaved edits are recovered over the file sections not edited."""
+        _filepath = self._get_resource_path('resources/vqe.json')
+        for lazy_section_size in [Model.LAZY_SECTION_SIZE, 1]:
+            model = Model()
+            model.LAZY_SECTION_SIZE = lazy_section_size
+            model.load_file(_filepath)
+            model.set_section_property('variational_form', 'depth', 5)
+            self.assertTrue(model.is_modified())
+            with tempfile.TemporaryDirectory() as directory:
+                preferences_file = os.path.join(directory, '.qiskit_aqua_ui')
+                recovery_file = recovery_file_name(preferences_file)
+                snapshot = model.snapshot()
+                # the operators are read from the file, not written again
+                self.assertIn('variational_form', snapshot['sections'])
+                self.assertIn('input', snapshot['file_sections'])
+                autosave = Autosave(recovery_file)
+                autosave.save(snapshot)
+                autosave.stop()
+                self.assertEqual(find_recovery_files(preferences_file), [recovery_file])
+                recovered = Model()
+                recovered.LAZY_SECTION_SIZE = lazy_section_size
+                recovered.recover_file(recovery_file)
+                self.assertEqual(recovered.get_filename(), _filepath)
+                self.assertTrue(recovered.is_modified())
+                self.assertEqual(
+                    recovered.get_section_property('variational_form', 'depth'), 5)
+                self.assertEqual(recovered.get_section_names(), model.get_section_names())
+                self.assertEqual(recovered.get_num_qubits(), 2)
+                autosave = Autosave(recovery_file)
+                autosave.discard()
+                autosave.stop()
+                self.assertEqual(find_recovery_files(preferences_file), [])
+
 
 if __name__ == '__main__':
     unittest.main()
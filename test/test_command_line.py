@@ -0,0 +1,811 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Command Line helpers test."""
+
+import os
+import io
+import sys
+import socket
+import json
+import unittest
+from unittest import mock
+import gzip
+import tempfile
+import numpy as np
+from test.common import QiskitAquaUisTestCase
+from qiskit_aqua_interfaces.command_line import (estimate_simulator_memory,
+                                                 check_simulator_memory,
+                                                 estimate_chemistry_num_qubits,
+                                                 RunMonitor,
+                                                 Checkpoint,
+                                                 warm_start_key,
+                                                 WarmStart,
+                                                 pop_run_options,
+                                                 strip_run_options,
+                                                 RunBudget,
+                                                 ConvergenceCheck,
+                                                 add_run_checks,
+                                                 vary_seed,
+                                                 summarize,
+                                                 format_statistics,
+                                                 result_value,
+                                                 write_result,
+                                                 parse_cpu_list,
+                                                 core_budget,
+                                                 split_cores,
+                                                 format_cpu_list,
+                                                 thread_env,
+                                                 limit_requested_threads,
+                                                 parallel_runs,
+                                                 compare_backends,
+                                                 format_comparison,
+                                                 submit_job,
+                                                 claim_job,
+                                                 recover_stale_jobs,
+                                                 run_worker,
+                                                 queue_status,
+                                                 format_queue_status,
+                                                 ResultsStore,
+                                                 format_runs,
+                                                 format_diff,
+                                                 run_jsonl,
+                                                 driver_cache_key,
+                                                 operator_to_arrays,
+                                                 operator_cache_key,
+                                                 scan_points,
+                                                 write_scan_inputs,
+                                                 format_scan,
+                                                 run_pipeline,
+                                                 format_pipeline,
+                                                 export_pipeline_csv,
+                                                 read_molecule_library,
+                                                 write_molecule_inputs,
+                                                 sweep_variants,
+                                                 encode_operators,
+                                                 sidecar_paths_to_abs,
+                                                 write_operator_variants,
+                                                 format_sweep,
+                                                 INPUT_JSON,
+                                                 INPUT_CHEMISTRY,
+                                                 read_input,
+                                                 parse_json_input,
+                                                 index_json_sections)
+
+
+class _Algorithm:
+    """Variational algorithm stand-in calling back on each evaluation."""
+
+    def __init__(self, values):
+        self._callback = None
+        self.initial_point = None
+        self._values = values
+
+    def run(self):
+        """Evaluates all values."""
+        for i, value in enumerate(self._values):
+            if self._callback is not None:
+                self._callback(i + 1, [float(i)], value, 0.0)
+
+        return {'min_val': min(self._values), 'eval_count': len(self._values)}
+
+
+class _QiskitAqua:
+    """QiskitAqua stand-in."""
+
+    def __init__(self, values):
+        self.quantum_algorithm = _Algorithm(values)
+        self.algorithm_input = None
+        self.quantum_instance = None
+
+    def run(self, json_output=False):
+        """Runs algorithm."""
+        del json_output
+        return self.quantum_algorithm.run()
+
+
+class _Model:
+    """Model stand-in saving its sections as JSON."""
+
+    def __init__(self, filename='input.json'):
+        self._sections = {'backend': {}}
+        self._filename = filename
+        self.saved = []
+
+    def get_filename(self):
+        """Returns input file name."""
+        return self._filename
+
+    def set_section_property(self, section_name, property_name, value):
+        """Sets section property."""
+        self._sections[section_name][property_name] = value
+
+    def save_to_file(self, filename):
+        """Saves sections."""
+        self.saved.append(filename)
+        with open(filename, 'w') as file:
+            json.dump(self._sections, file)
+
+
+# command line stand-in: -jo output input
+_RUN_SCRIPT = """
+import sys, json
+with open(sys.argv[-1]) as file:
+    name = json.load(file)['backend']['name']
+if name == 'failing':
+    sys.exit('Backend failed.')
+with open(sys.argv[-2], 'w') as file:
+    json.dump({'energy': -len(name)}, file)
+"""
+
+
+def _driver_stage(item):
+    """Pipeline driver stage stand-in."""
+    if item == 'failing':
+        raise ValueError('Driver failed.')
+    return len(item)
+
+
+def _algorithm_stage(item, driver_result, offset):
+    """Pipeline algorithm stage stand-in."""
+    return {'value': -float(driver_result + offset), 'eval_count': 1, 'item': item}
+
+
+class TestCommandLine(QiskitAquaUisTestCase):
+    """Command Line helpers tests."""
+
+    def test_estimate_simulator_memory(self):
+        """Test simulator memory estimates."""
+        self.assertEqual(estimate_simulator_memory(10, 'statevector_simulator'), 16 * 2 ** 10)
+        self.assertEqual(estimate_simulator_memory(10, 'qasm_simulator'), 16 * 2 ** 10)
+        self.assertEqual(estimate_simulator_memory(10, 'unitary_simulator'), 16 * 4 ** 10)
+        self.assertIsNone(estimate_simulator_memory(10, 'ibmq_16_melbourne'))
+        self.assertIsNone(estimate_simulator_memory(None, 'statevector_simulator'))
+
+    def test_check_simulator_memory(self):
+        """Test simulator memory check."""
+        self.assertIsNone(check_simulator_memory(2, 'statevector_simulator'))
+        self.assertIsNotNone(check_simulator_memory(60, 'statevector_simulator'))
+
+    def test_estimate_chemistry_num_qubits(self):
+        """Test number of qubits estimate from orbitals and operator settings."""
+        properties = {'qubit_mapping': 'parity', 'two_qubit_reduction': True}
+        self.assertEqual(estimate_chemistry_num_qubits(2, [], properties), 2)
+        properties = {'qubit_mapping': 'jordan_wigner',
+                      'freeze_core': True,
+                      'orbital_reduction': [-2, -1]}
+        self.assertEqual(estimate_chemistry_num_qubits(6, [0], properties), 6)
+        properties = {'qubit_mapping': 'bksf'}
+        self.assertIsNone(estimate_chemistry_num_qubits(6, [0], properties))
+
+    def test_run_monitor(self):
+        """Test run monitor keeps the best evaluation."""
+        monitor = RunMonitor()
+        qiskit_aqua = _QiskitAqua([3.0, 1.0, 2.0])
+        self.assertTrue(monitor.attach(qiskit_aqua))
+        result = monitor.run(qiskit_aqua)
+        self.assertEqual(result['min_val'], 1.0)
+        self.assertEqual(monitor.best_value, 1.0)
+        self.assertEqual(monitor.best_params, [1.0])
+        self.assertEqual(monitor.eval_count, 3)
+
+    def test_run_monitor_stop(self):
+        """Test run monitor stops with partial result."""
+        monitor = RunMonitor()
+        qiskit_aqua = _QiskitAqua([3.0, 1.0, 2.0])
+        monitor.attach(qiskit_aqua)
+        monitor.request_stop('cancelled')
+        result = monitor.run(qiskit_aqua)
+        self.assertTrue(result['truncated'])
+        self.assertEqual(result['stop_reason'], 'cancelled')
+        self.assertEqual(result['eval_count'], 1)
+        self.assertEqual(result['min_val'], 3.0)
+
+    def test_checkpoint_resume(self):
+        """Test resume sets initial point from the last checkpoint."""
+        with tempfile.TemporaryDirectory() as directory:
+            monitor = RunMonitor()
+            qiskit_aqua = _QiskitAqua([3.0, 1.0, 2.0])
+            monitor.attach(qiskit_aqua)
+            checkpoint = Checkpoint(directory, 'input.json', interval=0)
+            checkpoint.attach(qiskit_aqua, monitor)
+            monitor.run(qiskit_aqua)
+            state = checkpoint.load()
+            self.assertEqual(state['eval_count'], 3)
+            self.assertEqual(state['best_value'], 1.0)
+            self.assertEqual(state['best_params'], [1.0])
+
+            monitor = RunMonitor()
+            qiskit_aqua = _QiskitAqua([0.5])
+            monitor.attach(qiskit_aqua)
+            checkpoint = Checkpoint(directory, 'input.json', resume=True)
+            checkpoint.attach(qiskit_aqua, monitor)
+            self.assertEqual(list(qiskit_aqua.quantum_algorithm.initial_point), [1.0])
+            monitor.run(qiskit_aqua)
+            self.assertEqual(monitor.eval_count, 4)
+            self.assertEqual(monitor.best_value, 0.5)
+
+    def test_warm_start_key(self):
+        """Test warm start key ignores optimizer settings."""
+        params = {'algorithm': {'name': 'VQE'},
+                  'optimizer': {'name': 'COBYLA', 'maxiter': 100}}
+        key = warm_start_key(params)
+        params = {'algorithm': {'name': 'VQE', 'initial_point': [0.0]},
+                  'optimizer': {'name': 'L_BFGS_B', 'maxfun': 1000}}
+        self.assertEqual(warm_start_key(params), key)
+        params = {'algorithm': {'name': 'VQE', 'max_evals_grouped': 2},
+                  'optimizer': {'name': 'COBYLA', 'maxiter': 100}}
+        self.assertNotEqual(warm_start_key(params), key)
+
+    def test_warm_start_lookup(self):
+        """Test warm start from the best recorded result."""
+        params = {'algorithm': {'name': 'VQE'}, 'optimizer': {'name': 'COBYLA'}}
+        with tempfile.TemporaryDirectory() as directory:
+            warm_start = WarmStart('input.json', lookup=True, directory=directory)
+            qiskit_aqua = _QiskitAqua([1.0])
+            self.assertFalse(warm_start.attach(qiskit_aqua, params))
+            warm_start.save({'min_val': -1.0, 'opt_params': [0.5, 0.25]})
+            warm_start.save({'min_val': -0.5, 'opt_params': [0.0, 0.0]})
+
+            params['optimizer']['maxiter'] = 1000
+            warm_start = WarmStart('input.json', lookup=True, directory=directory)
+            self.assertTrue(warm_start.attach(qiskit_aqua, params))
+            self.assertEqual(list(qiskit_aqua.quantum_algorithm.initial_point), [0.5, 0.25])
+
+            warm_start = WarmStart('input.json', directory=directory, params=[0.1, 0.2])
+            self.assertTrue(warm_start.attach(qiskit_aqua, params))
+            self.assertEqual(list(qiskit_aqua.quantum_algorithm.initial_point), [0.1, 0.2])
+            # only lookup warm starts record results
+            warm_start.save({'min_val': -2.0, 'opt_params': [0.1, 0.2]})
+            self.assertEqual(len(os.listdir(directory)), 1)
+            warm_start = WarmStart('input.json', directory=directory)
+            self.assertFalse(warm_start.attach(qiskit_aqua, params))
+            warm_start.save({'min_val': -2.0, 'opt_params': [0.1, 0.2]})
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+    def test_run_budget(self):
+        """Test max evaluations budget returns best result so far."""
+        monitor = RunMonitor()
+        monitor.add_check(RunBudget(max_evals=2))
+        qiskit_aqua = _QiskitAqua([3.0, 1.0, 2.0, 0.5])
+        monitor.attach(qiskit_aqua)
+        result = monitor.run(qiskit_aqua)
+        self.assertTrue(result['truncated'])
+        self.assertEqual(result['stop_reason'], 'max_evals')
+        self.assertEqual(result['eval_count'], 2)
+        self.assertEqual(result['min_val'], 1.0)
+        # algorithms without a callback run unchecked, with a warning
+        monitor = RunMonitor()
+        add_run_checks(monitor, {'max_evals': 2})
+        del qiskit_aqua.quantum_algorithm._callback
+        with self.assertLogs('qiskit_aqua_interfaces.command_line', level='WARNING'):
+            self.assertFalse(monitor.attach(qiskit_aqua))
+
+    def test_convergence_check(self):
+        """Test convergence check stops on a plateau."""
+        monitor = RunMonitor()
+        monitor.add_check(ConvergenceCheck(2, tol=0.01))
+        qiskit_aqua = _QiskitAqua([3.0, 2.0, 1.0, 0.999, 1.5, 0.998, 0.5])
+        monitor.attach(qiskit_aqua)
+        result = monitor.run(qiskit_aqua)
+        self.assertTrue(result['truncated'])
+        self.assertEqual(result['stop_reason'], 'converged')
+        self.assertEqual(result['eval_count'], 5)
+        self.assertEqual(result['min_val'], 0.999)
+
+    def test_pop_run_options(self):
+        """Test run options section removed from JSON input."""
+        params = {'algorithm': {'name': 'VQE'},
+                  'RUN_OPTIONS': {'time_budget': '60', 'max_evals': 100}}
+        run_options = pop_run_options(params)
+        self.assertEqual(run_options, {'time_budget': 60.0, 'max_evals': 100})
+        self.assertEqual(list(params.keys()), ['algorithm'])
+        with self.assertRaises(SystemExit):
+            pop_run_options({'run_options': {'max_iter': 1}})
+
+    def test_strip_run_options(self):
+        """Test run options section removed from chemistry input."""
+        with tempfile.TemporaryDirectory() as directory:
+            input_file = os.path.join(directory, 'input.txt')
+            with open(input_file, 'w') as file:
+                file.write('&driver\n   name=HDF5\n&end\n\n'
+                           '&run_options\n   max_evals=10  # budget\n&end\n')
+
+            run_options, temp_input = strip_run_options(input_file)
+            self.assertEqual(run_options, {'max_evals': 10})
+            self.assertEqual(os.path.dirname(temp_input), directory)
+            with open(temp_input) as file:
+                self.assertEqual(file.read(), '&driver\n   name=HDF5\n&end\n\n')
+
+            self.assertEqual(strip_run_options(temp_input), ({}, None))
+
+    def test_read_input(self):
+        """Test input format sniffing, compressed inputs and JSON errors."""
+        with tempfile.TemporaryDirectory() as directory:
+            input_file = os.path.join(directory, 'input.in.gz')
+            with gzip.open(input_file, 'wt') as file:
+                file.write('&driver\n   name=HDF5\n&end\n')
+
+            self.assertEqual(read_input(input_file),
+                             (INPUT_CHEMISTRY, '&driver\n   name=HDF5\n&end\n'))
+            # compressed inputs are decompressed for the chemistry parser
+            run_options, temp_input = strip_run_options(input_file)
+            self.assertEqual(run_options, {})
+            with open(temp_input) as file:
+                self.assertEqual(file.read(), '&driver\n   name=HDF5\n&end\n')
+
+            input_file = os.path.join(directory, 'input')
+            with open(input_file, 'w') as file:
+                file.write('\n  {"problem": {"name": "energy"},\n "backend": }')
+
+            input_format, contents = read_input(input_file)
+            self.assertEqual(input_format, INPUT_JSON)
+            with self.assertRaises(SystemExit) as context:
+                parse_json_input(input_file, contents)
+            self.assertIn('line 3 column 13', str(context.exception))
+            self.assertEqual(parse_json_input(input_file, '{"problem": {}}'), {'problem': {}})
+            # invalid UTF-8 is reported, not dropped
+            with open(input_file, 'wb') as file:
+                file.write(b'{"problem": {"name": "energy\xff"}}')
+            with self.assertRaises(SystemExit) as context:
+                read_input(input_file)
+            self.assertIn('Cannot read input', str(context.exception))
+
+    def test_index_json_sections(self):
+        """Test JSON input sections index and large section summaries."""
+        contents = ' {"problem": {"name": "energy"},\n "input": {"name": "EnergyInput", ' \
+                   '"qubit_op": {"paulis": [{"label": "IZ"}]}}, "backend": "x" } '
+        sections = index_json_sections(contents)
+        self.assertEqual(list(sections.keys()), ['problem', 'input', 'backend'])
+        start, end, value = sections['input']
+        self.assertEqual(json.loads(contents[start:end]), value)
+        self.assertEqual(sections['backend'][2], 'x')
+
+        sections = index_json_sections(
+            contents, lambda name, length, value: length if name == 'input' else value)
+        self.assertEqual(sections['input'][2], sections['input'][1] - sections['input'][0])
+        self.assertEqual(sections['problem'][2], {'name': 'energy'})
+        self.assertEqual(index_json_sections(' {} '), {})
+        for invalid in ['[]', '{"a": 1,}', '{"a": 1} x', '{"a" 1}', '{"a": 1']:
+            with self.assertRaises(json.JSONDecodeError):
+                index_json_sections(invalid)
+
+    def test_vary_seed(self):
+        """Test seed variation copies the input."""
+        params = {'problem': {'name': 'energy', 'random_seed': 50}}
+        self.assertEqual(vary_seed(params, 2)['problem']['random_seed'], 52)
+        self.assertEqual(params['problem']['random_seed'], 50)
+        self.assertEqual(vary_seed({}, 3)['problem']['random_seed'], 3)
+
+    def test_summarize(self):
+        """Test repeated runs statistics."""
+        stats = summarize([1.0, 2.0, None, 3.0, 4.0, 5.0])
+        self.assertEqual(stats['count'], 5)
+        self.assertAlmostEqual(stats['mean'], 3.0)
+        self.assertAlmostEqual(stats['std'], 2.0 ** 0.5)
+        self.assertEqual(stats['min'], 1.0)
+        self.assertEqual(stats['50%'], 3.0)
+        self.assertEqual(stats['max'], 5.0)
+        self.assertIsNone(summarize([None]))
+        lines = format_statistics({'value': stats, 'other': None})
+        self.assertEqual(len(lines), 3)
+        self.assertIn('n/a', lines[2])
+
+    def test_write_result(self):
+        """Test results are written as JSON, complex and numpy values included."""
+        file = io.StringIO()
+        write_result({'energy': -1.5 + 0j, 'eigvals': np.array([-1.5 + 0.5j]),
+                      'eval_count': np.int64(3), 'opt_params': np.array([0.1, 0.2])}, file)
+        result = json.loads(file.getvalue())
+        self.assertEqual(result['eigvals'], [{'real': -1.5, 'imag': 0.5}])
+        self.assertEqual(result['eval_count'], 3)
+        self.assertEqual(result['opt_params'], [0.1, 0.2])
+        self.assertEqual(result_value(result), -1.5)
+
+    def test_core_budget(self):
+        """Test core budgets split in contiguous CPU blocks."""
+        self.assertEqual(parse_cpu_list('0-3,8'), [0, 1, 2, 3, 8])
+        self.assertRaises(SystemExit, parse_cpu_list, '0-a')
+        self.assertEqual(core_budget(2, '4-7'), [4, 5])
+        self.assertRaises(SystemExit, core_budget, 0)
+        self.assertEqual(split_cores([0, 1, 2, 3, 8], 2), [[0, 1, 2], [3, 8]])
+        self.assertEqual(split_cores([0, 1], 4), [[0], [1]])
+        self.assertEqual(format_cpu_list([3, 8]), '3,8')
+        env = thread_env(3, {'PATH': 'bin'})
+        self.assertEqual(env['PATH'], 'bin')
+        self.assertEqual(env['OMP_NUM_THREADS'], '3')
+        self.assertEqual(env['OPENBLAS_NUM_THREADS'], '3')
+        with mock.patch.dict(os.environ, {'OMP_NUM_THREADS': '5'}):
+            # no core budget asked for, the environment is left as is
+            self.assertIsNone(limit_requested_threads())
+            self.assertEqual(os.environ['OMP_NUM_THREADS'], '5')
+            self.assertEqual(limit_requested_threads(1), 1)
+            self.assertEqual(os.environ['OMP_NUM_THREADS'], '1')
+
+    def test_parallel_runs(self):
+        """Test concurrent runs do not oversubscribe the CPUs."""
+        cpu_count = os.cpu_count() or 1
+        parallel, threads = parallel_runs(2 * cpu_count)
+        self.assertEqual(parallel, cpu_count)
+        self.assertEqual(threads, 1)
+        parallel, threads = parallel_runs(1)
+        self.assertEqual(parallel, 1)
+        self.assertEqual(threads, cpu_count)
+        parallel, threads = parallel_runs(4, 2, cores=8)
+        self.assertEqual(parallel, 2)
+        self.assertEqual(threads, 4)
+
+    def test_compare_backends(self):
+        """Test backends comparison runs each backend in its own process."""
+        def read_result(output_file):
+            with open(output_file) as file:
+                return result_value(json.load(file))
+
+        with tempfile.TemporaryDirectory() as directory:
+            model = _Model(os.path.join(directory, 'input.json'))
+            rows = compare_backends(model,
+                                    ['qiskit.BasicAer:qasm_simulator',
+                                     'qiskit.BasicAer:failing'],
+                                    [sys.executable, '-c', _RUN_SCRIPT], '-jo',
+                                    read_result, max_parallel=2)
+            # input copies are written next to the input
+            self.assertEqual([os.path.dirname(os.path.dirname(x)) for x in model.saved],
+                             [directory, directory])
+            self.assertEqual(os.listdir(directory), [])
+        self.assertEqual([x['backend'] for x in rows],
+                         ['qiskit.BasicAer:qasm_simulator', 'qiskit.BasicAer:failing'])
+        self.assertEqual(rows[0]['status'], 'ok')
+        self.assertEqual(rows[0]['result'], -14.0)
+        self.assertGreater(rows[0]['runtime'], 0)
+        self.assertEqual(rows[1]['status'], 'failed')
+        self.assertEqual(rows[1]['result'], 'Backend failed.')
+        self.assertEqual(len(format_comparison(rows)), 3)
+
+    def test_queue(self):
+        """Test spool queue priorities, retries and results."""
+        with tempfile.TemporaryDirectory() as spool:
+            inputs = []
+            for name in ['qasm_simulator', 'failing']:
+                input_file = os.path.join(spool, name + '.json')
+                with open(input_file, 'w') as file:
+                    json.dump({'backend': {'name': name}}, file)
+                inputs.append(input_file)
+
+            low = submit_job(spool, inputs[0])
+            high = submit_job(spool, inputs[1], priority=5, retries=2)
+            self.assertRaises(SystemExit, submit_job, spool, inputs[0], -1)
+            job = claim_job(spool, 'test')
+            self.assertEqual(job['id'], high['id'])
+            self.assertEqual(job['attempts'], 1)
+            self.assertEqual([x['state'] for x in queue_status(spool)], ['pending', 'running'])
+            os.rename(os.path.join(spool, 'running', job['key'] + '.json'),
+                      os.path.join(spool, 'pending', job['key'] + '.json'))
+
+            self.assertRaises(SystemExit, run_worker, spool,
+                              [sys.executable, '-c', _RUN_SCRIPT], once=True, lease=10)
+            count = run_worker(spool, [sys.executable, '-c', _RUN_SCRIPT], once=True)
+            self.assertEqual(count, 3)
+            jobs = {x['id']: x for x in queue_status(spool)}
+            self.assertEqual(jobs[low['id']]['state'], 'done')
+            with open(os.path.join(spool, 'done', low['key'] + '.out')) as file:
+                self.assertEqual(result_value(json.load(file)), -14.0)
+            self.assertEqual(jobs[high['id']]['state'], 'failed')
+            self.assertEqual(jobs[high['id']]['attempts'], 3)
+            self.assertEqual(jobs[high['id']]['error'], 'Backend failed.')
+            self.assertTrue(os.path.isfile(os.path.join(spool, 'failed', high['key'] + '.log')))
+            self.assertEqual(len(format_queue_status(list(jobs.values()))), 4)
+
+    def test_queue_stale_claim(self):
+        """Test claims of lost workers are recovered as failed attempts."""
+        with tempfile.TemporaryDirectory() as spool:
+            input_file = os.path.join(spool, 'input.json')
+            with open(input_file, 'w') as file:
+                json.dump({'backend': {'name': 'qasm_simulator'}}, file)
+
+            job = submit_job(spool, input_file, retries=1)
+            self.assertEqual(claim_job(spool, 'remote:1')['id'], job['id'])
+            # a renewed claim of another host is left running
+            self.assertEqual(recover_stale_jobs(spool), [])
+            running_path = os.path.join(spool, 'running', job['key'] + '.json')
+            os.utime(running_path, (0, 0))
+            self.assertEqual([x['state'] for x in recover_stale_jobs(spool)], ['pending'])
+            # a claim of an ended process of this host is recovered without waiting
+            dead = mock.Mock(return_value=False)
+            self.assertEqual(claim_job(spool, '{}:1'.format(socket.gethostname()))['attempts'], 2)
+            with mock.patch('psutil.pid_exists', dead):
+                recovered = recover_stale_jobs(spool)
+            self.assertEqual([x['state'] for x in recovered], ['failed'])
+            jobs = queue_status(spool)
+            self.assertEqual([x['state'] for x in jobs], ['failed'])
+            self.assertIn('lost', jobs[0]['error'])
+
+    def test_results_store(self):
+        """Test results database list, filter, diff and CSV export."""
+        with tempfile.TemporaryDirectory() as directory:
+            store = ResultsStore(os.path.join(directory, 'results.sqlite'))
+            try:
+                for maxiter, energy in [(100, -1.1), (200, -1.3), (300, -1.2)]:
+                    sections = {'algorithm': {'name': 'VQE'},
+                                'backend': {'name': 'statevector_simulator'},
+                                'optimizer': {'name': 'COBYLA', 'maxiter': maxiter}}
+                    store.add_run('input.json', sections,
+                                  {'energy': np.float64(energy), 'eval_count': maxiter,
+                                   'opt_params': np.zeros(2)}, 1.5)
+
+                runs = store.list_runs(['optimizer.maxiter>100', 'algorithm=VQE'], 'value')
+                self.assertEqual([x['id'] for x in runs], [2, 3])
+                runs = store.list_runs(sort='value', descending=True, limit=1)
+                self.assertEqual(runs[0]['value'], -1.1)
+                self.assertEqual(store.list_runs(['backend=qasm_simulator']), [])
+                self.assertRaises(SystemExit, store.list_runs, ['maxiter'])
+                self.assertEqual(len(format_runs(store.list_runs())), 4)
+                diff = store.diff(1, 2)
+                self.assertIn(('input.optimizer.maxiter', 100, 200), diff)
+                self.assertIn(('result.energy', -1.1, -1.3), diff)
+                self.assertEqual(format_diff(store.diff(1, 1)), ['Runs are identical.'])
+                self.assertRaises(SystemExit, store.get_run, 10)
+                output = io.StringIO()
+                store.export_csv(store.list_runs(), output)
+                lines = output.getvalue().splitlines()
+                self.assertEqual(len(lines), 4)
+                self.assertIn('optimizer.maxiter', lines[0])
+                # column filters, sorting and limits run in the database
+                runs = store.list_runs(['eval_count>=200', 'backend!=qasm_simulator'],
+                                       'value', limit=1)
+                self.assertEqual([x['id'] for x in runs], [2])
+                self.assertEqual(store.list_runs(['value<abc']), [])
+                runs = store.list_runs(sort='optimizer.maxiter', descending=True, limit=2)
+                self.assertEqual([x['id'] for x in runs], [3, 2])
+                # operators are recorded by their size and hash
+                paulis = [{'label': 'ZZ', 'coeff': {'real': 0.5}},
+                          {'label': 'XX', 'coeff': {'real': 0.2}}]
+                run_id = store.add_run(None, {'input': {'name': 'EnergyInput',
+                                                        'qubit_op': {'paulis': paulis},
+                                                        'aux_ops': []}},
+                                       {'energy': -1.0})
+                section = store.get_run(run_id)['input']['input']
+                self.assertEqual(section['qubit_op']['num_qubits'], 2)
+                self.assertEqual(section['qubit_op']['num_paulis'], 2)
+                self.assertNotIn('paulis', section['qubit_op'])
+                self.assertEqual(section['aux_ops'], [])
+            finally:
+                store.close()
+
+    def test_run_jsonl(self):
+        """Test JSON lines mode writes one result document per input line."""
+        lines = ['{"id": "a", "values": [3.0, 1.0, 2.0]}',
+                 '',
+                 'not json',
+                 '{"values": [5.0, 4.0, 3.0], "run_options": {"max_evals": 2}}']
+        output = io.StringIO()
+        with mock.patch('qiskit.aqua.QiskitAqua', create=True,
+                        new=lambda params: _QiskitAqua(params['values'])):
+            failed = run_jsonl(io.StringIO('\n'.join(lines)), output)
+
+        self.assertEqual(failed, 1)
+        documents = [json.loads(x) for x in output.getvalue().splitlines()]
+        self.assertEqual([x['line'] for x in documents], [1, 3, 4])
+        self.assertEqual(documents[0]['id'], 'a')
+        self.assertEqual(documents[0]['result']['min_val'], 1.0)
+        self.assertEqual(documents[1]['status'], 'failed')
+        self.assertTrue(documents[2]['result']['truncated'])
+        self.assertEqual(documents[2]['result']['min_val'], 4.0)
+
+        class _NumpyQiskitAqua(_QiskitAqua):
+            def run(self, json_output=False):
+                result = super().run(json_output)
+                result.update({'eval_count': np.int64(3), 'eigvals': [complex(1.0, 0.5)]})
+                return result
+
+        output = io.StringIO()
+        with mock.patch('qiskit.aqua.QiskitAqua', create=True,
+                        new=lambda params: _NumpyQiskitAqua(params['values'])):
+            failed = run_jsonl(io.StringIO('{"values": [3.0, 1.0]}'), output)
+
+        self.assertEqual(failed, 0)
+        document = json.loads(output.getvalue())
+        self.assertEqual(document['status'], 'ok')
+        self.assertEqual(document['result']['eval_count'], 3)
+        self.assertEqual(document['result']['eigvals'], [{'real': 1.0, 'imag': 0.5}])
+
+    def test_driver_cache_key(self):
+        """Test driver cache keys ignore whitespace and non driver sections."""
+        sections = {'driver': {'name': 'PYSCF'},
+                    'pyscf': {'atom': 'H .0 .0 .0; H .0 .0 0.735', 'basis': 'sto3g'},
+                    'algorithm': {'name': 'VQE'}}
+        key = driver_cache_key(sections)
+        same = {'DRIVER': {'name': 'PYSCF', 'hdf5_output': 'molecule.hdf5'},
+                'pyscf': {'atom': 'H .0 .0 .0;  H .0 .0 0.735 ', 'basis': 'sto3g'},
+                'algorithm': {'name': 'ExactEigensolver'}}
+        self.assertEqual(driver_cache_key(same), key)
+        sections['pyscf']['basis'] = '631g'
+        self.assertNotEqual(driver_cache_key(sections), key)
+        text = {'driver': {'name': 'GAUSSIAN'}, 'gaussian': '# rhf/sto-3g\n\nH2\n\n0 1\n'}
+        self.assertEqual(driver_cache_key(text),
+                         driver_cache_key({'driver': {'name': 'GAUSSIAN'},
+                                           'gaussian': ['# rhf/sto-3g', '', 'H2', '0  1']}))
+        self.assertIsNone(driver_cache_key({'algorithm': {'name': 'VQE'}}))
+
+    def test_operator_cache_key(self):
+        """Test qubit operator cache keys and operator encoding."""
+        sections = {'driver': {'name': 'PYSCF'},
+                    'pyscf': {'atom': 'Li .0 .0 .0; H .0 .0 1.6'},
+                    'operator': {'name': 'hamiltonian', 'freeze_core': True},
+                    'optimizer': {'name': 'COBYLA', 'maxiter': 100}}
+        key = operator_cache_key(sections)
+        sections['optimizer']['maxiter'] = 200
+        self.assertEqual(operator_cache_key(sections), key)
+        sections['operator']['freeze_core'] = False
+        self.assertNotEqual(operator_cache_key(sections), key)
+        self.assertIsNone(operator_cache_key({'operator': {'name': 'hamiltonian'}}))
+        # HDF5 inputs are keyed by their molecule file
+        with tempfile.TemporaryDirectory() as directory:
+            sections = {'driver': {'name': 'HDF5'}, 'hdf5': {'hdf5_input': 'h2.hdf5'},
+                        'operator': {'name': 'hamiltonian'}}
+            self.assertIsNone(operator_cache_key(sections, directory))
+            hdf5_file = os.path.join(directory, 'h2.hdf5')
+            with open(hdf5_file, 'wb') as file:
+                file.write(b'h2')
+            key = operator_cache_key(sections, directory)
+            self.assertIsNotNone(key)
+            with open(hdf5_file, 'wb') as file:
+                file.write(b'lih')
+            self.assertNotEqual(operator_cache_key(sections, directory), key)
+
+        class _Pauli:
+            def __init__(self, label):
+                self._label = label
+
+            def to_label(self):
+                """Returns Pauli label."""
+                return self._label
+
+        operator = mock.Mock(paulis=[[0.5, _Pauli('IZ')], [0.25j, _Pauli('XX')]])
+        labels, coeffs = operator_to_arrays(operator)
+        self.assertEqual(list(labels), [b'IZ', b'XX'])
+        self.assertEqual(list(coeffs), [0.5, 0.25j])
+
+    def test_scan_inputs(self):
+        """Test scan inputs replace the geometry variable of a template."""
+        values = scan_points(0.5, 1.0, 3)
+        self.assertEqual(values, [0.5, 0.75, 1.0])
+        self.assertRaises(SystemExit, scan_points, 0.5, 1.0, 0)
+        with tempfile.TemporaryDirectory() as directory:
+            template_file = os.path.join(directory, 'h2.txt')
+            with open(template_file, 'w') as file:
+                file.write('&pyscf\n   atom=H .0 .0 .0; H .0 .0 ${r}\n&end\n')
+
+            input_files = write_scan_inputs(template_file, 'r', values, directory)
+            with open(input_files[1]) as file:
+                self.assertIn('H .0 .0 0.75\n', file.read())
+            self.assertRaises(SystemExit, write_scan_inputs, template_file, 'x', values,
+                              directory)
+
+        lines = format_scan('r', [{'value': 0.5, 'energy': -1.05, 'eval_count': 10,
+                                   'status': 'ok'},
+                                  {'value': 0.75, 'energy': None, 'eval_count': None,
+                                   'status': 'failed'}])
+        self.assertEqual(len(lines), 3)
+
+    def test_pipeline(self):
+        """Test pipeline rows keep the items order and driver failures skip the algorithm."""
+        completed = []
+        items = ['h2', 'failing', 'lih', 'beh2']
+        rows = run_pipeline(items, _driver_stage, _algorithm_stage, 2, 2, 1,
+                            algorithm_args=(10,), callback=completed.append)
+        self.assertEqual([x['item'] for x in rows], items)
+        self.assertEqual(len(completed), 4)
+        self.assertEqual(rows[0]['result']['value'], -12.0)
+        self.assertEqual(rows[3]['result']['item'], 'beh2')
+        self.assertIsNone(rows[1]['result'])
+        self.assertEqual(rows[1]['error'], 'driver: Driver failed.')
+        self.assertIsNotNone(rows[2]['driver_time'])
+        self.assertIsNotNone(rows[2]['algorithm_time'])
+        lines = format_pipeline(rows)
+        self.assertEqual(len(lines), 5)
+        self.assertIn('driver: Driver failed.', lines[2])
+        output = io.StringIO()
+        export_pipeline_csv(rows, output)
+        self.assertEqual(output.getvalue().splitlines()[1].split(',')[:4],
+                         ['h2', '-12.0', '', '1'])
+
+    def test_molecule_library(self):
+        """Test molecule library XYZ records replace the template geometry."""
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'h2.xyz'), 'w') as file:
+                file.write('2\n\nH 0 0 0\nH 0 0 0.735\n')
+            with open(os.path.join(directory, 'set.xyz'), 'w') as file:
+                file.write('1\nhe atom\nHe 0 0 0\n\n2\nh2 stretched\nH 0 0 0\nH 0 0 1.2\n')
+
+            molecules = read_molecule_library(directory)
+            self.assertEqual([x[0] for x in molecules], ['h2', 'he', 'h2_1'])
+            self.assertEqual(molecules[2][1][1], ('H', 0.0, 0.0, 1.2))
+
+            template_file = os.path.join(directory, 'template.txt')
+            with open(template_file, 'w') as file:
+                file.write('&name\n$name\n&end\n&pyscf\n   atom=$atom\n&end\n')
+            input_files = write_molecule_inputs(template_file, molecules[:1], directory)
+            with open(input_files[0]) as file:
+                self.assertEqual(file.read(), '&name\nh2\n&end\n&pyscf\n   atom=H 0.00000000 '
+                                              '0.00000000 0.00000000; H 0.00000000 0.00000000 '
+                                              '0.73500000\n&end\n')
+
+            with open(os.path.join(directory, 'bad.xyz'), 'w') as file:
+                file.write('2\nbad\nH 0 0\n')
+            self.assertRaises(SystemExit, read_molecule_library, directory)
+
+    def test_sweep(self):
+        """Test sweep variants edit the operator section and the cheapest one is marked."""
+        variants = sweep_variants([['freeze_core', 'true', 'false'],
+                                   ['orbital_reduction', '[]', '[-2, -1]']])
+        self.assertEqual(len(variants), 4)
+        self.assertEqual(variants[1], {'freeze_core': True, 'orbital_reduction': [-2, -1]})
+        self.assertRaises(SystemExit, sweep_variants, [['freeze_core']])
+        with tempfile.TemporaryDirectory() as directory:
+            input_file = os.path.join(directory, 'input.txt')
+            with open(input_file, 'w') as file:
+                file.write('&driver\n   name=PYSCF\n&end\n\n&operator\n   name=hamiltonian\n'
+                           '   freeze_core=False  # all orbitals\n&end\n')
+
+            input_files = write_operator_variants(input_file, variants[1:2], directory)
+            with open(input_files[0]) as file:
+                self.assertEqual(file.read(), '&driver\n   name=PYSCF\n&end\n\n&operator\n'
+                                              '   name=hamiltonian\n   freeze_core=True\n'
+                                              '   orbital_reduction=[-2, -1]\n&end\n')
+
+        sizes = [{'num_qubits': 4, 'num_paulis': 15, 'backend': 'statevector_simulator'},
+                 {'num_qubits': 2, 'num_paulis': 5, 'backend': 'statevector_simulator'},
+                 {'error': 'Driver failed.'}]
+        rows = [{'result': {'value': -1.137}, 'error': None},
+                {'result': {'value': -1.136}, 'error': None},
+                None]
+        lines = format_sweep(variants[:3], sizes, rows, -1.137)
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[2].startswith('*'))
+        self.assertIn('failed: Driver failed.', lines[3])
+        lines = format_sweep(variants[:3], sizes, rows, -1.137, 1e-4)
+        self.assertTrue(lines[1].startswith('*'))
+
+    def test_operator_encoding(self):
+        """Test columnar operators are expanded on JSON input parsing."""
+        labels = np.array([b'IZ', b'ZI', b'XX'])
+        coeffs = np.array([-1.05, 0.39, 0.18 + 0.5j])
+        paulis = [{'label': 'IZ', 'coeff': {'real': -1.05}},
+                  {'label': 'ZI', 'coeff': {'real': 0.39}},
+                  {'label': 'XX', 'coeff': {'real': 0.18, 'imag': 0.5}}]
+        with tempfile.TemporaryDirectory() as directory:
+            json_file = os.path.join(directory, 'algorithm.json')
+            for encoding in ['inline', 'sidecar']:
+                encoded = encode_operators([('qubit_op', labels, coeffs),
+                                            ('aux_ops_0', labels[:0], coeffs[:0])],
+                                           json_file, encoding)
+                self.assertEqual(encoded['qubit_op']['num_qubits'], 2)
+                contents = json.dumps({'input': {'name': 'EnergyInput',
+                                                 'qubit_op': encoded['qubit_op'],
+                                                 'aux_ops': [encoded['aux_ops_0']]}})
+                params = parse_json_input(json_file, contents)
+                self.assertEqual(params['input']['qubit_op'], {'paulis': paulis})
+                self.assertEqual(params['input']['aux_ops'], [{'paulis': []}])
+
+            self.assertEqual(encoded['qubit_op']['file'], 'algorithm.npz')
+            params = {'input': {'qubit_op': encoded['qubit_op']}}
+            self.assertTrue(sidecar_paths_to_abs(params, json_file))
+            self.assertEqual(params['input']['qubit_op']['file'],
+                             os.path.join(directory, 'algorithm.npz'))
+            os.remove(os.path.join(directory, 'algorithm.npz'))
+            self.assertRaises(SystemExit, parse_json_input, json_file, contents)
+
+
+if __name__ == '__main__':
+    unittest.main()